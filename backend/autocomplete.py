@@ -0,0 +1,213 @@
+"""
+In-process typeahead suggestions for customer, property and township pickers.
+
+Each entity has a PrefixIndex: a sorted array of (term, id) pairs, where the
+terms are the casefolded name and code fields and every word-boundary suffix
+of them (so "acm" finds "Big Acme Holdings"). A lookup is a bisect plus a walk
+over the matching run, so it answers in microseconds without touching
+DynamoDB. Indexes are built from a parallel scan on first use. crud's
+create/update/delete paths keep them fresh, and a periodic rebuild picks up
+writes from other processes.
+"""
+import os
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import parallel_scan
+from database import get_table
+
+AUTOCOMPLETE_REBUILD_SECONDS = int(os.getenv("AUTOCOMPLETE_REBUILD_SECONDS", "300"))
+AUTOCOMPLETE_DEFAULT_LIMIT = 10
+
+AUTOCOMPLETE_SOURCES = {
+    'customer': {'table': 'Customers', 'key': 'CustomerId', 'label': 'CompanyName',
+                 'fields': ['CompanyName', 'CustomerCode']},
+    'property': {'table': 'Properties', 'key': 'PropertyId', 'label': 'PropertyName',
+                 'fields': ['PropertyName', 'PropertyCode']},
+    'township': {'table': 'Townships', 'key': 'TownshipId', 'label': 'TownshipName',
+                 'fields': ['TownshipName']},
+}
+TABLE_ENTITIES = {source['table']: entity for entity, source in AUTOCOMPLETE_SOURCES.items()}
+
+
+def normalize(text) -> str:
+    """Casefold and collapse whitespace"""
+    return ' '.join(str(text).casefold().split())
+
+
+def item_terms(entity: str, item: dict) -> List[str]:
+    """Indexed terms for an item: each field value and its suffixes starting at a word"""
+    terms = set()
+    for field in AUTOCOMPLETE_SOURCES[entity]['fields']:
+        words = normalize(item.get(field) or '').split(' ')
+        terms.update(' '.join(words[i:]) for i in range(len(words)) if words[i])
+    return sorted(terms)
+
+
+def item_entry(entity: str, item: dict) -> Optional[Tuple[str, str, List[str]]]:
+    """(id, label, terms) for an active item, or None if it should not be suggested"""
+    source = AUTOCOMPLETE_SOURCES[entity]
+    if not item.get('IsActive', True):
+        return None
+    label = item.get(source['label']) or next((item[f] for f in source['fields'] if item.get(f)), None)
+    if label is None:
+        return None
+    return str(item[source['key']]), str(label), item_terms(entity, item)
+
+
+class PrefixIndex:
+    """Sorted (term, id) pairs; a prefix lookup is a bisect plus a walk over the matches"""
+
+    def __init__(self, entries: Iterable[Tuple[str, str, List[str]]] = ()):
+        self._labels = {}
+        self._item_terms = {}
+        for item_id, label, terms in entries:
+            self._labels[item_id] = label
+            self._item_terms[item_id] = terms
+        self._terms = sorted((term, item_id) for item_id, terms in self._item_terms.items() for term in terms)
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def upsert(self, item_id: str, label: str, terms: List[str]) -> None:
+        self.remove(item_id)
+        self._labels[item_id] = label
+        self._item_terms[item_id] = terms
+        for term in terms:
+            insort(self._terms, (term, item_id))
+
+    def remove(self, item_id: str) -> None:
+        self._labels.pop(item_id, None)
+        for term in self._item_terms.pop(item_id, []):
+            position = bisect_left(self._terms, (term, item_id))
+            if position < len(self._terms) and self._terms[position] == (term, item_id):
+                del self._terms[position]
+
+    def search(self, prefix: str, limit: int = AUTOCOMPLETE_DEFAULT_LIMIT) -> List[dict]:
+        """Up to limit {id, label} suggestions whose terms start with prefix, in term order"""
+        results = []
+        seen = set()
+        position = bisect_left(self._terms, (prefix,))
+        while position < len(self._terms) and len(results) < limit:
+            term, item_id = self._terms[position]
+            if not term.startswith(prefix):
+                break
+            if item_id not in seen:
+                seen.add(item_id)
+                results.append({'id': item_id, 'label': self._labels[item_id]})
+            position += 1
+        return results
+
+
+class Autocomplete:
+    """Per-entity prefix indexes, built lazily and kept fresh by write hooks"""
+
+    def __init__(self):
+        self._indexes: Dict[str, PrefixIndex] = {}
+        # Writes seen while an entity is being rebuilt, replayed onto the new index
+        self._pending: Dict[str, list] = {}
+        self._lock = threading.Lock()
+        # Held for the whole of an entity's rebuild, so only one runs at a time
+        self._rebuild_locks = {entity: threading.Lock() for entity in AUTOCOMPLETE_SOURCES}
+        self._stop_event = threading.Event()
+
+    def _load(self, entity: str) -> PrefixIndex:
+        source = AUTOCOMPLETE_SOURCES[entity]
+        table = get_table(source['table'])
+        projection = [source['key'], 'IsActive', *source['fields']]
+        entries = (item_entry(entity, item) for item in parallel_scan.scan_items(table, projection=projection))
+        return PrefixIndex(entry for entry in entries if entry)
+
+    def rebuild(self, entity: str) -> int:
+        """Reload an entity's index from its table; returns the number of suggestions indexed"""
+        with self._rebuild_locks[entity]:
+            return self._rebuild(entity)
+
+    def _rebuild(self, entity: str) -> int:
+        # Caller holds the entity's rebuild lock
+        with self._lock:
+            self._pending[entity] = []
+        index = None
+        try:
+            index = self._load(entity)
+        finally:
+            # Replay and install under the same lock as the pop, so no write
+            # falls between the pending list and the new index
+            with self._lock:
+                pending = self._pending.pop(entity)
+                if index is not None:
+                    for operation in pending:
+                        self._apply(index, entity, *operation)
+                    self._indexes[entity] = index
+        return len(index)
+
+    def suggest(self, entity: str, query: str, limit: int = AUTOCOMPLETE_DEFAULT_LIMIT) -> List[dict]:
+        """Suggestions for a typed prefix"""
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        if entity not in self._indexes:
+            with self._rebuild_locks[entity]:
+                # A concurrent first lookup may have built it while this one waited
+                if entity not in self._indexes:
+                    self._rebuild(entity)
+        with self._lock:
+            return self._indexes[entity].search(prefix, limit)
+
+    def _apply(self, index: PrefixIndex, entity: str, item_id: str, item: Optional[dict]) -> None:
+        entry = item_entry(entity, item) if item is not None else None
+        if entry:
+            index.upsert(*entry)
+        else:
+            index.remove(item_id)
+
+    def _record(self, table_name: str, item_id: str, item: Optional[dict]) -> None:
+        entity = TABLE_ENTITIES.get(table_name)
+        if entity is None:
+            return
+        with self._lock:
+            if entity in self._pending:
+                self._pending[entity].append((item_id, item))
+            if entity in self._indexes:
+                self._apply(self._indexes[entity], entity, item_id, item)
+
+    def upsert(self, table_name: str, items: Iterable[dict]) -> None:
+        """Hook for created or updated rows; inactive rows are dropped from suggestions"""
+        key_name = AUTOCOMPLETE_SOURCES[TABLE_ENTITIES[table_name]]['key'] if table_name in TABLE_ENTITIES else None
+        for item in items:
+            if key_name:
+                self._record(table_name, str(item[key_name]), item)
+
+    def remove(self, table_name: str, item_id: str) -> None:
+        """Hook for deleted rows"""
+        self._record(table_name, str(item_id), None)
+
+    def clear(self) -> None:
+        """Drop every index; each is rebuilt on its next lookup"""
+        with self._lock:
+            self._indexes.clear()
+
+    def _rebuild_loop(self, interval_seconds: int) -> None:
+        while not self._stop_event.wait(interval_seconds):
+            for entity in list(self._indexes):
+                try:
+                    self.rebuild(entity)
+                except Exception as e:
+                    print(f"Autocomplete rebuild of {entity} failed: {e}")
+
+    def start_rebuilder(self, interval_seconds: int = AUTOCOMPLETE_REBUILD_SECONDS) -> Optional[threading.Thread]:
+        """Rebuild the indexes in use periodically in a daemon thread (0 disables it)"""
+        if interval_seconds <= 0:
+            return None
+        self._stop_event.clear()
+        thread = threading.Thread(target=self._rebuild_loop, args=(interval_seconds,),
+                                  name="autocomplete-rebuilder", daemon=True)
+        thread.start()
+        return thread
+
+    def stop_rebuilder(self) -> None:
+        self._stop_event.set()
+
+
+autocomplete = Autocomplete()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark decoding a page of stored survey items into Survey models.
+
+Compares the validated path (deserialize_item + convert_survey_data +
+Survey(**data)) with the precompiled codec (crud.ITEM_CODECS['Surveys'])
+on a page of synthetic items shaped like stored surveys, and reports the
+per-item cost of each.
+
+Usage: python benchmark_item_codecs.py [page_size] [repeats]
+"""
+import os
+import sys
+import time
+from decimal import Decimal
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from crud import ITEM_CODECS, convert_survey_data, deserialize_item
+from models import Survey
+
+
+def survey_items(count: int) -> list:
+    """Items as a Surveys scan returns them: ISO date strings, Decimal numbers"""
+    items = []
+    for i in range(count):
+        item = {
+            'SurveyId': f"survey-{i:06d}",
+            'SurveyNumber': f"S-{i:06d}",
+            'SurveyTypeId': 'boundary',
+            'CustomerId': f"customer-{i % 97}",
+            'PropertyId': f"property-{i % 89}",
+            'StatusId': ('open', 'scheduled', 'fieldwork', 'done')[i % 4],
+            'Title': f"Boundary survey {i}",
+            'Notes': 'Stake corners and locate monuments along the north line',
+            'QuotedPrice': Decimal('1250.00'),
+            'EstimatedCost': Decimal('800.50'),
+            'RequestDate': '2024-03-01T09:30:00',
+            'ScheduledDate': '2024-03-08T08:00:00',
+            'DueDate': '2024-03-22T17:00:00',
+            'IsFieldworkComplete': i % 2 == 0,
+            'IsDrawingComplete': False,
+            'IsScanned': False,
+            'IsDelivered': False,
+            'BoardPosition': Decimal(i % 25),
+            'IsActive': True,
+            'CreatedDate': '2024-03-01T09:30:00.123456',
+            'ModifiedDate': '2024-03-05T14:12:45.654321',
+        }
+        if i % 3 == 0:
+            item['CompletedDate'] = '2024-03-20T16:00:00'
+        items.append(item)
+    return items
+
+
+def validated(item: dict) -> Survey:
+    return Survey(**convert_survey_data(deserialize_item(item)))
+
+
+def per_item_microseconds(decode, items: list, repeats: int) -> float:
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for item in items:
+            decode(item)
+        best = min(best, time.perf_counter() - start)
+    return best / len(items) * 1e6
+
+
+def main() -> None:
+    page_size = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 7
+    items = survey_items(page_size)
+    codec = ITEM_CODECS['Surveys']
+
+    # Both paths must build the same models before their speed means anything
+    for item in items[:50]:
+        assert codec.decode(item).model_dump() == validated(item).model_dump()
+
+    old = per_item_microseconds(validated, items, repeats)
+    new = per_item_microseconds(codec.decode, items, repeats)
+    print(f"{page_size}-survey page, best of {repeats}")
+    print(f"  validated path: {old:8.2f} us/item  {old * page_size / 1000:8.2f} ms/page")
+    print(f"  item codec:     {new:8.2f} us/item  {new * page_size / 1000:8.2f} ms/page")
+    print(f"  speedup:        {old / new:8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
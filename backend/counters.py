@@ -0,0 +1,205 @@
+"""
+Maintained entity counters for list totals.
+
+Create and delete paths in crud adjust a small item per entity (and per survey
+status) in the Counters table with an atomic ADD, so list endpoints can read
+totals with one get_item instead of a Select='COUNT' scan. Counters track
+active rows only. A periodic reconciliation job recomputes every counter with
+a parallel scan to correct any drift.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional
+
+from botocore.exceptions import ClientError
+
+import parallel_scan
+from database import get_dynamodb, get_table
+
+COUNTERS_TABLE = 'Counters'
+RECONCILE_SEGMENTS = int(os.getenv("COUNTER_RECONCILE_SEGMENTS", "4"))
+RECONCILE_INTERVAL_SECONDS = int(os.getenv("COUNTER_RECONCILE_INTERVAL_SECONDS", "0"))
+
+# Tables with maintained counters and the attributes needed to tally them
+COUNTED_TABLES = {
+    'Customers': ['IsActive'],
+    'Properties': ['IsActive'],
+    'Surveys': ['IsActive', 'StatusId', 'SurveyStatusId'],
+}
+
+STATUS_COUNTER_PREFIX = 'Surveys#Status#'
+
+
+def status_counter_name(status_id: str) -> str:
+    """Counter name for the number of active surveys in a status"""
+    return f"{STATUS_COUNTER_PREFIX}{status_id}"
+
+
+def survey_status_id(item: dict) -> Optional[str]:
+    """Status of a stored survey item, which may use either attribute name"""
+    return item.get('SurveyStatusId') or item.get('StatusId')
+
+
+def increment(name: str, delta: int = 1) -> None:
+    """Atomically add delta to a counter, creating it if needed"""
+    table = get_table(COUNTERS_TABLE)
+    if not delta:
+        return
+    try:
+        table.update_item(
+            Key={'CounterName': name},
+            UpdateExpression='ADD CounterValue :delta',
+            ExpressionAttributeValues={':delta': delta}
+        )
+    except ClientError as e:
+        print(f"Error incrementing counter {name}: {e}")
+
+
+def increment_many(deltas: Dict[str, int]) -> None:
+    """Apply several counter deltas"""
+    for name, delta in deltas.items():
+        increment(name, delta)
+
+
+def active_delta(old_item: Optional[dict], new_item: dict) -> int:
+    """Counter delta for an update that may have soft deleted or reactivated a row"""
+    was_counted = bool(old_item) and bool(old_item.get('IsActive', True))
+    return int(bool(new_item.get('IsActive', True))) - int(was_counted)
+
+
+def survey_deltas(item: dict, sign: int = 1) -> Dict[str, int]:
+    """Counter deltas for adding (sign=1) or removing (sign=-1) a survey item"""
+    if not item.get('IsActive', True):
+        return {}
+    deltas = {'Surveys': sign}
+    status_id = survey_status_id(item)
+    if status_id:
+        deltas[status_counter_name(status_id)] = sign
+    return deltas
+
+
+def get_count(name: str) -> Optional[int]:
+    """Read a counter, or None if it has never been written"""
+    table = get_table(COUNTERS_TABLE)
+    try:
+        response = table.get_item(Key={'CounterName': name}, ProjectionExpression='CounterValue')
+        item = response.get('Item')
+        if item is None:
+            return None
+        return max(int(item.get('CounterValue', 0)), 0)
+    except ClientError as e:
+        print(f"Error getting counter {name}: {e}")
+        return None
+
+
+def get_counts(names: Iterable[str]) -> Dict[str, int]:
+    """Read several counters with BatchGetItem; missing counters read as 0"""
+    names = list(dict.fromkeys(names))
+    counts = {name: 0 for name in names}
+    if not names:
+        return counts
+    dynamodb = get_dynamodb()
+
+    try:
+        for start in range(0, len(names), 100):
+            request = {
+                COUNTERS_TABLE: {
+                    'Keys': [{'CounterName': name} for name in names[start:start + 100]],
+                    'ProjectionExpression': 'CounterName, CounterValue'
+                }
+            }
+            while request:
+                response = dynamodb.batch_get_item(RequestItems=request)
+                for item in response.get('Responses', {}).get(COUNTERS_TABLE, []):
+                    counts[item['CounterName']] = max(int(item.get('CounterValue', 0)), 0)
+                request = response.get('UnprocessedKeys') or None
+    except ClientError as e:
+        print(f"Error getting counters: {e}")
+    return counts
+
+
+def _tally(table_name: str, item: dict, counts: Dict[str, int]) -> None:
+    if table_name == 'Surveys':
+        deltas = survey_deltas(item)
+    elif item.get('IsActive', True):
+        deltas = {table_name: 1}
+    else:
+        deltas = {}
+    for name, delta in deltas.items():
+        counts[name] = counts.get(name, 0) + delta
+
+
+def _count_table(table_name: str, segments: int) -> Dict[str, int]:
+    counts = {}
+    for item in parallel_scan.scan_items(get_table(table_name), segments=segments,
+                                         projection=COUNTED_TABLES[table_name]):
+        _tally(table_name, item, counts)
+    return counts
+
+
+def compute_counts(segments: int = RECONCILE_SEGMENTS) -> Dict[str, int]:
+    """Recompute every counter from the source tables with a parallel scan"""
+    counts = {table_name: 0 for table_name in COUNTED_TABLES}
+    with ThreadPoolExecutor(max_workers=len(COUNTED_TABLES)) as executor:
+        futures = [executor.submit(_count_table, table_name, segments) for table_name in COUNTED_TABLES]
+        for future in futures:
+            for name, value in future.result().items():
+                counts[name] = counts.get(name, 0) + value
+    return counts
+
+
+def reconcile(segments: int = RECONCILE_SEGMENTS) -> Dict[str, int]:
+    """Recompute all counters and overwrite the stored values"""
+    table = get_table(COUNTERS_TABLE)
+    try:
+        counts = compute_counts(segments)
+
+        # Zero out status counters for statuses that no longer have surveys
+        response = table.scan(ProjectionExpression='CounterName')
+        stored = [item['CounterName'] for item in response.get('Items', [])]
+        while response.get('LastEvaluatedKey'):
+            response = table.scan(ProjectionExpression='CounterName', ExclusiveStartKey=response['LastEvaluatedKey'])
+            stored.extend(item['CounterName'] for item in response.get('Items', []))
+        for name in stored:
+            counts.setdefault(name, 0)
+
+        with table.batch_writer() as batch:
+            for name, value in counts.items():
+                batch.put_item(Item={'CounterName': name, 'CounterValue': value})
+        return counts
+    except ClientError as e:
+        print(f"Error reconciling counters: {e}")
+        return {}
+
+
+_stop_event = threading.Event()
+
+
+def _reconcile_loop(interval_seconds: int) -> None:
+    while not _stop_event.wait(interval_seconds):
+        try:
+            reconcile()
+        except Exception as e:
+            print(f"Counter reconciliation failed: {e}")
+
+
+def start_reconciler(interval_seconds: int = RECONCILE_INTERVAL_SECONDS) -> Optional[threading.Thread]:
+    """Start the periodic reconciliation job in a daemon thread (0 disables it)"""
+    if interval_seconds <= 0:
+        return None
+    _stop_event.clear()
+    thread = threading.Thread(target=_reconcile_loop, args=(interval_seconds,), name="counter-reconciler", daemon=True)
+    thread.start()
+    return thread
+
+
+def stop_reconciler() -> None:
+    """Stop the periodic reconciliation job"""
+    _stop_event.set()
+
+
+if __name__ == "__main__":
+    print("Reconciling counters...")
+    for name, value in sorted(reconcile().items()):
+        print(f"  {name}: {value}")
@@ -1,13 +1,25 @@
 from boto3.dynamodb.conditions import Key, Attr
 from botocore.exceptions import ClientError
+from pydantic import ValidationError
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor
+import os
+import random
+import time
 import uuid
 
-from database import get_table
+from database import get_table, get_dynamodb
 from models import *
+from pagination import encode_cursor, decode_cursor
+import counters
+from lookup_cache import lookup_cache
 import schemas
+import search_index
+from autocomplete import autocomplete
+from write_coalescer import WriteCoalescer
+from item_codecs import ItemCodec
 
 # Helper functions
 def serialize_datetime(obj):
@@ -48,120 +60,358 @@ def deserialize_item(item: dict) -> dict:
             deserialized[key] = value
     return deserialized
 
+def _validator(model):
+    """Validating (slow) read path for items a codec's fast path can't convert"""
+    return lambda item: model(**deserialize_item(item))
+
+def _validate_survey(item: dict) -> Survey:
+    return Survey(**convert_survey_data(deserialize_item(item)))
+
+# Survey fields given a value when a stored row lacks them
+SURVEY_FILL = {
+    'CustomerId': lambda: str(uuid.uuid4()),
+    'PropertyId': lambda: str(uuid.uuid4()),
+    'SurveyTypeId': lambda: str(uuid.uuid4()),
+    'SurveyStatusId': lambda: str(uuid.uuid4()),
+    'SurveyNumber': lambda: f"SURVEY-{datetime.now().strftime('%Y%m%d-%H%M%S')}",
+    'CreatedDate': datetime.utcnow,
+    'ModifiedDate': datetime.utcnow,
+}
+
+# Read/write codecs per table, built once from the model fields
+ITEM_CODECS = {
+    'Customers': ItemCodec(Customer, _validator(Customer)),
+    'Properties': ItemCodec(Property, _validator(Property)),
+    'Townships': ItemCodec(Township, _validator(Township)),
+    'SurveyTypes': ItemCodec(SurveyType, _validator(SurveyType)),
+    'SurveyStatuses': ItemCodec(SurveyStatus, _validator(SurveyStatus)),
+    'UserSettings': ItemCodec(UserSettings, _validator(UserSettings)),
+    'BoardConfigurations': ItemCodec(BoardConfiguration, _validator(BoardConfiguration)),
+    # Older rows carry the status as StatusId only
+    'Surveys': ItemCodec(Survey, _validate_survey, aliases={'SurveyStatusId': 'StatusId'}, fill=SURVEY_FILL),
+}
+
+# Conditional updates
+class UpdateConflictError(Exception):
+    """The item changed since the caller read it (its ModifiedDate no longer matches)"""
+
+
+def conditional_update(table, key_name: str, key_value: str, expected_modified_date=None,
+                       **update_kwargs) -> Optional[dict]:
+    """update_item that only applies to an existing item, in a single round trip.
+
+    Returns the update_item response, or None if the item does not exist.
+    With expected_modified_date the update also requires the stored
+    ModifiedDate to match, raising UpdateConflictError when it has moved on.
+    """
+    condition = Attr(key_name).exists()
+    if expected_modified_date is not None:
+        condition &= Attr('ModifiedDate').eq(serialize_datetime(expected_modified_date))
+    try:
+        return table.update_item(
+            Key={key_name: key_value},
+            ConditionExpression=condition,
+            ReturnValuesOnConditionCheckFailure='ALL_OLD',
+            **update_kwargs
+        )
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            raise
+        # The failed check returns the current item only if there is one
+        if 'Item' in e.response:
+            raise UpdateConflictError(f"{table.name} item {key_value} was modified by another request")
+        return None
+
+# Active index (see models.ACTIVE_INDEX)
+def with_active_key(table_name: str, item: dict) -> dict:
+    """Item to put with its ActiveId set while IsActive, or dropped once it is not"""
+    key_name = ACTIVE_INDEX_KEYS.get(table_name)
+    if key_name is None:
+        return item
+    item = dict(item)
+    if item.get('IsActive', True):
+        item[ACTIVE_KEY] = item[key_name]
+    else:
+        item.pop(ACTIVE_KEY, None)
+    return item
+
+def active_key_update(update_expression: str, expression_values: dict, is_active: bool, key_value: str) -> str:
+    """Append the ActiveId change for an IsActive update to a SET update expression.
+
+    REMOVE has to follow every SET action, so this is the last change made to
+    the expression.
+    """
+    if is_active:
+        expression_values[':active_key'] = key_value
+        return f"{update_expression}, {ACTIVE_KEY} = :active_key"
+    return f"{update_expression} REMOVE {ACTIVE_KEY}"
+
+# Pagination helpers
+# Minimum number of items evaluated per scan call when a FilterExpression is
+# applied, so selective filters do not degrade into one-item round trips
+FILTERED_SCAN_BATCH_SIZE = 100
+
+def get_key_names(table_name: str, index_name: Optional[str] = None) -> List[str]:
+    """Get the key attribute names for a table, plus the index keys when reading a GSI"""
+    table_def = DYNAMODB_TABLES[table_name]
+    key_names = [key['AttributeName'] for key in table_def['KeySchema']]
+    if index_name:
+        index_def = next(gsi for gsi in table_def['GlobalSecondaryIndexes'] if gsi['IndexName'] == index_name)
+        key_names += [key['AttributeName'] for key in index_def['KeySchema'] if key['AttributeName'] not in key_names]
+    return key_names
+
+def projection_kwargs(projection: Optional[List[str]], key_names: List[str]) -> dict:
+    """ProjectionExpression parameters reading projection plus the key attributes; {} reads whole items"""
+    if not projection:
+        return {}
+    names = list(dict.fromkeys([*key_names, *projection]))
+    return {
+        'ProjectionExpression': ', '.join(f"#p{n}" for n in range(len(names))),
+        'ExpressionAttributeNames': {f"#p{n}": name for n, name in enumerate(names)}
+    }
+
+def _read_page(operation, key_names: List[str], limit: int, skip: int = 0, after: Optional[str] = None,
+               min_batch: int = 0, **params) -> tuple[List[dict], Optional[str]]:
+    """Read one page of raw items from a scan or query, following LastEvaluatedKey across 1 MB pages.
+
+    Only ``skip + limit`` items are read; the returned cursor resumes right
+    after the last item of the page, or is None when the results are exhausted.
+    """
+    start_key = decode_cursor(after)
+    needed = skip + limit
+    items = []
+
+    while len(items) < needed:
+        request = dict(params)
+        remaining = needed - len(items)
+        request['Limit'] = max(remaining, min_batch)
+        if start_key:
+            request['ExclusiveStartKey'] = start_key
+
+        response = operation(**request)
+        items.extend(response.get('Items', []))
+        start_key = response.get('LastEvaluatedKey')
+        if not start_key:
+            break
+
+    if len(items) > needed:
+        # A filtered batch overshot the page; resume right after the last kept item
+        items = items[:needed]
+        start_key = {name: items[-1][name] for name in key_names}
+
+    return items[skip:], encode_cursor(start_key)
+
+def scan_page(table, key_names: List[str], limit: int, skip: int = 0, after: Optional[str] = None,
+              **scan_kwargs) -> tuple[List[dict], Optional[str]]:
+    """Read one page of a table scan (see _read_page)"""
+    min_batch = FILTERED_SCAN_BATCH_SIZE if 'FilterExpression' in scan_kwargs else 0
+    return _read_page(table.scan, key_names, limit, skip=skip, after=after, min_batch=min_batch, **scan_kwargs)
+
+def query_page(table, key_names: List[str], limit: int, skip: int = 0, after: Optional[str] = None,
+               **query_kwargs) -> tuple[List[dict], Optional[str]]:
+    """Read one page of a table or index query (see _read_page)"""
+    return _read_page(table.query, key_names, limit, skip=skip, after=after, **query_kwargs)
+
+def _rank_matches(table_name: str, search: str) -> Optional[tuple]:
+    ids = search_index.search_ids(table_name, search)
+    if ids is None:
+        return None
+    spec = search_index.SEARCHABLE[table_name]
+    # Ranking only needs the searchable fields; whole items are read per page
+    items = batch_get_items(table_name, spec['key'], ids, [*spec['fields'], 'IsActive']).values()
+    if table_name in ACTIVE_INDEX_KEYS:
+        items = [item for item in items if item.get('IsActive', True)]
+    return tuple(item[spec['key']] for item in search_index.rank(table_name, items, search))
+
+def search_matches(table_name: str, search: str) -> Optional[tuple]:
+    """IDs of the items matching search through the trigram index, best first; None when the index can't be used.
+
+    Results are cached briefly (search_index.search_results), so a page and
+    its total cost one search.
+    """
+    return search_index.search_results.get_or_load(
+        (table_name, search_index.normalize(search)), lambda: _rank_matches(table_name, search)
+    )
+
+def search_page(table_name: str, ids: tuple, limit: int, skip: int = 0, after: Optional[str] = None,
+                projection: Optional[List[str]] = None) -> tuple[List[dict], Optional[str]]:
+    """Fetch one page of ranked search results and the cursor for the next one"""
+    offset = int((decode_cursor(after) or {}).get('SearchOffset', 0)) + skip
+    end = offset + limit
+    page_ids = ids[offset:end]
+    items = batch_get_items(table_name, search_index.SEARCHABLE[table_name]['key'], page_ids, projection)
+    return [items[i] for i in page_ids if i in items], encode_cursor({'SearchOffset': end}) if end < len(ids) else None
+
+def count_items(table, **scan_kwargs) -> int:
+    """Count items matching a scan across every 1 MB page"""
+    total = 0
+    params = dict(scan_kwargs, Select='COUNT')
+    while True:
+        response = table.scan(**params)
+        total += response.get('Count', 0)
+        last_key = response.get('LastEvaluatedKey')
+        if not last_key:
+            return total
+        params['ExclusiveStartKey'] = last_key
+
+BATCH_GET_SIZE = 100
+BATCH_GET_WORKERS = 4
+BATCH_GET_MAX_RETRIES = 8
+BATCH_GET_BACKOFF_SECONDS = 0.05
+
+def _batch_get_chunk(dynamodb, table_name: str, key_name: str, ids: List[str],
+                     projection: Optional[List[str]] = None) -> List[dict]:
+    """Read up to BATCH_GET_SIZE keys, retrying UnprocessedKeys with exponential backoff"""
+    # The key is always projected so results can be matched back to ids
+    table_request = {'Keys': [{key_name: i} for i in ids], **projection_kwargs(projection, [key_name])}
+    
+    items = []
+    request = {table_name: table_request}
+    attempt = 0
+    while request:
+        response = dynamodb.batch_get_item(RequestItems=request)
+        items.extend(response.get('Responses', {}).get(table_name, []))
+        request = response.get('UnprocessedKeys') or None
+        if request:
+            if attempt >= BATCH_GET_MAX_RETRIES:
+                print(f"Giving up on {len(request[table_name]['Keys'])} unprocessed keys from {table_name}")
+                break
+            time.sleep(BATCH_GET_BACKOFF_SECONDS * (2 ** attempt) * random.uniform(0.5, 1.5))
+            attempt += 1
+    return items
+
+def batch_get_items(table_name: str, key_name: str, ids, projection: Optional[List[str]] = None) -> Dict[str, dict]:
+    """Fetch items by hash key with BatchGetItem, returned as {id: item}; missing ids are absent.
+
+    Keys are deduplicated and split into chunks of 100, which are read
+    concurrently. projection limits the attributes returned.
+    """
+    ids = [i for i in dict.fromkeys(ids) if i]
+    if not ids:
+        return {}
+    dynamodb = get_dynamodb()
+    
+    chunks = [ids[start:start + BATCH_GET_SIZE] for start in range(0, len(ids), BATCH_GET_SIZE)]
+    try:
+        if len(chunks) == 1:
+            results = [_batch_get_chunk(dynamodb, table_name, key_name, chunks[0], projection)]
+        else:
+            with ThreadPoolExecutor(max_workers=min(len(chunks), BATCH_GET_WORKERS)) as executor:
+                results = list(executor.map(
+                    lambda chunk: _batch_get_chunk(dynamodb, table_name, key_name, chunk, projection), chunks
+                ))
+    except ClientError as e:
+        print(f"Error batch getting from {table_name}: {e}")
+        return {}
+    
+    return {item[key_name]: item for chunk_items in results for item in chunk_items}
+
+def _items_by_ids(table_name: str, items: Dict[str, dict], ids: List[str], projection: Optional[List[str]]) -> list:
+    """Models in ids order (None where missing); projected items are decoded as partial"""
+    codec = ITEM_CODECS[table_name]
+    partial = bool(projection)
+    return [codec.decode(items[i], partial) if i in items else None for i in ids]
+
 # Customer CRUD
-def get_customer(customer_id: str) -> Optional[Customer]:
-    """Get a single customer by ID"""
+def get_customer(customer_id: str, projection: Optional[List[str]] = None) -> Optional[Customer]:
+    """Get a single customer by ID; projection limits the attributes read (see projection_kwargs)"""
     table = get_table('Customers')
     try:
-        response = table.get_item(Key={'CustomerId': customer_id})
+        response = table.get_item(Key={'CustomerId': customer_id}, **projection_kwargs(projection, ['CustomerId']))
         item = response.get('Item')
         if item:
-            return Customer(**deserialize_item(item))
+            return ITEM_CODECS['Customers'].decode(item, partial=bool(projection))
         return None
     except ClientError as e:
         print(f"Error getting customer: {e}")
         return None
 
-def get_customers(skip: int = 0, limit: int = 100, search: Optional[str] = None) -> tuple[List[Customer], int]:
-    """Get customers with pagination and optional search"""
+def get_customers_by_ids(customer_ids: List[str], projection: Optional[List[str]] = None) -> List[Optional[Customer]]:
+    """Get customers by ID with BatchGetItem, in the order given (None where missing)"""
+    items = batch_get_items('Customers', 'CustomerId', customer_ids, projection)
+    return _items_by_ids('Customers', items, customer_ids, projection)
+
+def _customer_scan_kwargs(search: Optional[str] = None) -> dict:
+    """Build scan parameters for the customer search filter"""
+    if not search:
+        return {}
+    return {
+        'FilterExpression': Attr('CompanyName').contains(search) | \
+                            Attr('CustomerCode').contains(search) | \
+                            Attr('Email').contains(search)
+    }
+
+def get_customers_page(limit: int = 100, after: Optional[str] = None, search: Optional[str] = None,
+                       skip: int = 0, projection: Optional[List[str]] = None) -> tuple[List[Customer], Optional[str]]:
+    """Get one page of active customers and the cursor for the next page.
+
+    projection limits the attributes read; the models then only carry those fields.
+    """
     table = get_table('Customers')
     
-    # Handle when DynamoDB is not available
-    if table is None:
-        print("Using mock customer data")
-        mock_customers = [
-            Customer(
-                CustomerId="mock-customer-1",
-                CustomerCode="MOCK001",
-                CompanyName="Mock Company 1",
-                ContactFirstName="John",
-                ContactLastName="Doe",
-                Email="john@mockcompany1.com",
-                Phone="555-0001",
-                IsActive=True
-            ),
-            Customer(
-                CustomerId="mock-customer-2", 
-                CustomerCode="MOCK002",
-                CompanyName="Mock Company 2",
-                ContactFirstName="Jane",
-                ContactLastName="Smith",
-                Email="jane@mockcompany2.com",
-                Phone="555-0002",
-                IsActive=True
-            )
-        ]
-        
-        # Apply search filter if provided
-        if search:
-            filtered_customers = [
-                c for c in mock_customers 
-                if search.lower() in c.CompanyName.lower() or 
-                   search.lower() in c.CustomerCode.lower() or
-                   search.lower() in c.Email.lower()
-            ]
-        else:
-            filtered_customers = mock_customers
-            
-        total = len(filtered_customers)
-        paginated_customers = filtered_customers[skip:skip + limit]
-        return paginated_customers, total
-    
     try:
-        # First, get the total count of all items
-        if search:
-            filter_expression = Attr('CompanyName').contains(search) | \
-                              Attr('CustomerCode').contains(search) | \
-                              Attr('Email').contains(search)
-            
-            # Get total count with filter
-            count_response = table.scan(
-                FilterExpression=filter_expression,
-                Select='COUNT'
-            )
-            total = count_response.get('Count', 0)
-            
-            # Get paginated items with filter
-            response = table.scan(
-                FilterExpression=filter_expression
-            )
+        matches = search_matches('Customers', search) if search else None
+        if matches is not None:
+            items, next_cursor = search_page('Customers', matches, limit, skip=skip, after=after, projection=projection)
         else:
-            # Get total count without filter
-            count_response = table.scan(Select='COUNT')
-            total = count_response.get('Count', 0)
-            
-            # Get all items without filter
-            response = table.scan()
-        
-        items = response.get('Items', [])
-        
-        # Apply pagination to the results
-        paginated_items = items[skip:skip + limit]
-        
-        customers = [Customer(**deserialize_item(item)) for item in paginated_items]
-        return customers, total
-        
+            key_names = get_key_names('Customers', ACTIVE_INDEX)
+            items, next_cursor = scan_page(
+                table, key_names, limit, skip=skip, after=after, IndexName=ACTIVE_INDEX,
+                **_customer_scan_kwargs(search), **projection_kwargs(projection, key_names)
+            )
+        return [ITEM_CODECS['Customers'].decode(item, partial=bool(projection)) for item in items], next_cursor
     except ClientError as e:
         print(f"Error getting customers: {e}")
-        return [], 0
+        return [], None
 
-def create_customer(customer: schemas.CustomerCreate) -> Optional[Customer]:
-    """Create a new customer"""
+def count_customers(search: Optional[str] = None, exact: bool = False) -> int:
+    """Count active customers, optionally matching a search term.
+
+    Unfiltered totals come from the maintained counter unless exact is set,
+    which falls back to a Select='COUNT' scan of ActiveIndex.
+    """
     table = get_table('Customers')
+    if not search and not exact:
+        total = counters.get_count('Customers')
+        if total is not None:
+            return total
     
+    try:
+        matches = search_matches('Customers', search) if search else None
+        if matches is not None:
+            return len(matches)
+        return count_items(table, IndexName=ACTIVE_INDEX, **_customer_scan_kwargs(search))
+    except ClientError as e:
+        print(f"Error counting customers: {e}")
+        return 0
+
+def get_customers(skip: int = 0, limit: int = 100, search: Optional[str] = None,
+                  exact: bool = False) -> tuple[List[Customer], int]:
+    """Get customers with pagination and optional search"""
+    customers, _ = get_customers_page(limit=limit, search=search, skip=skip)
+    return customers, count_customers(search=search, exact=exact)
+
+def _new_customer_data(customer: schemas.CustomerCreate) -> dict:
+    """Customer attributes for a new row, with generated ID and timestamps"""
     customer_data = customer.dict()
     customer_data['CustomerId'] = str(uuid.uuid4())
     customer_data['CreatedDate'] = datetime.utcnow()
     customer_data['ModifiedDate'] = datetime.utcnow()
+    return customer_data
+
+def create_customer(customer: schemas.CustomerCreate) -> Optional[Customer]:
+    """Create a new customer"""
+    table = get_table('Customers')
     
-    # Handle when DynamoDB is not available
-    if table is None:
-        print(f"Mock: Creating customer {customer_data['CompanyName']}")
-        return Customer(**customer_data)
+    customer_data = _new_customer_data(customer)
     
     try:
-        serialized_data = serialize_item(customer_data)
+        serialized_data = with_active_key('Customers', serialize_item(customer_data))
         table.put_item(Item=serialized_data)
+        if customer_data.get('IsActive', True):
+            counters.increment('Customers')
+        search_index.index_new_items('Customers', [serialized_data])
+        autocomplete.upsert('Customers', [serialized_data])
         return Customer(**customer_data)
     except ClientError as e:
         print(f"Error creating customer: {e}")
@@ -182,19 +432,30 @@ def update_customer(customer_id: str, customer: schemas.CustomerUpdate) -> Optio
         expression_attribute_values[f":{key}"] = serialize_datetime(value)
     
     update_expression = "SET " + ", ".join(update_expression_parts)
+    if update_data.get('IsActive') is not None:
+        update_expression = active_key_update(update_expression, expression_attribute_values,
+                                              update_data['IsActive'], customer_id)
     
     try:
-        response = table.update_item(
-            Key={'CustomerId': customer_id},
+        response = conditional_update(
+            table, 'CustomerId', customer_id,
             UpdateExpression=update_expression,
             ExpressionAttributeValues=expression_attribute_values,
-            ReturnValues="ALL_NEW"
+            ReturnValues="ALL_OLD"
         )
-        
-        updated_item = response.get('Attributes')
-        if updated_item:
-            return Customer(**deserialize_item(updated_item))
-        return None
+        if response is None:
+            return None
+
+        # The old item tells whether IsActive flipped; the new one is the old
+        # item with the SET values applied
+        old_item = response.get('Attributes', {})
+        updated_item = dict(old_item, CustomerId=customer_id)
+        updated_item.update({key: expression_attribute_values[f":{key}"] for key in update_data})
+        updated_item = with_active_key('Customers', updated_item)
+        counters.increment('Customers', counters.active_delta(old_item, updated_item))
+        search_index.index_item('Customers', updated_item)
+        autocomplete.upsert('Customers', [updated_item])
+        return ITEM_CODECS['Customers'].decode(updated_item)
         
     except ClientError as e:
         print(f"Error updating customer: {e}")
@@ -205,16 +466,26 @@ def delete_customer(customer_id: str) -> bool:
     table = get_table('Customers')
     
     try:
-        table.update_item(
+        response = table.update_item(
             Key={'CustomerId': customer_id},
-            UpdateExpression="SET IsActive = :inactive, ModifiedDate = :modified",
+            UpdateExpression=f"SET IsActive = :inactive, ModifiedDate = :modified REMOVE {ACTIVE_KEY}",
+            ConditionExpression="attribute_exists(CustomerId)",
             ExpressionAttributeValues={
                 ':inactive': False,
                 ':modified': datetime.utcnow().isoformat()
-            }
+            },
+            ReturnValues="ALL_OLD"
         )
+        # Only count the transition from active to inactive
+        if response.get('Attributes', {}).get('IsActive', True):
+            counters.increment('Customers', -1)
+        autocomplete.remove('Customers', customer_id)
+        # Cached search results still list the customer as active
+        search_index.search_results.invalidate('Customers')
         return True
     except ClientError as e:
+        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            return False
         print(f"Error deleting customer: {e}")
         return False
 
@@ -251,177 +522,178 @@ def convert_survey_data(item_data: dict) -> dict:
                     item_data[field] = None
     
     # Ensure required fields have default values if missing
-    required_fields = {
-        'CustomerId': str(uuid.uuid4()),
-        'PropertyId': str(uuid.uuid4()),
-        'SurveyTypeId': str(uuid.uuid4()),
-        'SurveyStatusId': str(uuid.uuid4()),  # Use SurveyStatusId for the model
-        'SurveyNumber': f"SURVEY-{datetime.now().strftime('%Y%m%d-%H%M%S')}",
-        'CreatedDate': datetime.utcnow(),
-        'ModifiedDate': datetime.utcnow(),
-    }
-    
-    for field, default_value in required_fields.items():
+    for field, default in SURVEY_FILL.items():
         if field not in item_data or item_data[field] is None:
-            item_data[field] = default_value
+            item_data[field] = default()
     
     return item_data
 
 # Survey CRUD
-def get_survey(survey_id: str) -> Optional[Survey]:
-    """Get a single survey by ID"""
+def get_survey(survey_id: str, projection: Optional[List[str]] = None) -> Optional[Survey]:
+    """Get a single survey by ID; projection limits the attributes read (see projection_kwargs)"""
     table = get_table('Surveys')
     try:
-        response = table.get_item(Key={'SurveyId': survey_id})
+        response = table.get_item(Key={'SurveyId': survey_id}, **projection_kwargs(projection, ['SurveyId']))
         item = response.get('Item')
         if item:
-            item_data = deserialize_item(item)
-            item_data = convert_survey_data(item_data)
-            return Survey(**item_data)
+            return ITEM_CODECS['Surveys'].decode(item, partial=bool(projection))
         return None
     except ClientError as e:
         print(f"Error getting survey: {e}")
         return None
     except Exception as e:
         print(f"Error creating Survey model: {e}")
-        print(f"Survey data: {item_data if 'item_data' in locals() else 'N/A'}")
+        print(f"Survey data: {item}")
         return None
 
-def get_surveys(skip: int = 0, limit: int = 100, search: Optional[str] = None) -> tuple[List[Survey], int]:
-    """Get surveys with pagination and optional search"""
+def _survey_scan_kwargs(search: Optional[str] = None) -> dict:
+    """Build scan parameters for the survey search filter"""
+    if not search:
+        return {}
+    return {
+        'FilterExpression': Attr('SurveyNumber').contains(search) | \
+                            Attr('Notes').contains(search)
+    }
+
+def get_surveys_by_ids(survey_ids: List[str], projection: Optional[List[str]] = None) -> List[Optional[Survey]]:
+    """Get surveys by ID with BatchGetItem, in the order given (None where missing)"""
+    items = batch_get_items('Surveys', 'SurveyId', survey_ids, projection)
+    return _items_by_ids('Surveys', items, survey_ids, projection)
+
+def items_to_surveys(items: List[dict], partial: bool = False) -> List[Survey]:
+    """Convert raw DynamoDB survey items to Survey models, skipping bad rows; partial for projected items"""
+    surveys = []
+    decode = ITEM_CODECS['Surveys'].decode
+    for item in items:
+        try:
+            surveys.append(decode(item, partial))
+        except Exception as e:
+            print(f"Error creating survey from item {item}: {e}")
+            continue
+    return surveys
+
+def get_surveys_page(limit: int = 100, after: Optional[str] = None, search: Optional[str] = None,
+                     skip: int = 0, projection: Optional[List[str]] = None) -> tuple[List[Survey], Optional[str]]:
+    """Get one page of surveys and the cursor for the next page.
+
+    projection limits the attributes read; the models then only carry those fields.
+    """
     table = get_table('Surveys')
     
-    # Handle when DynamoDB is not available
-    if table is None:
-        print("Using mock survey data")
-        mock_surveys = [
-            Survey(
-                SurveyId="mock-survey-1",
-                SurveyNumber="SURV001",
-                CustomerId="mock-customer-1",
-                PropertyId="mock-property-1",
-                SurveyDate=datetime.utcnow().date(),
-                Notes="Mock survey for testing"
-            ),
-            Survey(
-                SurveyId="mock-survey-2",
-                SurveyNumber="SURV002", 
-                CustomerId="mock-customer-2",
-                PropertyId="mock-property-2",
-                SurveyDate=datetime.utcnow().date(),
-                Notes="Another mock survey"
-            )
-        ]
-        
-        # Apply search filter if provided
-        if search:
-            filtered_surveys = [
-                s for s in mock_surveys 
-                if search.lower() in s.SurveyNumber.lower() or 
-                   search.lower() in s.Notes.lower()
-            ]
-        else:
-            filtered_surveys = mock_surveys
-            
-        total = len(filtered_surveys)
-        paginated_surveys = filtered_surveys[skip:skip + limit]
-        return paginated_surveys, total
-    
     try:
-        # First, get the total count of all items
-        if search:
-            filter_expression = Attr('SurveyNumber').contains(search) | \
-                              Attr('Notes').contains(search)
-            
-            # Get total count with filter
-            count_response = table.scan(
-                FilterExpression=filter_expression,
-                Select='COUNT'
-            )
-            total = count_response.get('Count', 0)
-            
-            # Get paginated items with filter
-            response = table.scan(
-                FilterExpression=filter_expression
-            )
+        matches = search_matches('Surveys', search) if search else None
+        if matches is not None:
+            items, next_cursor = search_page('Surveys', matches, limit, skip=skip, after=after, projection=projection)
         else:
-            # Get total count without filter
-            count_response = table.scan(Select='COUNT')
-            total = count_response.get('Count', 0)
-            
-            # Get all items without filter
-            response = table.scan()
-        
-        items = response.get('Items', [])
-        
-        # Apply pagination to the results
-        paginated_items = items[skip:skip + limit]
-        
-        surveys = []
-        for item in paginated_items:
-            try:
-                # Deserialize and convert data
-                item_data = deserialize_item(item)
-                item_data = convert_survey_data(item_data)
-                
-                survey = Survey(**item_data)
-                surveys.append(survey)
-            except Exception as e:
-                print(f"Error creating survey from item {item}: {e}")
-                continue
-                
-        return surveys, total
-        
+            key_names = get_key_names('Surveys')
+            items, next_cursor = scan_page(
+                table, key_names, limit, skip=skip, after=after,
+                **_survey_scan_kwargs(search), **projection_kwargs(projection, key_names)
+            )
+        return items_to_surveys(items, partial=bool(projection)), next_cursor
     except ClientError as e:
         print(f"Error getting surveys: {e}")
-        return [], 0
+        return [], None
 
-def create_survey(survey: schemas.SurveyCreate) -> Optional[Survey]:
-    """Create a new survey"""
+def count_surveys(search: Optional[str] = None, exact: bool = False) -> int:
+    """Count surveys, optionally matching a search term.
+
+    Unfiltered totals come from the maintained counter (active rows) unless
+    exact is set, which falls back to a full Select='COUNT' scan.
+    """
     table = get_table('Surveys')
+    if not search and not exact:
+        total = counters.get_count('Surveys')
+        if total is not None:
+            return total
+    
+    try:
+        matches = search_matches('Surveys', search) if search else None
+        if matches is not None:
+            return len(matches)
+        return count_items(table, **_survey_scan_kwargs(search))
+    except ClientError as e:
+        print(f"Error counting surveys: {e}")
+        return 0
+
+def get_surveys_by_status(status_id: str, since: Optional[datetime] = None, limit: int = 100,
+                          cursor: Optional[str] = None,
+                          projection: Optional[List[str]] = None) -> tuple[List[Survey], Optional[str]]:
+    """Get active surveys in a status, most recently modified first, via StatusIdIndex.
+
+    since restricts the results to surveys modified at or after that time;
+    projection limits the attributes read.
+    """
+    table = get_table('Surveys')
+    key_condition = Key('StatusId').eq(status_id)
+    if since is not None:
+        key_condition = key_condition & Key('ModifiedDate').gte(
+            since.isoformat() if isinstance(since, datetime) else since
+        )
     
+    try:
+        key_names = get_key_names('Surveys', 'StatusIdIndex')
+        items, next_cursor = query_page(
+            table, key_names, limit, after=cursor,
+            IndexName='StatusIdIndex',
+            KeyConditionExpression=key_condition,
+            FilterExpression=Attr('IsActive').not_exists() | Attr('IsActive').eq(True),
+            ScanIndexForward=False,
+            **projection_kwargs(projection, key_names)
+        )
+        return items_to_surveys(items, partial=bool(projection)), next_cursor
+    except ClientError as e:
+        print(f"Error getting surveys for status {status_id}: {e}")
+        return [], None
+
+def get_surveys(skip: int = 0, limit: int = 100, search: Optional[str] = None,
+                exact: bool = False) -> tuple[List[Survey], int]:
+    """Get surveys with pagination and optional search"""
+    surveys, _ = get_surveys_page(limit=limit, search=search, skip=skip)
+    return surveys, count_surveys(search=search, exact=exact)
+
+def _new_survey_data(survey: schemas.SurveyCreate) -> dict:
+    """Survey attributes for a new row, with generated ID and timestamps"""
     survey_data = survey.dict()
     survey_data['SurveyId'] = str(uuid.uuid4())
     survey_data['CreatedDate'] = datetime.utcnow()
     survey_data['ModifiedDate'] = datetime.utcnow()
     survey_data['RequestDate'] = datetime.utcnow()
+    return survey_data
+
+def create_survey(survey: schemas.SurveyCreate) -> Optional[Survey]:
+    """Create a new survey"""
+    table = get_table('Surveys')
     
-    # Convert float values to Decimal for DynamoDB compatibility
-    decimal_fields = ['QuotedPrice', 'FinalPrice', 'EstimatedCost', 'ActualCost']
-    for field in decimal_fields:
-        if field in survey_data and isinstance(survey_data[field], (int, float)):
-            survey_data[field] = Decimal(str(survey_data[field]))
+    survey_data = _new_survey_data(survey)
     
     try:
-        serialized_data = serialize_item(survey_data)
+        serialized_data = ITEM_CODECS['Surveys'].encode(survey_data)
         table.put_item(Item=serialized_data)
-        return Survey(**survey_data)
+        counters.increment_many(counters.survey_deltas(serialized_data))
+        search_index.index_new_items('Surveys', [serialized_data])
+        return ITEM_CODECS['Surveys'].decode(serialized_data)
     except ClientError as e:
         print(f"Error creating survey: {e}")
         return None
 
-def update_survey(survey_id: str, survey: schemas.SurveyUpdate) -> Optional[Survey]:
-    """Update an existing survey"""
+def update_survey(survey_id: str, survey: schemas.SurveyUpdate,
+                  expected_modified_date: Optional[datetime] = None) -> Optional[Survey]:
+    """Update an existing survey in one round trip (None if it does not exist).
+
+    Raises UpdateConflictError if expected_modified_date no longer matches.
+    """
     table = get_table('Surveys')
     
-    # First check if survey exists
-    existing_survey = get_survey(survey_id)
-    if not existing_survey:
-        return None
-    
     # Get only the fields that were provided (non-None values)
     survey_data = survey.dict(exclude_unset=True)
     survey_data['ModifiedDate'] = datetime.utcnow()
+    # Encoding drops None values and stores prices as Decimal
+    survey_data = ITEM_CODECS['Surveys'].encode(survey_data)
     
-    # Handle field name mapping - convert StatusId to SurveyStatusId for DynamoDB
-    if 'StatusId' in survey_data:
-        survey_data['SurveyStatusId'] = survey_data.pop('StatusId')
-    
-    # Convert float values to Decimal for DynamoDB compatibility
-    decimal_fields = ['QuotedPrice', 'FinalPrice', 'EstimatedCost', 'ActualCost']
-    for field in decimal_fields:
-        if field in survey_data and isinstance(survey_data[field], (int, float)):
-            survey_data[field] = Decimal(str(survey_data[field]))
+    # Status is stored as StatusId so the survey stays in StatusIdIndex; older
+    # items may still carry a SurveyStatusId copy, which is dropped below
+    status_changed = survey_data.get('StatusId') is not None
     
     # Build update expression
     update_expression = "SET "
@@ -436,160 +708,147 @@ def update_survey(survey_id: str, survey: schemas.SurveyUpdate) -> Optional[Surv
     
     # Remove trailing comma and space
     update_expression = update_expression.rstrip(", ")
+    if status_changed:
+        update_expression += " REMOVE SurveyStatusId"
     
     try:
-        serialized_values = serialize_item(expression_attribute_values)
-        response = table.update_item(
-            Key={'SurveyId': survey_id},
+        # ALL_OLD gives the previous status for the counters; the new item is
+        # the old one with the SET values applied
+        response = conditional_update(
+            table, 'SurveyId', survey_id, expected_modified_date,
             UpdateExpression=update_expression,
             ExpressionAttributeNames=expression_attribute_names,
-            ExpressionAttributeValues=serialized_values,
-            ReturnValues="ALL_NEW"
+            ExpressionAttributeValues=expression_attribute_values,
+            ReturnValues="ALL_OLD"
         )
+        if response is None:
+            return None
         
-        if response.get('Attributes'):
-            updated_data = deserialize_item(response['Attributes'])
-            print(f"After deserialize_item: {[(k, type(v), v) for k, v in updated_data.items() if k in ['QuotedPrice', 'FinalPrice', 'EstimatedCost', 'ActualCost']]}")
-            updated_data = convert_survey_data(updated_data)
-            print(f"After convert_survey_data: {[(k, type(v), v) for k, v in updated_data.items() if k in ['QuotedPrice', 'FinalPrice', 'EstimatedCost', 'ActualCost']]}")
-            print(f"All data types before Survey creation: {[(k, type(v)) for k, v in updated_data.items()]}")
-            return Survey(**updated_data)
-        return None
+        old_item = response['Attributes']
+        new_item = dict(old_item)
+        new_item.update({name[1:]: value for name, value in expression_attribute_values.items()})
+        if status_changed:
+            new_item.pop('SurveyStatusId', None)
+        
+        old_status = counters.survey_status_id(old_item)
+        new_status = counters.survey_status_id(new_item)
+        if status_changed and old_item.get('IsActive', True) and new_status != old_status:
+            # Surveys without a status have no status counter to adjust
+            changes = [(status_id, delta) for status_id, delta in ((old_status, -1), (new_status, 1)) if status_id]
+            counters.increment_many({counters.status_counter_name(status_id): delta for status_id, delta in changes})
+        search_index.index_item('Surveys', new_item)
+        
+        return ITEM_CODECS['Surveys'].decode(new_item)
     except ClientError as e:
         print(f"Error updating survey: {e}")
         return None
+    except UpdateConflictError:
+        raise
     except Exception as e:
         print(f"Error creating updated Survey model: {e}")
         return None
 
 # Property CRUD
-def get_property(property_id: str) -> Optional[Property]:
-    """Get a single property by ID"""
+def get_property(property_id: str, projection: Optional[List[str]] = None) -> Optional[Property]:
+    """Get a single property by ID; projection limits the attributes read (see projection_kwargs)"""
     table = get_table('Properties')
     try:
-        response = table.get_item(Key={'PropertyId': property_id})
+        response = table.get_item(Key={'PropertyId': property_id}, **projection_kwargs(projection, ['PropertyId']))
         item = response.get('Item')
         if item:
-            return Property(**deserialize_item(item))
+            return ITEM_CODECS['Properties'].decode(item, partial=bool(projection))
         return None
     except ClientError as e:
         print(f"Error getting property: {e}")
         return None
 
-def get_properties(skip: int = 0, limit: int = 100, search: Optional[str] = None) -> tuple[List[Property], int]:
-    """Get properties with pagination and optional search"""
+def get_properties_by_ids(property_ids: List[str], projection: Optional[List[str]] = None) -> List[Optional[Property]]:
+    """Get properties by ID with BatchGetItem, in the order given (None where missing)"""
+    items = batch_get_items('Properties', 'PropertyId', property_ids, projection)
+    return _items_by_ids('Properties', items, property_ids, projection)
+
+def _property_scan_kwargs(search: Optional[str] = None) -> dict:
+    """Build scan parameters for the property search filter"""
+    if not search:
+        return {}
+    return {
+        'FilterExpression': Attr('PropertyName').contains(search) | \
+                            Attr('PropertyCode').contains(search) | \
+                            Attr('OwnerName').contains(search)
+    }
+
+def get_properties_page(limit: int = 100, after: Optional[str] = None, search: Optional[str] = None,
+                        skip: int = 0, projection: Optional[List[str]] = None) -> tuple[List[Property], Optional[str]]:
+    """Get one page of active properties and the cursor for the next page.
+
+    projection limits the attributes read; the models then only carry those fields.
+    """
     table = get_table('Properties')
     
-    # Handle when DynamoDB is not available
-    if table is None:
-        print("Using mock property data")
-        mock_properties = [
-            Property(
-                PropertyId=1,  # Use integer ID to match frontend
-                PropertyCode="PROP001",
-                PropertyName="Mock Property 1",
-                PropertyDescription="A sample property for testing",
-                OwnerName="John Owner",
-                OwnerPhone="555-0001",
-                OwnerEmail="john@mockowner1.com",
-                AddressId=101,  # Add numeric AddressId
-                TownshipId=201,  # Add numeric TownshipId
-                SurveyPrimaryKey=301,  # Add numeric SurveyPrimaryKey
-                LegacyTax="TAX001",
-                District="District 1",
-                Section="Section A",
-                Block="Block 1",
-                Lot="Lot 1",
-                PropertyType="Residential",
-                IsActive=True
-            ),
-            Property(
-                PropertyId=2,  # Use integer ID to match frontend
-                PropertyCode="PROP002",
-                PropertyName="Mock Property 2", 
-                PropertyDescription="Another sample property for testing",
-                OwnerName="Jane Owner",
-                OwnerPhone="555-0002", 
-                OwnerEmail="jane@mockowner2.com",
-                AddressId=102,  # Add numeric AddressId
-                TownshipId=202,  # Add numeric TownshipId
-                SurveyPrimaryKey=302,  # Add numeric SurveyPrimaryKey
-                LegacyTax="TAX002",
-                District="District 2",
-                Section="Section B",
-                Block="Block 2",
-                Lot="Lot 2",
-                PropertyType="Commercial",
-                IsActive=True
-            )
-        ]
-        
-        # Apply search filter if provided
-        if search:
-            filtered_properties = [
-                p for p in mock_properties 
-                if search.lower() in p.PropertyName.lower() or 
-                   search.lower() in p.PropertyCode.lower() or
-                   search.lower() in p.OwnerName.lower()
-            ]
-        else:
-            filtered_properties = mock_properties
-            
-        total = len(filtered_properties)
-        paginated_properties = filtered_properties[skip:skip + limit]
-        return paginated_properties, total
-    
     try:
-        # First, get the total count of all items
-        if search:
-            filter_expression = Attr('PropertyName').contains(search) | \
-                              Attr('PropertyCode').contains(search) | \
-                              Attr('OwnerName').contains(search)
-            
-            # Get total count with filter
-            count_response = table.scan(
-                FilterExpression=filter_expression,
-                Select='COUNT'
-            )
-            total = count_response.get('Count', 0)
-            
-            # Get paginated items with filter
-            response = table.scan(
-                FilterExpression=filter_expression
-            )
+        matches = search_matches('Properties', search) if search else None
+        if matches is not None:
+            items, next_cursor = search_page('Properties', matches, limit, skip=skip, after=after, projection=projection)
         else:
-            # Get total count without filter
-            count_response = table.scan(Select='COUNT')
-            total = count_response.get('Count', 0)
-            
-            # Get all items without filter
-            response = table.scan()
-        
-        items = response.get('Items', [])
-        
-        # Apply pagination to the results
-        paginated_items = items[skip:skip + limit]
-        
-        properties = [Property(**deserialize_item(item)) for item in paginated_items]
-        return properties, total
-        
+            key_names = get_key_names('Properties', ACTIVE_INDEX)
+            items, next_cursor = scan_page(
+                table, key_names, limit, skip=skip, after=after, IndexName=ACTIVE_INDEX,
+                **_property_scan_kwargs(search), **projection_kwargs(projection, key_names)
+            )
+        return [ITEM_CODECS['Properties'].decode(item, partial=bool(projection)) for item in items], next_cursor
     except ClientError as e:
         print(f"Error getting properties: {e}")
-        return [], 0
+        return [], None
 
-def create_property(property: schemas.PropertyCreate) -> Optional[Property]:
-    """Create a new property"""
+def count_properties(search: Optional[str] = None, exact: bool = False) -> int:
+    """Count active properties, optionally matching a search term.
+
+    Unfiltered totals come from the maintained counter unless exact is set,
+    which falls back to a Select='COUNT' scan of ActiveIndex.
+    """
     table = get_table('Properties')
+    if not search and not exact:
+        total = counters.get_count('Properties')
+        if total is not None:
+            return total
     
+    try:
+        matches = search_matches('Properties', search) if search else None
+        if matches is not None:
+            return len(matches)
+        return count_items(table, IndexName=ACTIVE_INDEX, **_property_scan_kwargs(search))
+    except ClientError as e:
+        print(f"Error counting properties: {e}")
+        return 0
+
+def get_properties(skip: int = 0, limit: int = 100, search: Optional[str] = None,
+                   exact: bool = False) -> tuple[List[Property], int]:
+    """Get properties with pagination and optional search"""
+    properties, _ = get_properties_page(limit=limit, search=search, skip=skip)
+    return properties, count_properties(search=search, exact=exact)
+
+def _new_property_data(property: schemas.PropertyCreate) -> dict:
+    """Property attributes for a new row, with generated ID and timestamps"""
     # Include all fields, even those with None values
     property_data = property.dict(exclude_unset=False)
     property_data['PropertyId'] = str(uuid.uuid4())
     property_data['CreatedDate'] = datetime.utcnow()
     property_data['ModifiedDate'] = datetime.utcnow()
+    return property_data
+
+def create_property(property: schemas.PropertyCreate) -> Optional[Property]:
+    """Create a new property"""
+    table = get_table('Properties')
+    
+    property_data = _new_property_data(property)
     
     try:
-        serialized_data = serialize_item(property_data)
+        serialized_data = with_active_key('Properties', serialize_item(property_data))
         table.put_item(Item=serialized_data)
+        if serialized_data.get('IsActive', True):
+            counters.increment('Properties')
+        search_index.index_new_items('Properties', [serialized_data])
+        autocomplete.upsert('Properties', [serialized_data])
         return Property(**property_data)
     except ClientError as e:
         print(f"Error creating property: {e}")
@@ -614,11 +873,17 @@ def update_property(property_id: str, property: schemas.PropertyUpdate) -> Optio
         existing_property['ModifiedDate'] = datetime.utcnow()
         
         # Save updated property
-        serialized_data = serialize_item(existing_property)
-        table.put_item(Item=serialized_data)
+        serialized_data = with_active_key('Properties', serialize_item(existing_property))
+        # Don't recreate a property deleted since it was read
+        table.put_item(Item=serialized_data, ConditionExpression=Attr('PropertyId').exists())
+        counters.increment('Properties', counters.active_delta(response['Item'], serialized_data))
+        search_index.index_item('Properties', serialized_data)
+        autocomplete.upsert('Properties', [serialized_data])
         return Property(**existing_property)
         
     except ClientError as e:
+        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            return None
         print(f"Error updating property: {e}")
         return None
 
@@ -632,12 +897,19 @@ def delete_property(property_id: str) -> bool:
             ReturnValues='ALL_OLD'
         )
         # Check if the item existed before deletion
-        return 'Attributes' in response
+        if 'Attributes' not in response:
+            return False
+        if response['Attributes'].get('IsActive', True):
+            counters.increment('Properties', -1)
+        search_index.remove_item('Properties', property_id)
+        autocomplete.remove('Properties', property_id)
+        return True
     except ClientError as e:
         print(f"Error deleting property: {e}")
         return False
 
 # Survey Type CRUD
+@lookup_cache.cached('SurveyTypes')
 def get_survey_types() -> List[SurveyType]:
     """Get all active survey types"""
     table = get_table('SurveyTypes')
@@ -646,12 +918,13 @@ def get_survey_types() -> List[SurveyType]:
             FilterExpression=Attr('IsActive').eq(True)
         )
         items = response.get('Items', [])
-        return [SurveyType(**deserialize_item(item)) for item in items]
+        return [ITEM_CODECS['SurveyTypes'].decode(item) for item in items]
     except ClientError as e:
         print(f"Error getting survey types: {e}")
         return []
 
 # Survey Status CRUD
+@lookup_cache.cached('SurveyStatuses')
 def get_survey_statuses() -> List[SurveyStatus]:
     """Get all active survey statuses"""
     table = get_table('SurveyStatuses')
@@ -660,7 +933,7 @@ def get_survey_statuses() -> List[SurveyStatus]:
             FilterExpression=Attr('IsActive').eq(True)
         )
         items = response.get('Items', [])
-        return [SurveyStatus(**deserialize_item(item)) for item in items]
+        return [ITEM_CODECS['SurveyStatuses'].decode(item) for item in items]
     except ClientError as e:
         print(f"Error getting survey statuses: {e}")
         return []
@@ -674,6 +947,7 @@ def create_survey_type(survey_type: SurveyType) -> Optional[SurveyType]:
         serialized_data = serialize_item(item_data)
         
         table.put_item(Item=serialized_data)
+        lookup_cache.invalidate('SurveyTypes')
         return survey_type
     except ClientError as e:
         print(f"Error creating survey type: {e}")
@@ -688,6 +962,7 @@ def create_survey_status(survey_status: SurveyStatus) -> Optional[SurveyStatus]:
         serialized_data = serialize_item(item_data)
         
         table.put_item(Item=serialized_data)
+        lookup_cache.invalidate('SurveyStatuses')
         return survey_status
     except ClientError as e:
         print(f"Error creating survey status: {e}")
@@ -737,9 +1012,10 @@ def update_survey_status(survey_status_id: str, survey_status_update: schemas.Su
             ReturnValues="ALL_NEW"
         )
         
+        lookup_cache.invalidate('SurveyStatuses')
         updated_item = response.get('Attributes')
         if updated_item:
-            return SurveyStatus(**deserialize_item(updated_item))
+            return ITEM_CODECS['SurveyStatuses'].decode(updated_item)
         return None
         
     except ClientError as e:
@@ -748,6 +1024,7 @@ def update_survey_status(survey_status_id: str, survey_status_update: schemas.Su
 
 
 # Township CRUD
+@lookup_cache.cached('Townships')
 def get_township(township_id: str) -> Optional[Township]:
     """Get a single township by ID"""
     table = get_table('Townships')
@@ -755,32 +1032,46 @@ def get_township(township_id: str) -> Optional[Township]:
         response = table.get_item(Key={'TownshipId': township_id})
         item = response.get('Item')
         if item:
-            return Township(**deserialize_item(item))
+            return ITEM_CODECS['Townships'].decode(item)
         return None
     except ClientError as e:
         print(f"Error getting township {township_id}: {e}")
         return None
 
 
+def get_townships_by_ids(township_ids: List[str], projection: Optional[List[str]] = None) -> List[Optional[Township]]:
+    """Get townships by ID with BatchGetItem, in the order given (None where missing)"""
+    items = batch_get_items('Townships', 'TownshipId', township_ids, projection)
+    return _items_by_ids('Townships', items, township_ids, projection)
+
+
+@lookup_cache.cached('Townships')
 def get_townships(skip: int = 0, limit: int = 100, search: Optional[str] = None) -> tuple[List[Township], int]:
     """Get townships with pagination and optional search"""
     table = get_table('Townships')
     try:
-        filter_expression = Attr('IsActive').eq(True)
+        # ActiveIndex only holds active townships
+        scan_kwargs = {'IndexName': ACTIVE_INDEX}
         
         if search:
-            search_filter = (
+            scan_kwargs['FilterExpression'] = (
                 Attr('TownshipName').contains(search) |
                 Attr('County').contains(search) |
                 Attr('State').contains(search)
             )
-            filter_expression = filter_expression & search_filter
         
-        response = table.scan(FilterExpression=filter_expression)
-        items = response.get('Items', [])
+        # Every match is needed to sort by name, so read all 1 MB pages
+        items = []
+        while True:
+            response = table.scan(**scan_kwargs)
+            items.extend(response.get('Items', []))
+            last_key = response.get('LastEvaluatedKey')
+            if not last_key:
+                break
+            scan_kwargs['ExclusiveStartKey'] = last_key
         
         # Convert to Township objects
-        townships = [Township(**deserialize_item(item)) for item in items]
+        townships = [ITEM_CODECS['Townships'].decode(item) for item in items]
         
         # Sort by TownshipName
         townships.sort(key=lambda x: x.TownshipName.lower())
@@ -813,10 +1104,12 @@ def create_township(township: schemas.TownshipCreate) -> Optional[Township]:
         )
         
         # Serialize for DynamoDB
-        item = serialize_item(new_township.model_dump())
+        item = with_active_key('Townships', serialize_item(new_township.model_dump()))
         
         # Save to DynamoDB
         table.put_item(Item=item)
+        lookup_cache.invalidate('Townships')
+        autocomplete.upsert('Townships', [item])
         
         return new_township
         
@@ -825,21 +1118,21 @@ def create_township(township: schemas.TownshipCreate) -> Optional[Township]:
         return None
 
 
-def update_township(township_id: str, township: schemas.TownshipUpdate) -> Optional[Township]:
-    """Update an existing township"""
+def update_township(township_id: str, township: schemas.TownshipUpdate,
+                    expected_modified_date: Optional[datetime] = None) -> Optional[Township]:
+    """Update an existing township in one round trip (None if it does not exist).
+
+    Raises UpdateConflictError if expected_modified_date no longer matches.
+    """
     table = get_table('Townships')
     try:
-        # Get existing township
-        existing = get_township(township_id)
-        if not existing:
-            return None
-        
         # Update fields
         update_expression = "SET ModifiedDate = :modified_date, ModifiedBy = :modified_by"
         expression_values = {
             ':modified_date': serialize_datetime(datetime.utcnow()),
             ':modified_by': "system"  # TODO: get from auth context
         }
+        expression_names = {}
         
         if township.TownshipName is not None:
             update_expression += ", TownshipName = :township_name"
@@ -852,25 +1145,30 @@ def update_township(township_id: str, township: schemas.TownshipUpdate) -> Optio
         if township.State is not None:
             update_expression += ", #state = :state"
             expression_values[':state'] = township.State
+            expression_names['#state'] = 'State'
         
         if township.IsActive is not None:
             update_expression += ", IsActive = :is_active"
             expression_values[':is_active'] = township.IsActive
+            update_expression = active_key_update(update_expression, expression_values, township.IsActive,
+                                                  township_id)
         
         # Update in DynamoDB
-        response = table.update_item(
-            Key={'TownshipId': township_id},
+        response = conditional_update(
+            table, 'TownshipId', township_id, expected_modified_date,
             UpdateExpression=update_expression,
             ExpressionAttributeValues=expression_values,
-            ExpressionAttributeNames={'#state': 'State'} if township.State is not None else {},
+            ExpressionAttributeNames=expression_names,
             ReturnValues='ALL_NEW'
         )
+        if response is None:
+            return None
+        lookup_cache.invalidate('Townships')
         
         # Return updated township
-        item = response.get('Attributes')
-        if item:
-            return Township(**deserialize_item(item))
-        return None
+        item = response['Attributes']
+        autocomplete.upsert('Townships', [item])
+        return ITEM_CODECS['Townships'].decode(item)
         
     except ClientError as e:
         print(f"Error updating township {township_id}: {e}")
@@ -884,13 +1182,16 @@ def delete_township(township_id: str) -> bool:
         # Update IsActive to False instead of actually deleting
         table.update_item(
             Key={'TownshipId': township_id},
-            UpdateExpression='SET IsActive = :is_active, ModifiedDate = :modified_date, ModifiedBy = :modified_by',
+            UpdateExpression='SET IsActive = :is_active, ModifiedDate = :modified_date, ModifiedBy = :modified_by '
+                             f'REMOVE {ACTIVE_KEY}',
             ExpressionAttributeValues={
                 ':is_active': False,
                 ':modified_date': serialize_datetime(datetime.utcnow()),
                 ':modified_by': "system"  # TODO: get from auth context
             }
         )
+        lookup_cache.invalidate('Townships')
+        autocomplete.remove('Townships', township_id)
         return True
         
     except ClientError as e:
@@ -899,18 +1200,65 @@ def delete_township(township_id: str) -> bool:
 
 
 # UserSettings CRUD operations
+# Settings are keyed by user_settings_key(UserId, SettingsType), so every
+# operation addresses the item directly. Upserts are coalesced: rapid saves of
+# the same settings are merged and written once they have been quiet for
+# USER_SETTINGS_COALESCE_SECONDS (0 writes every save immediately).
+USER_SETTINGS_COALESCE_SECONDS = float(os.getenv("USER_SETTINGS_COALESCE_SECONDS", "0.5"))
+
+def _write_user_settings(user_settings_id: str, fields: dict) -> bool:
+    """Apply buffered settings fields to the item, creating it if needed"""
+    table = get_table('UserSettings')
+    # CreatedDate only applies to a new item; a stored one keeps its own
+    created_date = fields.get('CreatedDate') or fields.get('ModifiedDate') or datetime.utcnow()
+    fields = {key: value for key, value in fields.items() if key != 'CreatedDate'}
+    names = {f"#{key}": key for key in fields}
+    values = {f":{key}": serialize_datetime(value) for key, value in fields.items()}
+    values[':created_date'] = serialize_datetime(created_date)
+    update_expression = "SET " + ", ".join(f"#{key} = :{key}" for key in fields) \
+                        + ", CreatedDate = if_not_exists(CreatedDate, :created_date)"
+    if fields.get('IsActive') is not None:
+        update_expression = active_key_update(update_expression, values, fields['IsActive'], user_settings_id)
+    try:
+        table.update_item(
+            Key={'UserSettingsId': user_settings_id},
+            UpdateExpression=update_expression,
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues=values
+        )
+        return True
+    except ClientError as e:
+        print(f"Error writing user settings {user_settings_id}: {e}")
+        return False
+
+user_settings_writes = WriteCoalescer(_write_user_settings, USER_SETTINGS_COALESCE_SECONDS,
+                                      name="user-settings-writer")
+
+def _with_pending_settings(item: Optional[dict], user_settings_id: str) -> Optional[dict]:
+    """Overlay buffered writes on a stored settings item"""
+    pending = user_settings_writes.pending(user_settings_id)
+    if pending is None:
+        return item
+    merged = {**(item or {'UserSettingsId': user_settings_id}), **pending}
+    merged.setdefault('CreatedDate', merged['ModifiedDate'])
+    return merged
+
+
 def create_user_settings(settings_data: schemas.UserSettingsCreate) -> Optional[UserSettings]:
-    """Create new user settings"""
+    """Create new user settings, replacing any of the same type"""
     table = get_table('UserSettings')
     try:
         settings = UserSettings(
+            UserSettingsId=user_settings_key(settings_data.UserId, settings_data.SettingsType),
             UserId=settings_data.UserId,
             SettingsType=settings_data.SettingsType,
             SettingsData=settings_data.SettingsData,
             IsActive=settings_data.IsActive
         )
         
-        item = serialize_item(settings.dict())
+        # A buffered upsert must not land on top of this write
+        user_settings_writes.flush(settings.UserSettingsId)
+        item = with_active_key('UserSettings', serialize_item(settings.dict()))
         table.put_item(Item=item)
         return settings
         
@@ -922,18 +1270,12 @@ def create_user_settings(settings_data: schemas.UserSettingsCreate) -> Optional[
 def get_user_settings(user_id: str, settings_type: str) -> Optional[UserSettings]:
     """Get user settings by user ID and settings type"""
     table = get_table('UserSettings')
+    user_settings_id = user_settings_key(user_id, settings_type)
     try:
-        # Use GSI to query by UserId and SettingsType
-        response = table.query(
-            IndexName='UserSettingsIndex',
-            KeyConditionExpression=Key('UserId').eq(user_id) & Key('SettingsType').eq(settings_type),
-            FilterExpression=Attr('IsActive').eq(True)
-        )
-        
-        items = response.get('Items', [])
-        if items:
-            # Return the first (and should be only) matching settings
-            return UserSettings(**deserialize_item(items[0]))
+        response = table.get_item(Key={'UserSettingsId': user_settings_id})
+        item = _with_pending_settings(response.get('Item'), user_settings_id)
+        if item and item.get('IsActive', True):
+            return ITEM_CODECS['UserSettings'].decode(item)
         return None
         
     except ClientError as e:
@@ -948,12 +1290,13 @@ def get_all_user_settings(user_id: str) -> List[UserSettings]:
         # Use GSI to query by UserId
         response = table.query(
             IndexName='UserSettingsIndex',
-            KeyConditionExpression=Key('UserId').eq(user_id),
-            FilterExpression=Attr('IsActive').eq(True)
+            KeyConditionExpression=Key('UserId').eq(user_id)
         )
         
-        items = response.get('Items', [])
-        return [UserSettings(**deserialize_item(item)) for item in items]
+        items = {item['UserSettingsId']: item for item in response.get('Items', [])}
+        for user_settings_id in user_settings_writes.pending_keys(user_settings_key(user_id, '')):
+            items[user_settings_id] = _with_pending_settings(items.get(user_settings_id), user_settings_id)
+        return [ITEM_CODECS['UserSettings'].decode(item) for item in items.values() if item.get('IsActive', True)]
         
     except ClientError as e:
         print(f"Error getting all user settings for {user_id}: {e}")
@@ -976,18 +1319,20 @@ def update_user_settings(user_settings_id: str, settings_data: schemas.UserSetti
         if settings_data.IsActive is not None:
             update_expression += ", IsActive = :is_active"
             expression_values[':is_active'] = settings_data.IsActive
+            update_expression = active_key_update(update_expression, expression_values, settings_data.IsActive,
+                                                  user_settings_id)
         
-        response = table.update_item(
-            Key={'UserSettingsId': user_settings_id},
+        # Write out buffered upserts first so this update applies on top of them
+        user_settings_writes.flush(user_settings_id)
+        response = conditional_update(
+            table, 'UserSettingsId', user_settings_id,
             UpdateExpression=update_expression,
             ExpressionAttributeValues=expression_values,
             ReturnValues='ALL_NEW'
         )
-        
-        item = response.get('Attributes')
-        if item:
-            return UserSettings(**deserialize_item(item))
-        return None
+        if response is None:
+            return None
+        return ITEM_CODECS['UserSettings'].decode(response['Attributes'])
         
     except ClientError as e:
         print(f"Error updating user settings {user_settings_id}: {e}")
@@ -995,31 +1340,41 @@ def update_user_settings(user_settings_id: str, settings_data: schemas.UserSetti
 
 
 def upsert_user_settings(user_id: str, settings_type: str, settings_data: dict) -> Optional[UserSettings]:
-    """Create or update user settings"""
-    # First try to get existing settings
-    existing_settings = get_user_settings(user_id, settings_type)
-    
-    if existing_settings:
-        # Update existing settings
-        update_data = schemas.UserSettingsUpdate(SettingsData=settings_data)
-        return update_user_settings(existing_settings.UserSettingsId, update_data)
-    else:
-        # Create new settings
-        create_data = schemas.UserSettingsCreate(
-            UserId=user_id,
-            SettingsType=settings_type,
-            SettingsData=settings_data
-        )
-        return create_user_settings(create_data)
+    """Create or update user settings; the write is coalesced with other saves of the same settings"""
+    user_settings_id = user_settings_key(user_id, settings_type)
+    now = datetime.utcnow()
+    # A burst of saves reads the stored CreatedDate once; later saves find it pending
+    created_date = (user_settings_writes.pending(user_settings_id) or {}).get('CreatedDate')
+    if created_date is None:
+        try:
+            item = get_table('UserSettings').get_item(Key={'UserSettingsId': user_settings_id},
+                                                      ProjectionExpression='CreatedDate').get('Item')
+        except ClientError as e:
+            print(f"Error reading user settings {user_settings_id}: {e}")
+            return None
+        created_date = deserialize_item(item)['CreatedDate'] if item and item.get('CreatedDate') else now
+    saved = user_settings_writes.put(user_settings_id, {
+        'UserId': user_id,
+        'SettingsType': settings_type,
+        'SettingsData': settings_data,
+        'IsActive': True,
+        'CreatedDate': created_date,
+        'ModifiedDate': now
+    })
+    if not saved:
+        return None
+    return UserSettings(UserSettingsId=user_settings_id, UserId=user_id, SettingsType=settings_type,
+                        SettingsData=settings_data, CreatedDate=created_date, ModifiedDate=now)
 
 
 def delete_user_settings(user_settings_id: str) -> bool:
     """Soft delete user settings by setting IsActive to False"""
     table = get_table('UserSettings')
     try:
+        user_settings_writes.flush(user_settings_id)
         table.update_item(
             Key={'UserSettingsId': user_settings_id},
-            UpdateExpression='SET IsActive = :is_active, ModifiedDate = :modified_date',
+            UpdateExpression=f'SET IsActive = :is_active, ModifiedDate = :modified_date REMOVE {ACTIVE_KEY}',
             ExpressionAttributeValues={
                 ':is_active': False,
                 ':modified_date': serialize_datetime(datetime.utcnow())
@@ -1052,8 +1407,9 @@ def create_board_configuration(board_config: schemas.BoardConfigurationCreate) -
             CreatedBy="system"  # TODO: get from auth context
         )
         
-        serialized_config = serialize_item(new_config.dict())
+        serialized_config = with_active_key('BoardConfigurations', serialize_item(new_config.dict()))
         table.put_item(Item=serialized_config)
+        lookup_cache.invalidate('BoardConfigurations')
         
         return new_config
         
@@ -1062,6 +1418,7 @@ def create_board_configuration(board_config: schemas.BoardConfigurationCreate) -
         return None
 
 
+@lookup_cache.cached('BoardConfigurations')
 def get_board_configuration(board_config_id: str) -> BoardConfiguration:
     """Get a board configuration by ID"""
     table = get_table('BoardConfigurations')
@@ -1069,7 +1426,7 @@ def get_board_configuration(board_config_id: str) -> BoardConfiguration:
         response = table.get_item(Key={'BoardConfigId': board_config_id})
         item = response.get('Item')
         if item:
-            return BoardConfiguration(**deserialize_item(item))
+            return ITEM_CODECS['BoardConfigurations'].decode(item)
         return None
         
     except ClientError as e:
@@ -1077,6 +1434,7 @@ def get_board_configuration(board_config_id: str) -> BoardConfiguration:
         return None
 
 
+@lookup_cache.cached('BoardConfigurations')
 def get_board_configuration_by_slug(board_slug: str) -> BoardConfiguration:
     """Get a board configuration by slug"""
     table = get_table('BoardConfigurations')
@@ -1088,7 +1446,7 @@ def get_board_configuration_by_slug(board_slug: str) -> BoardConfiguration:
         )
         items = response.get('Items', [])
         if items:
-            return BoardConfiguration(**deserialize_item(items[0]))
+            return ITEM_CODECS['BoardConfigurations'].decode(items[0])
         return None
         
     except ClientError as e:
@@ -1096,31 +1454,32 @@ def get_board_configuration_by_slug(board_slug: str) -> BoardConfiguration:
         return None
 
 
+@lookup_cache.cached('BoardConfigurations')
 def get_board_configurations() -> List[BoardConfiguration]:
     """Get all active board configurations"""
     table = get_table('BoardConfigurations')
     try:
-        response = table.scan(
-            FilterExpression=Attr('IsActive').eq(True)
-        )
+        response = table.scan(IndexName=ACTIVE_INDEX)
         items = response.get('Items', [])
-        return [BoardConfiguration(**deserialize_item(item)) for item in items]
+        return [ITEM_CODECS['BoardConfigurations'].decode(item) for item in items]
         
     except ClientError as e:
         print(f"Error getting board configurations: {e}")
         return []
 
 
+@lookup_cache.cached('BoardConfigurations')
 def get_default_board_configuration() -> BoardConfiguration:
     """Get the default board configuration"""
     table = get_table('BoardConfigurations')
     try:
         response = table.scan(
-            FilterExpression=Attr('IsDefault').eq(True) & Attr('IsActive').eq(True)
+            IndexName=ACTIVE_INDEX,
+            FilterExpression=Attr('IsDefault').eq(True)
         )
         items = response.get('Items', [])
         if items:
-            return BoardConfiguration(**deserialize_item(items[0]))
+            return ITEM_CODECS['BoardConfigurations'].decode(items[0])
         return None
         
     except ClientError as e:
@@ -1128,8 +1487,12 @@ def get_default_board_configuration() -> BoardConfiguration:
         return None
 
 
-def update_board_configuration(board_config_id: str, board_config: schemas.BoardConfigurationUpdate) -> BoardConfiguration:
-    """Update a board configuration"""
+def update_board_configuration(board_config_id: str, board_config: schemas.BoardConfigurationUpdate,
+                               expected_modified_date: Optional[datetime] = None) -> BoardConfiguration:
+    """Update a board configuration in one round trip (None if it does not exist).
+
+    Raises UpdateConflictError if expected_modified_date no longer matches.
+    """
     table = get_table('BoardConfigurations')
     try:
         # Build update expression
@@ -1160,20 +1523,22 @@ def update_board_configuration(board_config_id: str, board_config: schemas.Board
         if board_config.IsActive is not None:
             update_expression += ", IsActive = :is_active"
             expression_values[':is_active'] = board_config.IsActive
+            update_expression = active_key_update(update_expression, expression_values, board_config.IsActive,
+                                                  board_config_id)
         
         # Update in DynamoDB
-        response = table.update_item(
-            Key={'BoardConfigId': board_config_id},
+        response = conditional_update(
+            table, 'BoardConfigId', board_config_id, expected_modified_date,
             UpdateExpression=update_expression,
             ExpressionAttributeValues=expression_values,
             ReturnValues='ALL_NEW'
         )
+        if response is None:
+            return None
+        lookup_cache.invalidate('BoardConfigurations')
         
         # Return updated board configuration
-        item = response.get('Attributes')
-        if item:
-            return BoardConfiguration(**deserialize_item(item))
-        return None
+        return ITEM_CODECS['BoardConfigurations'].decode(response['Attributes'])
         
     except ClientError as e:
         print(f"Error updating board configuration {board_config_id}: {e}")
@@ -1187,15 +1552,213 @@ def delete_board_configuration(board_config_id: str) -> bool:
         # Update IsActive to False instead of actually deleting
         table.update_item(
             Key={'BoardConfigId': board_config_id},
-            UpdateExpression='SET IsActive = :is_active, ModifiedDate = :modified_date, ModifiedBy = :modified_by',
+            UpdateExpression='SET IsActive = :is_active, ModifiedDate = :modified_date, ModifiedBy = :modified_by '
+                             f'REMOVE {ACTIVE_KEY}',
             ExpressionAttributeValues={
                 ':is_active': False,
                 ':modified_date': serialize_datetime(datetime.utcnow()),
                 ':modified_by': "system"  # TODO: get from auth context
             }
         )
+        lookup_cache.invalidate('BoardConfigurations')
         return True
         
     except ClientError as e:
         print(f"Error deleting board configuration {board_config_id}: {e}")
-        return False
\ No newline at end of file
+        return False
+
+
+# Bulk create
+BULK_CREATE_MAX_ROWS = 10000
+BATCH_WRITE_SIZE = 25
+BATCH_WRITE_WORKERS = 8
+BATCH_WRITE_MAX_RETRIES = 8
+BATCH_WRITE_BACKOFF_SECONDS = 0.05
+THROTTLING_ERRORS = ('ProvisionedThroughputExceededException', 'ThrottlingException', 'RequestLimitExceeded')
+
+def _batch_write_chunk(dynamodb, table_name: str, key_name: str, items: List[dict]) -> List[str]:
+    """Put up to BATCH_WRITE_SIZE items, retrying with backoff; returns keys that were not written"""
+    requests = [{'PutRequest': {'Item': item}} for item in items]
+    attempt = 0
+    while requests:
+        try:
+            response = dynamodb.batch_write_item(RequestItems={table_name: requests})
+            requests = response.get('UnprocessedItems', {}).get(table_name, [])
+        except ClientError as e:
+            if e.response['Error']['Code'] not in THROTTLING_ERRORS:
+                print(f"Error batch writing to {table_name}: {e}")
+                break
+        if requests:
+            if attempt >= BATCH_WRITE_MAX_RETRIES:
+                print(f"Giving up on {len(requests)} unprocessed items for {table_name}")
+                break
+            time.sleep(BATCH_WRITE_BACKOFF_SECONDS * (2 ** attempt) * random.uniform(0.5, 1.5))
+            attempt += 1
+    return [request['PutRequest']['Item'][key_name] for request in requests]
+
+def batch_put_items(table_name: str, key_name: str, items: List[dict]) -> set:
+    """Write items with concurrent 25-item BatchWriteItem calls; returns the keys that failed"""
+    dynamodb = get_dynamodb()
+    items = [with_active_key(table_name, item) for item in items]
+    chunks = [items[start:start + BATCH_WRITE_SIZE] for start in range(0, len(items), BATCH_WRITE_SIZE)]
+    with ThreadPoolExecutor(max_workers=max(1, min(len(chunks), BATCH_WRITE_WORKERS))) as executor:
+        results = executor.map(lambda chunk: _batch_write_chunk(dynamodb, table_name, key_name, chunk), chunks)
+        return {key for failed_keys in results for key in failed_keys}
+
+def _bulk_create(rows: list, schema_class, new_data, table_name: str, key_name: str) -> tuple[List[dict], List[dict]]:
+    """Validate rows, write the valid ones and return (per-row results, written items)"""
+    results = []
+    items = []
+    for index, row in enumerate(rows):
+        try:
+            obj = row if isinstance(row, schema_class) else schema_class(**row)
+        except (ValidationError, TypeError) as e:
+            results.append({'index': index, 'success': False, 'id': None, 'error': str(e)})
+            continue
+        item = ITEM_CODECS[table_name].encode(new_data(obj))
+        items.append(item)
+        results.append({'index': index, 'success': True, 'id': item[key_name], 'error': None})
+    
+    failed = batch_put_items(table_name, key_name, items) if items else set()
+    for result in results:
+        if result['id'] in failed:
+            result.update(success=False, id=None, error="Write failed")
+    written = [item for item in items if item[key_name] not in failed]
+    search_index.index_new_items(table_name, written)
+    autocomplete.upsert(table_name, written)
+    return results, written
+
+def bulk_create_response(results: List[dict]) -> dict:
+    """Summarize per-row bulk create results"""
+    created = sum(1 for result in results if result['success'])
+    return {'results': results, 'created': created, 'failed': len(results) - created}
+
+def bulk_create_customers(rows: list) -> List[dict]:
+    """Create many customers; rows are CustomerCreate objects or dicts, results are per row"""
+    results, written = _bulk_create(rows, schemas.CustomerCreate, _new_customer_data, 'Customers', 'CustomerId')
+    counters.increment('Customers', sum(1 for item in written if item.get('IsActive', True)))
+    return results
+
+def bulk_create_properties(rows: list) -> List[dict]:
+    """Create many properties; rows are PropertyCreate objects or dicts, results are per row"""
+    results, written = _bulk_create(rows, schemas.PropertyCreate, _new_property_data, 'Properties', 'PropertyId')
+    counters.increment('Properties', sum(1 for item in written if item.get('IsActive', True)))
+    return results
+
+def bulk_create_surveys(rows: list) -> List[dict]:
+    """Create many surveys; rows are SurveyCreate objects or dicts, results are per row"""
+    results, written = _bulk_create(rows, schemas.SurveyCreate, _new_survey_data, 'Surveys', 'SurveyId')
+    deltas = {}
+    for item in written:
+        for name, delta in counters.survey_deltas(item).items():
+            deltas[name] = deltas.get(name, 0) + delta
+    counters.increment_many(deltas)
+    return results
+
+
+# Board view
+BOARD_QUERY_WORKERS = 8
+
+def get_board_view(board_slug: Optional[str] = None, per_column_limit: int = 25,
+                   after: Optional[str] = None, projection: Optional[List[str]] = None) -> Optional[dict]:
+    """Get a board's status columns, each with its total and first page of surveys.
+
+    Columns are read with parallel StatusIdIndex queries and totals come from
+    the per-status counters, so the cost depends on per_column_limit rather
+    than on the size of the Surveys table. The returned next_cursor loads the
+    next page of every column that has more surveys. projection limits the
+    survey attributes read.
+    """
+    if board_slug:
+        board = get_board_configuration_by_slug(board_slug)
+        if board is None:
+            return None
+    else:
+        board = get_default_board_configuration()
+
+    column_cursors = decode_cursor(after) or {}
+    statuses = get_survey_statuses()
+    if after:
+        # Only columns that still had more surveys take part in a follow-up page
+        statuses = [status for status in statuses if status.SurveyStatusId in column_cursors]
+
+    totals = counters.get_counts(counters.status_counter_name(status.SurveyStatusId) for status in statuses)
+
+    def load_column(status):
+        return get_surveys_by_status(status.SurveyStatusId, limit=per_column_limit,
+                                     cursor=column_cursors.get(status.SurveyStatusId), projection=projection)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(len(statuses), BOARD_QUERY_WORKERS))) as executor:
+        pages = list(executor.map(load_column, statuses))
+
+    columns = []
+    next_cursors = {}
+    for status, (surveys, next_cursor) in zip(statuses, pages):
+        columns.append({
+            'status': status,
+            'total': totals[counters.status_counter_name(status.SurveyStatusId)],
+            'surveys': surveys,
+            'next_cursor': next_cursor
+        })
+        if next_cursor:
+            next_cursors[status.SurveyStatusId] = next_cursor
+
+    return {'board': board, 'columns': columns, 'next_cursor': encode_cursor(next_cursors)}
+
+MOVE_SURVEYS_MAX = 100
+MOVE_SURVEY_WORKERS = 8
+
+def _move_survey(table, survey_id: str, status_id: str, position: Optional[int],
+                 modified: str) -> Optional[dict]:
+    """Set one survey's status and board position; returns its previous item, or None if missing"""
+    update_expression = "SET StatusId = :status_id, ModifiedDate = :modified"
+    values = {':status_id': status_id, ':modified': modified}
+    if position is not None:
+        update_expression += ", BoardPosition = :position"
+        values[':position'] = position
+    response = conditional_update(
+        table, 'SurveyId', survey_id,
+        UpdateExpression=update_expression + " REMOVE SurveyStatusId",
+        ExpressionAttributeValues=values,
+        ReturnValues='ALL_OLD'
+    )
+    return response['Attributes'] if response else None
+
+def move_surveys(moves: List[dict]) -> List[dict]:
+    """Move surveys between board columns, touching only status, position and ModifiedDate.
+
+    moves are {'SurveyId', 'StatusId', 'Position'} dicts. The updates run in
+    parallel and the status counter changes are summed into one write per
+    status. Returns {'SurveyId', 'StatusId', 'Position'} for each survey moved;
+    missing surveys are left out.
+    """
+    table = get_table('Surveys')
+    if not moves:
+        return []
+    modified = serialize_datetime(datetime.utcnow())
+
+    def move(entry):
+        try:
+            return _move_survey(table, entry['SurveyId'], entry['StatusId'], entry.get('Position'), modified)
+        except ClientError as e:
+            print(f"Error moving survey {entry['SurveyId']}: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max(1, min(len(moves), MOVE_SURVEY_WORKERS))) as executor:
+        old_items = list(executor.map(move, moves))
+
+    moved = []
+    deltas = {}
+    for entry, old_item in zip(moves, old_items):
+        if old_item is None:
+            continue
+        moved.append({'SurveyId': entry['SurveyId'], 'StatusId': entry['StatusId'],
+                      'Position': entry.get('Position')})
+        old_status = counters.survey_status_id(old_item)
+        if old_item.get('IsActive', True) and old_status != entry['StatusId']:
+            changes = [(entry['StatusId'], 1)] + ([(old_status, -1)] if old_status else [])
+            for status_id, delta in changes:
+                name = counters.status_counter_name(status_id)
+                deltas[name] = deltas.get(name, 0) + delta
+    counters.increment_many(deltas)
+    return moved
@@ -1,9 +1,14 @@
 import os
+import threading
 import boto3
 from boto3.dynamodb.conditions import Key, Attr
 from dotenv import load_dotenv
 from typing import Optional
 
+from models import DYNAMODB_TABLES
+from sqlite_storage import SQLiteDatabase
+from storage import MemoryDatabase
+
 load_dotenv()
 
 # DynamoDB configuration
@@ -11,6 +16,9 @@ AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
 AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
 AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
 DYNAMODB_ENDPOINT_URL = os.getenv("DYNAMODB_ENDPOINT", os.getenv("DYNAMODB_ENDPOINT_URL"))  # For local development
+# "dynamodb" (DynamoDB or DynamoDB Local), "memory" (storage.py) or "sqlite" (sqlite_storage.py)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "dynamodb").lower()
+SQLITE_STORAGE_PATH = os.getenv("SQLITE_STORAGE_PATH", "survey_storage.sqlite3")
 
 class DynamoDBConnection:
     _instance = None
@@ -48,7 +56,6 @@ class DynamoDBConnection:
                     print("Successfully connected to local DynamoDB")
                 except Exception as conn_error:
                     print(f"Failed to connect to local DynamoDB: {conn_error}")
-                    print("Using development mode with mock data instead")
                     self._dynamodb = None
             else:
                 # Use AWS DynamoDB
@@ -57,24 +64,45 @@ class DynamoDBConnection:
                 
         except Exception as e:
             print(f"Warning: Could not connect to DynamoDB: {e}")
-            print("Using development mode with mock data")
             self._dynamodb = None
     
     @property
     def dynamodb(self):
         return self._dynamodb
 
+_local_database = None
+_local_lock = threading.Lock()
+
+
+def get_local_database():
+    """The process-wide in-process database (SQLite when selected, otherwise memory) with every table in DYNAMODB_TABLES"""
+    global _local_database
+    with _local_lock:
+        if _local_database is None:
+            if STORAGE_BACKEND == "sqlite":
+                _local_database = SQLiteDatabase(SQLITE_STORAGE_PATH, DYNAMODB_TABLES)
+            else:
+                _local_database = MemoryDatabase(DYNAMODB_TABLES)
+        return _local_database
+
+
 # Global instance
-db_connection = DynamoDBConnection()
+db_connection = DynamoDBConnection() if STORAGE_BACKEND == "dynamodb" else None
+
+class StorageUnavailableError(RuntimeError):
+    """The DynamoDB backend was selected but could not be connected to"""
+
 
 def get_dynamodb():
-    """Get DynamoDB connection"""
+    """Get the storage backend: the DynamoDB resource, or the local engine selected by STORAGE_BACKEND"""
+    if db_connection is None:
+        return get_local_database()
+    if db_connection.dynamodb is None:
+        # Never switch to a local engine here: writes to it would be lost on restart
+        raise StorageUnavailableError(
+            "DynamoDB is not available; set STORAGE_BACKEND=memory or sqlite to run without it")
     return db_connection.dynamodb
 
 def get_table(table_name: str):
-    """Get a specific DynamoDB table"""
-    dynamodb = get_dynamodb()
-    if dynamodb is None:
-        print(f"Warning: DynamoDB not available, using mock data for table {table_name}")
-        return None
-    return dynamodb.Table(table_name)
+    """Get a specific table from the storage backend"""
+    return get_dynamodb().Table(table_name)
@@ -0,0 +1,63 @@
+"""
+Minimal per-request DataLoader for GraphQL relationship fields.
+
+Every load() made while graphql-core resolves one level of a result (for
+example the customer of each survey in a list) happens before control returns
+to the event loop. The loader therefore queues those keys and sends them as a
+single call to its batch function on the next loop iteration. Results are
+memoized for the lifetime of the loader, so create one set of loaders per
+request.
+"""
+import asyncio
+from typing import Any, Callable, Dict, Hashable, Iterable
+
+
+class DataLoader:
+    """Batches and memoizes key lookups made in the same event loop iteration"""
+
+    def __init__(self, batch_load_fn: Callable[[list], Dict[Hashable, Any]], executor=None):
+        # batch_load_fn is blocking and returns {key: value}; missing keys load as None
+        self.batch_load_fn = batch_load_fn
+        self.executor = executor
+        self._cache = {}
+        self._pending = []
+
+    def load(self, key: Hashable):
+        """Return an awaitable for key's value, or the value itself outside an event loop"""
+        if key in self._cache:
+            return self._cache[key]
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Synchronous execution: no batching, load the key directly
+            return self.batch_load_fn([key]).get(key)
+
+        future = loop.create_future()
+        self._cache[key] = future
+        if not self._pending:
+            loop.call_soon(self._dispatch)
+        self._pending.append(key)
+        return future
+
+    def load_many(self, keys: Iterable[Hashable]):
+        """Awaitable list of values for keys"""
+        return asyncio.gather(*[self.load(key) for key in keys])
+
+    def _dispatch(self) -> None:
+        keys, self._pending = self._pending, []
+        asyncio.ensure_future(self._load_batch(keys))
+
+    async def _load_batch(self, keys: list) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            values = await loop.run_in_executor(self.executor, self.batch_load_fn, keys)
+        except Exception as e:
+            for key in keys:
+                future = self._cache.pop(key)
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for key in keys:
+            future = self._cache[key]
+            if not future.done():
+                future.set_result(values.get(key))
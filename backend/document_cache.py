@@ -0,0 +1,97 @@
+"""
+LRU cache of parsed and validated GraphQL documents.
+
+The React client sends the same few dozen documents from
+frontend/src/graphql/queries.ts on every page, so parsing and validating them
+against the schema on every request is wasted work. Documents are keyed by the
+sha256 of the query text; the cached entry holds the DocumentNode together with
+its validation errors, so invalid documents are also rejected from the cache.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from inspect import isawaitable
+from typing import List, Optional, Tuple
+
+from graphql import DocumentNode, ExecutionResult, GraphQLError, GraphQLSchema, execute, parse, validate
+
+GRAPHQL_DOCUMENT_CACHE_SIZE = int(os.getenv("GRAPHQL_DOCUMENT_CACHE_SIZE", "256"))
+
+
+def query_hash(query: str) -> str:
+    """sha256 hex digest of a query string"""
+    return hashlib.sha256(query.encode()).hexdigest()
+
+
+class DocumentCache:
+    """Size-bounded LRU cache of (DocumentNode, validation errors) keyed by query hash"""
+
+    def __init__(self, schema: GraphQLSchema, max_entries: int = GRAPHQL_DOCUMENT_CACHE_SIZE):
+        self.schema = schema
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, query: str) -> Tuple[Optional[DocumentNode], List[GraphQLError]]:
+        """Return the parsed document and its validation errors, parsing on a miss"""
+        key = query_hash(query)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        try:
+            document = parse(query)
+            entry = (document, validate(self.schema, document))
+        except GraphQLError as error:
+            entry = (None, [error])
+
+        if self.max_entries > 0:
+            with self._lock:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return entry
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries
+            }
+
+    def clear(self) -> None:
+        """Drop all cached documents"""
+        with self._lock:
+            self._entries.clear()
+
+    async def execute(self, query: str, variables: Optional[dict] = None, operation_name: Optional[str] = None,
+                      middleware: Optional[list] = None, context_value: Optional[dict] = None) -> ExecutionResult:
+        """Execute a query using the cached document, skipping parse and validation on a hit"""
+        document, errors = self.get(query)
+        if errors:
+            return ExecutionResult(data=None, errors=errors)
+
+        result = execute(
+            self.schema,
+            document,
+            variable_values=variables,
+            operation_name=operation_name,
+            middleware=middleware,
+            context_value=context_value if context_value is not None else {}
+        )
+        if isawaitable(result):
+            result = await result
+        return result
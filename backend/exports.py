@@ -0,0 +1,104 @@
+"""
+Streaming CSV and NDJSON exports of the surveys, customers and properties tables.
+
+Exports walk the table with a parallel segmented scan and serialize each page
+as it arrives, so the first bytes go out before the scan is finished and memory
+use does not grow with the table. CSV columns are the model's fields in
+declaration order; NDJSON rows carry every stored attribute.
+"""
+import csv
+import io
+import json
+import os
+from decimal import Decimal
+from typing import Iterator, Optional
+
+from fastapi.responses import StreamingResponse
+
+import crud
+import parallel_scan
+from database import get_table
+from models import ACTIVE_KEY, Customer, Property, Survey
+
+EXPORT_SCAN_SEGMENTS = int(os.getenv("EXPORT_SCAN_SEGMENTS", str(parallel_scan.PARALLEL_SCAN_SEGMENTS)))
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv'
+}
+
+
+def _normalize_survey(item: dict) -> dict:
+    # Older rows only carry StatusId (see crud.convert_survey_data)
+    if 'StatusId' in item and 'SurveyStatusId' not in item:
+        item['SurveyStatusId'] = item['StatusId']
+    return item
+
+
+def _normalize_active(item: dict) -> dict:
+    # ActiveId is index bookkeeping (see models.ACTIVE_INDEX), not row data
+    item.pop(ACTIVE_KEY, None)
+    return item
+
+
+EXPORTS = {
+    'surveys': {'table': 'Surveys', 'model': Survey, 'scan_kwargs': crud._survey_scan_kwargs,
+                'normalize': _normalize_survey},
+    'customers': {'table': 'Customers', 'model': Customer, 'scan_kwargs': crud._customer_scan_kwargs,
+                  'normalize': _normalize_active},
+    'properties': {'table': 'Properties', 'model': Property, 'scan_kwargs': crud._property_scan_kwargs,
+                   'normalize': _normalize_active}
+}
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, set):
+        return sorted(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def iter_items(entity: str, search: Optional[str] = None,
+               segments: int = EXPORT_SCAN_SEGMENTS) -> Iterator[list]:
+    """Yield pages of raw items for an export"""
+    export = EXPORTS[entity]
+    table = get_table(export['table'])
+    normalize = export.get('normalize')
+    for page in parallel_scan.scan_pages(table, segments=segments, **export['scan_kwargs'](search)):
+        yield [normalize(item) for item in page] if normalize else page
+
+
+def ndjson_lines(entity: str, search: Optional[str] = None,
+                 segments: int = EXPORT_SCAN_SEGMENTS) -> Iterator[str]:
+    """Stream an export as newline-delimited JSON, one chunk per scan page"""
+    for page in iter_items(entity, search, segments):
+        if page:
+            yield ''.join(json.dumps(item, default=_json_default) + '\n' for item in page)
+
+
+def csv_lines(entity: str, search: Optional[str] = None,
+              segments: int = EXPORT_SCAN_SEGMENTS) -> Iterator[str]:
+    """Stream an export as CSV with a header row, one chunk per scan page"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(EXPORTS[entity]['model'].model_fields),
+                            extrasaction='ignore')
+    writer.writeheader()
+    # Send the header before the first scan page comes back
+    yield buffer.getvalue()
+    for page in iter_items(entity, search, segments):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(page)
+        if buffer.tell():
+            yield buffer.getvalue()
+
+
+def export_response(entity: str, format: str = 'ndjson', search: Optional[str] = None) -> StreamingResponse:
+    """StreamingResponse for GET /api/{entity}/export"""
+    lines = csv_lines if format == 'csv' else ndjson_lines
+    return StreamingResponse(
+        lines(entity, search),
+        media_type=EXPORT_FORMATS[format],
+        headers={'Content-Disposition': f'attachment; filename="{entity}.{format}"'}
+    )
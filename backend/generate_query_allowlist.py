@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Generate the persisted query allowlist from the frontend's GraphQL documents.
+
+Extracts every gql`...` document from frontend/src/graphql/queries.ts and writes
+a JSON file mapping sha256 hashes to query text, for PERSISTED_QUERIES_ALLOWLIST.
+Apollo Client hashes the printed document after adding __typename to every
+selection set, so each document is stored in that form as well as plain
+printed form.
+
+Usage: python generate_query_allowlist.py [queries.ts] [output.json]
+"""
+import json
+import os
+import re
+import sys
+
+from graphql import FieldNode, NameNode, OperationDefinitionNode, SelectionSetNode, Visitor, parse, print_ast, visit
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from document_cache import query_hash
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_QUERIES_PATH = os.path.join(BASE_DIR, '..', 'frontend', 'src', 'graphql', 'queries.ts')
+DEFAULT_OUTPUT_PATH = os.path.join(BASE_DIR, 'persisted_queries.json')
+
+GQL_TEMPLATE = re.compile(r'gql`(.*?)`', re.DOTALL)
+
+
+class AddTypename(Visitor):
+    """Add __typename to selection sets the way Apollo Client's cache does"""
+
+    def enter_selection_set(self, node, key, parent, path, ancestors):
+        if isinstance(parent, OperationDefinitionNode):
+            return None
+        if any(isinstance(s, FieldNode) and s.name.value.startswith('__') for s in node.selections):
+            return None
+        return SelectionSetNode(selections=(*node.selections, FieldNode(name=NameNode(value='__typename'))))
+
+
+def extract_documents(source: str) -> list:
+    """Return the text of every gql template literal in a TypeScript source file"""
+    return [match.strip() for match in GQL_TEMPLATE.findall(source)]
+
+
+def build_allowlist(documents: list) -> dict:
+    """Map hashes of each document's printed forms to their query text"""
+    allowlist = {}
+    for text in documents:
+        document = parse(text)
+        for printed in (print_ast(document), print_ast(visit(document, AddTypename()))):
+            allowlist[query_hash(printed)] = printed
+    return allowlist
+
+
+def main():
+    queries_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_QUERIES_PATH
+    output_path = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_OUTPUT_PATH
+
+    with open(queries_path) as f:
+        documents = extract_documents(f.read())
+    allowlist = build_allowlist(documents)
+
+    with open(output_path, 'w') as f:
+        json.dump(allowlist, f, indent=2, sort_keys=True)
+    print(f"Wrote {len(allowlist)} persisted queries for {len(documents)} documents to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
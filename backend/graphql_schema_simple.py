@@ -2,9 +2,21 @@ import graphene
 from graphene import ObjectType, List, Field, String, Int, Boolean, Float, DateTime, InputObjectType
 from typing import Optional
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import functools
+import os
 import uuid
 import json
+from graphql import GraphQLError
 import crud
+import counters
+import models
+import search_index
+import survey_search
+from autocomplete import AUTOCOMPLETE_SOURCES, autocomplete
+from dataloader import DataLoader
+from pagination import InvalidCursorError
 
 # Survey List Response Type (matches frontend expectation)
 class SurveyType(ObjectType):
@@ -32,16 +44,42 @@ class SurveyType(ObjectType):
     IsScanned = Boolean()
     IsDelivered = Boolean()
     IsActive = Boolean()
+    BoardPosition = Int()
     CreatedDate = DateTime()
     ModifiedDate = DateTime()
     CreatedBy = String()
     ModifiedBy = String()
+    customer = Field(lambda: CustomerType)
+    property = Field(lambda: PropertyType)
+    status = Field(lambda: SurveyStatusType)
+    surveyType = Field(lambda: SurveyTypeType, name='type')
+
+    def resolve_customer(self, info):
+        return load_related(info, 'customers', self.CustomerId)
+
+    def resolve_property(self, info):
+        return load_related(info, 'properties', self.PropertyId)
+
+    def resolve_status(self, info):
+        return load_related(info, 'statuses', self.StatusId)
+
+    def resolve_surveyType(self, info):
+        return load_related(info, 'surveyTypes', self.SurveyTypeId)
+
+class PageInfo(ObjectType):
+    endCursor = String()
+    hasNextPage = Boolean()
+
+def page_info(next_cursor):
+    """Build PageInfo from the cursor returned by a crud *_page function"""
+    return PageInfo(endCursor=next_cursor, hasNextPage=next_cursor is not None)
 
 class SurveyListResponse(ObjectType):
     surveys = List(SurveyType)
     total = Int()
     page = Int()
     size = Int()
+    pageInfo = Field(PageInfo)
 
 class SurveyTypeType(ObjectType):
     SurveyTypeId = String()
@@ -76,6 +114,7 @@ class CustomerListResponse(ObjectType):
     total = Int()
     page = Int()
     size = Int()
+    pageInfo = Field(PageInfo)
 
 class PropertyType(ObjectType):
     PropertyId = String()  # Changed from Int to String to match UUID
@@ -106,6 +145,7 @@ class PropertyListResponse(ObjectType):
     total = Int()
     page = Int()
     size = Int()
+    pageInfo = Field(PageInfo)
 
 class TownshipType(ObjectType):
     TownshipId = String()
@@ -153,8 +193,112 @@ class BoardConfigurationListResponse(ObjectType):
     page = Int()
     size = Int()
 
-def model_to_survey(survey):
-    """Convert Survey model to GraphQL type"""
+class BoardColumnType(ObjectType):
+    status = Field(SurveyStatusType)
+    total = Int()
+    surveys = List(SurveyType)
+    pageInfo = Field(PageInfo)
+
+class BoardViewType(ObjectType):
+    boardConfiguration = Field(BoardConfigurationType)
+    columns = List(BoardColumnType)
+    pageInfo = Field(PageInfo)
+
+class AutocompleteSuggestionType(ObjectType):
+    id = String()
+    label = String()
+
+class SurveySearchFiltersInput(InputObjectType):
+    statusId = String()
+    surveyTypeId = String()
+    customerId = String()
+    propertyId = String()
+    townshipId = String()
+    isActive = Boolean()
+
+class SurveySearchHitType(ObjectType):
+    survey = Field(SurveyType)
+    score = Float()
+    notesSnippet = String()
+    surveyorNotesSnippet = String()
+
+class SurveySearchResponse(ObjectType):
+    hits = List(SurveySearchHitType)
+    total = Int()
+
+def _price_field(value):
+    """Price field for GraphQL (Decimal to float)"""
+    if value is None:
+        return None
+    # Handle Decimal objects from the model
+    if hasattr(value, '__float__'):  # This includes Decimal
+        return float(value)
+    # Handle string or numeric values
+    try:
+        return float(value) if value != '' else None
+    except (ValueError, TypeError):
+        return None
+
+def _date_field(value):
+    """Date field for GraphQL, parsing ISO strings"""
+    if value is None or value == '' or value == 'None':
+        return None
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except (ValueError, AttributeError):
+            return None
+    return value
+
+def _survey_field(name, convert=None, default=None):
+    if convert is None:
+        return lambda data: data.get(name, default)
+    return lambda data: convert(data.get(name, default))
+
+# Conversion of each SurveyType field from the survey's data
+SURVEY_FIELDS = {
+    'SurveyId': _survey_field('SurveyId', str, ''),
+    'SurveyNumber': _survey_field('SurveyNumber', str, ''),
+    'CustomerId': _survey_field('CustomerId', str, ''),
+    'PropertyId': _survey_field('PropertyId', str, ''),
+    'SurveyTypeId': _survey_field('SurveyTypeId', str, ''),
+    # Handle both field names
+    'StatusId': lambda data: str(data.get('StatusId', data.get('SurveyStatusId', ''))),
+    'Title': _survey_field('Title', str, ''),
+    'Description': _survey_field('Description', str, ''),
+    'PurposeCode': _survey_field('PurposeCode', str, ''),
+    'RequestDate': _survey_field('RequestDate', _date_field),
+    'ScheduledDate': _survey_field('ScheduledDate', _date_field),
+    'CompletedDate': _survey_field('CompletedDate', _date_field),
+    'DeliveryDate': _survey_field('DeliveryDate', _date_field),
+    'DueDate': _survey_field('DueDate', _date_field),
+    'QuotedPrice': _survey_field('QuotedPrice', _price_field),
+    'FinalPrice': _survey_field('FinalPrice', _price_field),
+    'EstimatedCost': _survey_field('EstimatedCost', _price_field),
+    'ActualCost': _survey_field('ActualCost', _price_field),
+    'Notes': _survey_field('Notes', str, ''),
+    'IsFieldworkComplete': _survey_field('IsFieldworkComplete', bool, False),
+    'IsDrawingComplete': _survey_field('IsDrawingComplete', bool, False),
+    'IsScanned': _survey_field('IsScanned', bool, False),
+    'IsDelivered': _survey_field('IsDelivered'),
+    'IsActive': _survey_field('IsActive', default=True),
+    'BoardPosition': lambda data: int(data['BoardPosition']) if data.get('BoardPosition') is not None else None,
+    'CreatedDate': _survey_field('CreatedDate', _date_field),
+    'ModifiedDate': _survey_field('ModifiedDate', _date_field),
+    'CreatedBy': _survey_field('CreatedBy'),
+    'ModifiedBy': _survey_field('ModifiedBy'),
+}
+
+# Relationship fields of SurveyType and the id field each one resolves from
+SURVEY_RELATED_FIELDS = {'customer': 'CustomerId', 'property': 'PropertyId', 'status': 'StatusId',
+                         'type': 'SurveyTypeId'}
+
+def model_to_survey(survey, fields=None):
+    """Convert Survey model to GraphQL type.
+
+    fields limits the conversion to those SurveyType fields (see
+    survey_selection); the others are left unset.
+    """
     if not survey:
         return None
     
@@ -162,66 +306,11 @@ def model_to_survey(survey):
     if isinstance(survey, dict):
         survey_data = survey
     else:
-        survey_data = survey.dict() if hasattr(survey, 'dict') else survey.__dict__
+        survey_data = survey.__dict__
     
-    # Helper function to convert price fields (Decimal to float for GraphQL)
-    def convert_price_field(field_name):
-        value = survey_data.get(field_name)
-        if value is None:
-            return None
-        # Handle Decimal objects from the model
-        if hasattr(value, '__float__'):  # This includes Decimal
-            return float(value)
-        # Handle string or numeric values
-        try:
-            return float(value) if value != '' else None
-        except (ValueError, TypeError):
-            return None
-    
-    # Helper function to convert date fields
-    def convert_date_field(field_name):
-        value = survey_data.get(field_name)
-        if value is None or value == '' or value == 'None':
-            return None
-        if isinstance(value, str):
-            try:
-                # Try to parse the date string
-                from datetime import datetime
-                return datetime.fromisoformat(value.replace('Z', '+00:00'))
-            except (ValueError, AttributeError):
-                return None
-        return value
-    
-    return SurveyType(
-        SurveyId=str(survey_data.get('SurveyId', '')),
-        SurveyNumber=str(survey_data.get('SurveyNumber', '')),
-        CustomerId=str(survey_data.get('CustomerId', '')),
-        PropertyId=str(survey_data.get('PropertyId', '')),
-        SurveyTypeId=str(survey_data.get('SurveyTypeId', '')),
-        StatusId=str(survey_data.get('StatusId', survey_data.get('SurveyStatusId', ''))),  # Handle both field names
-        Title=str(survey_data.get('Title', '')),
-        Description=str(survey_data.get('Description', '')),
-        PurposeCode=str(survey_data.get('PurposeCode', '')),
-        RequestDate=convert_date_field('RequestDate'),
-        ScheduledDate=convert_date_field('ScheduledDate'),
-        CompletedDate=convert_date_field('CompletedDate'),
-        DeliveryDate=convert_date_field('DeliveryDate'),
-        DueDate=convert_date_field('DueDate'),
-        QuotedPrice=convert_price_field('QuotedPrice'),
-        FinalPrice=convert_price_field('FinalPrice'),
-        EstimatedCost=convert_price_field('EstimatedCost'),
-        ActualCost=convert_price_field('ActualCost'),
-        Notes=str(survey_data.get('Notes', '')),
-        IsFieldworkComplete=bool(survey_data.get('IsFieldworkComplete', False)),
-        IsDrawingComplete=bool(survey_data.get('IsDrawingComplete', False)),
-        IsScanned=bool(survey_data.get('IsScanned', False)),
-        IsDelivered=getattr(survey, 'IsDelivered', None),
-        IsActive=getattr(survey, 'IsActive', True),
-        CreatedDate=convert_date_field('CreatedDate'),
-        ModifiedDate=convert_date_field('ModifiedDate'),
-        CreatedBy=getattr(survey, 'CreatedBy', None),
-        ModifiedBy=getattr(survey, 'ModifiedBy', None)
-    )
+    if fields is None:
+        return SurveyType(**{name: convert(survey_data) for name, convert in SURVEY_FIELDS.items()})
+    return SurveyType(**{name: SURVEY_FIELDS[name](survey_data) for name in fields})
 
 def model_to_customer(customer):
     """Convert Customer model to GraphQL type"""
@@ -354,12 +443,103 @@ def model_to_board_configuration(board_config):
         ModifiedBy=getattr(board_config, 'ModifiedBy', '')
     )
 
+# Per-request DataLoaders for SurveyType relationship fields
+def _load_customers(ids):
+    return {c.CustomerId: model_to_customer(c) for c in crud.get_customers_by_ids(ids) if c}
+
+def _load_properties(ids):
+    return {p.PropertyId: model_to_property(p) for p in crud.get_properties_by_ids(ids) if p}
+
+def _load_survey_statuses(ids):
+    # Served from the lookup cache, so no DynamoDB reads in steady state
+    return {s.SurveyStatusId: model_to_survey_status(s) for s in crud.get_survey_statuses()}
+
+def _load_survey_types(ids):
+    return {t.SurveyTypeId: model_to_survey_type(t) for t in crud.get_survey_types()}
+
+RELATED_LOADERS = {
+    'customers': _load_customers,
+    'properties': _load_properties,
+    'statuses': _load_survey_statuses,
+    'surveyTypes': _load_survey_types,
+}
+
+def get_loaders(info):
+    """DataLoaders for this request, created on first use in the request context"""
+    context = info.context if isinstance(info.context, dict) else {}
+    if 'loaders' not in context:
+        context['loaders'] = {
+            name: DataLoader(batch_load_fn, executor=resolver_executor)
+            for name, batch_load_fn in RELATED_LOADERS.items()
+        }
+    return context['loaders']
+
+def load_related(info, loader_name, key):
+    """Load a related object by id through the request's DataLoader"""
+    if not key or key == 'None':
+        return None
+    return get_loaders(info)[loader_name].load(key)
+
+# Selection-set driven projections
+def selected_fields(info, *path) -> Optional[set]:
+    """Names of the fields the query selects below the resolver's field, following path.
+
+    Fragments are expanded; None when the selection can't be read, in which
+    case callers fetch whole items.
+    """
+    try:
+        nodes = list(info.field_nodes)
+        for name in path:
+            nodes = [node for node in _selections(info, nodes) if node.name.value == name]
+        names = {node.name.value for node in _selections(info, nodes)}
+    except (AttributeError, KeyError, TypeError):
+        return None
+    names.discard('__typename')
+    return names or None
+
+def _selections(info, nodes):
+    """Field nodes directly inside the selection sets of nodes, with fragments expanded"""
+    pending = [node.selection_set for node in nodes if node.selection_set]
+    while pending:
+        for selection in pending.pop().selections:
+            if selection.kind == 'fragment_spread':
+                pending.append(info.fragments[selection.name.value].selection_set)
+            elif selection.kind == 'inline_fragment':
+                pending.append(selection.selection_set)
+            else:
+                yield selection
+
+def survey_selection(info, *path) -> tuple:
+    """SurveyType fields to convert and the Surveys attributes to read for the surveys at path.
+
+    Relationship fields bring in the id they resolve from. Returns
+    (None, None) when the selection is unknown, meaning every field.
+    """
+    names = selected_fields(info, *path)
+    if names is None:
+        return None, None
+    fields = {SURVEY_RELATED_FIELDS.get(name, name) for name in names}
+    fields &= SURVEY_FIELDS.keys()
+    if not fields:
+        return None, None
+    # The status may still be stored as SurveyStatusId on older rows
+    projection = sorted(fields | {'SurveyStatusId'} if 'StatusId' in fields else fields)
+    return fields, projection
+
+def model_projection(info, model, *path) -> Optional[list]:
+    """Attributes of model to read for the objects at path, or None for whole items"""
+    names = selected_fields(info, *path)
+    if names is None:
+        return None
+    projection = sorted(names & model.model_fields.keys())
+    return projection or None
+
 class Query(ObjectType):
-    surveys = Field(SurveyListResponse, skip=Int(default_value=0), limit=Int(default_value=100), search=String())
+    surveys = Field(SurveyListResponse, skip=Int(default_value=0), limit=Int(default_value=100), search=String(), after=String(), exactTotal=Boolean(default_value=False))
     survey = Field(SurveyType, surveyId=String(required=True))
-    customers = Field(CustomerListResponse, skip=Int(default_value=0), limit=Int(default_value=100), search=String())
+    customers = Field(CustomerListResponse, skip=Int(default_value=0), limit=Int(default_value=100), search=String(), after=String(), exactTotal=Boolean(default_value=False))
     customer = Field(CustomerType, customerId=String(required=True))
-    properties = Field(PropertyListResponse, skip=Int(default_value=0), limit=Int(default_value=100), search=String())
+    properties = Field(PropertyListResponse, skip=Int(default_value=0), limit=Int(default_value=100), search=String(), after=String(), exactTotal=Boolean(default_value=False))
     property = Field(PropertyType, propertyId=String(required=True))
     townships = Field(TownshipListResponse, skip=Int(default_value=0), limit=Int(default_value=100), search=String())
     township = Field(TownshipType, townshipId=String(required=True))
@@ -371,68 +551,94 @@ class Query(ObjectType):
     boardConfiguration = Field(BoardConfigurationType, boardConfigId=String(required=True))
     boardConfigurationBySlug = Field(BoardConfigurationType, boardSlug=String(required=True))
     defaultBoardConfiguration = Field(BoardConfigurationType)
+    board = Field(BoardViewType, boardSlug=String(), perColumnLimit=Int(default_value=25), after=String())
+    autocomplete = Field(List(AutocompleteSuggestionType), entity=String(required=True), q=String(required=True), limit=Int(default_value=10))
+    searchSurveys = Field(SurveySearchResponse, q=String(required=True), filters=SurveySearchFiltersInput(), limit=Int(default_value=25), offset=Int(default_value=0))
 
-    def resolve_surveys(self, info, skip=0, limit=100, search=None):
+    def resolve_surveys(self, info, skip=0, limit=100, search=None, after=None, exactTotal=False):
         try:
-            surveys_data, total = crud.get_surveys(skip=skip, limit=limit, search=search)
-            surveys = [model_to_survey(s) for s in surveys_data]
+            fields, projection = survey_selection(info, 'surveys')
+            surveys_data, next_cursor = crud.get_surveys_page(limit=limit, after=after, search=search, skip=skip,
+                                                              projection=projection)
+            total = crud.count_surveys(search=search, exact=exactTotal)
+            surveys = [model_to_survey(s, fields) for s in surveys_data]
             return SurveyListResponse(
                 surveys=surveys,
                 total=total,
                 page=skip // limit + 1,
-                size=limit
+                size=limit,
+                pageInfo=page_info(next_cursor)
             )
+        except InvalidCursorError as e:
+            raise GraphQLError(str(e))
         except Exception as e:
             print(f"Error resolving surveys: {e}")
             return SurveyListResponse(surveys=[], total=0, page=1, size=limit)
 
     def resolve_survey(self, info, surveyId):
         try:
-            survey_data = crud.get_survey(survey_id=surveyId)
-            return model_to_survey(survey_data)
+            fields, projection = survey_selection(info)
+            survey_data = crud.get_survey(survey_id=surveyId, projection=projection)
+            return model_to_survey(survey_data, fields)
         except Exception as e:
             print(f"Error resolving survey: {e}")
             return None
 
-    def resolve_customers(self, info, skip=0, limit=100, search=None):
+    def resolve_customers(self, info, skip=0, limit=100, search=None, after=None, exactTotal=False):
         try:
-            customers_data, total = crud.get_customers(skip=skip, limit=limit, search=search)
+            customers_data, next_cursor = crud.get_customers_page(
+                limit=limit, after=after, search=search, skip=skip,
+                projection=model_projection(info, models.Customer, 'customers')
+            )
+            total = crud.count_customers(search=search, exact=exactTotal)
             customers = [model_to_customer(c) for c in customers_data]
             return CustomerListResponse(
                 customers=customers,
                 total=total,
                 page=skip // limit + 1,
-                size=limit
+                size=limit,
+                pageInfo=page_info(next_cursor)
             )
+        except InvalidCursorError as e:
+            raise GraphQLError(str(e))
         except Exception as e:
             print(f"Error resolving customers: {e}")
             return CustomerListResponse(customers=[], total=0, page=1, size=limit)
 
     def resolve_customer(self, info, customerId):
         try:
-            customer_data = crud.get_customer(customer_id=customerId)
+            customer_data = crud.get_customer(customer_id=customerId,
+                                              projection=model_projection(info, models.Customer))
             return model_to_customer(customer_data)
         except Exception as e:
             print(f"Error resolving customer: {e}")
             return None
 
-    def resolve_properties(self, info, skip=0, limit=100, search=None):
+    def resolve_properties(self, info, skip=0, limit=100, search=None, after=None, exactTotal=False):
         try:
-            properties_data, total = crud.get_properties(skip=skip, limit=limit, search=search)
+            properties_data, next_cursor = crud.get_properties_page(
+                limit=limit, after=after, search=search, skip=skip,
+                projection=model_projection(info, models.Property, 'properties')
+            )
+            total = crud.count_properties(search=search, exact=exactTotal)
             properties = [model_to_property(p) for p in properties_data]
             return PropertyListResponse(
                 properties=properties,
                 total=total,
                 page=skip // limit + 1,
-                size=limit
+                size=limit,
+                pageInfo=page_info(next_cursor)
             )
+        except InvalidCursorError as e:
+            raise GraphQLError(str(e))
         except Exception as e:
             print(f"Error resolving properties: {e}")
             return PropertyListResponse(properties=[], total=0, page=1, size=limit)
 
     def resolve_property(self, info, propertyId):
         try:
-            property_data = crud.get_property(property_id=propertyId)
+            property_data = crud.get_property(property_id=propertyId,
+                                              projection=model_projection(info, models.Property))
             return model_to_property(property_data)
         except Exception as e:
             print(f"Error resolving property: {e}")
@@ -536,6 +742,64 @@ class Query(ObjectType):
             print(f"Error resolving default board configuration: {e}")
             return None
 
+    def resolve_board(self, info, boardSlug=None, perColumnLimit=25, after=None):
+        try:
+            fields, projection = survey_selection(info, 'columns', 'surveys')
+            board_view = crud.get_board_view(board_slug=boardSlug, per_column_limit=perColumnLimit, after=after,
+                                             projection=projection)
+            if board_view is None:
+                return None
+            columns = [
+                BoardColumnType(
+                    status=model_to_survey_status(column['status']),
+                    total=column['total'],
+                    surveys=[model_to_survey(s, fields) for s in column['surveys']],
+                    pageInfo=page_info(column['next_cursor'])
+                )
+                for column in board_view['columns']
+            ]
+            return BoardViewType(
+                boardConfiguration=model_to_board_configuration(board_view['board']),
+                columns=columns,
+                pageInfo=page_info(board_view['next_cursor'])
+            )
+        except InvalidCursorError as e:
+            raise GraphQLError(str(e))
+        except Exception as e:
+            print(f"Error resolving board: {e}")
+            return None
+
+    def resolve_autocomplete(self, info, entity, q, limit=10):
+        if entity not in AUTOCOMPLETE_SOURCES:
+            raise GraphQLError(f"Unknown autocomplete entity: {entity}")
+        suggestions = autocomplete.suggest(entity, q, limit=min(limit, 50))
+        return [AutocompleteSuggestionType(**suggestion) for suggestion in suggestions]
+
+    def resolve_searchSurveys(self, info, q, filters=None, limit=25, offset=0):
+        if survey_search.sidecar is None:
+            raise GraphQLError("Survey search is not enabled (set SURVEY_SEARCH_DB)")
+        filters = filters or {}
+        result = survey_search.sidecar.search(q, filters={
+            'StatusId': filters.get('statusId'),
+            'SurveyTypeId': filters.get('surveyTypeId'),
+            'CustomerId': filters.get('customerId'),
+            'PropertyId': filters.get('propertyId'),
+            'TownshipId': filters.get('townshipId'),
+            'IsActive': filters.get('isActive'),
+        }, limit=min(limit, 100), offset=offset)
+        fields, projection = survey_selection(info, 'hits', 'survey')
+        surveys = crud.get_surveys_by_ids([hit['SurveyId'] for hit in result['hits']], projection)
+        hits = [
+            SurveySearchHitType(
+                survey=model_to_survey(survey, fields),
+                score=-hit['score'],
+                notesSnippet=hit['NotesSnippet'] or None,
+                surveyorNotesSnippet=hit['SurveyorNotesSnippet'] or None
+            )
+            for hit, survey in zip(result['hits'], surveys) if survey is not None
+        ]
+        return SurveySearchResponse(hits=hits, total=result['total'])
+
 # Create simple schema with queries and mutations
 class CreateCustomerInput(graphene.InputObjectType):
     CustomerCode = String()
@@ -850,15 +1114,19 @@ class UpdateTownshipMutation(graphene.Mutation):
     class Arguments:
         townshipId = String(required=True)
         input = TownshipUpdateInput(required=True)
+        expectedModifiedDate = DateTime()
     
     township = Field(TownshipType)
     
-    def mutate(self, info, townshipId, input):
+    def mutate(self, info, townshipId, input, expectedModifiedDate=None):
         try:
             from schemas import TownshipUpdate
             township_data = TownshipUpdate(**input)
-            township = crud.update_township(township_id=townshipId, township=township_data)
+            township = crud.update_township(township_id=townshipId, township=township_data,
+                                            expected_modified_date=expectedModifiedDate)
             return UpdateTownshipMutation(township=model_to_township(township))
+        except crud.UpdateConflictError as e:
+            raise GraphQLError(str(e))
         except Exception as e:
             print(f"Error updating township: {e}")
             return UpdateTownshipMutation(township=None)
@@ -1034,9 +1302,6 @@ class CreateSurveyMutation(graphene.Mutation):
             from crud import serialize_item
             
             table = get_table('Surveys')
-            if table is None:
-                print("Error: Could not get Surveys table")
-                return CreateSurveyMutation(survey=None)
             
             # Convert data to the format expected by DynamoDB
             survey_data = {
@@ -1085,6 +1350,8 @@ class CreateSurveyMutation(graphene.Mutation):
             
             print(f"Saving to DynamoDB: {serialized_data}")
             table.put_item(Item=serialized_data)
+            counters.increment_many(counters.survey_deltas(serialized_data))
+            search_index.index_new_items('Surveys', [serialized_data])
             
             print(f"Survey created successfully: {survey_data['SurveyId']}")
             
@@ -1102,10 +1369,11 @@ class UpdateSurveyMutation(graphene.Mutation):
     class Arguments:
         surveyId = String(required=True)
         input = SurveyUpdateInput(required=True)
+        expectedModifiedDate = DateTime()
     
     survey = Field(SurveyType)
     
-    def mutate(self, info, surveyId, input):
+    def mutate(self, info, surveyId, input, expectedModifiedDate=None):
         try:
             from schemas import SurveyUpdate
             
@@ -1181,7 +1449,8 @@ class UpdateSurveyMutation(graphene.Mutation):
                 raise schema_error
             
             # Call CRUD function
-            updated_survey = crud.update_survey(survey_id=surveyId, survey=survey_data)
+            updated_survey = crud.update_survey(survey_id=surveyId, survey=survey_data,
+                                                expected_modified_date=expectedModifiedDate)
             
             if updated_survey:
                 print(f"Survey updated successfully: {surveyId}")
@@ -1190,6 +1459,8 @@ class UpdateSurveyMutation(graphene.Mutation):
                 print(f"Failed to update survey: {surveyId}")
                 return UpdateSurveyMutation(survey=None)
                 
+        except crud.UpdateConflictError as e:
+            raise GraphQLError(str(e))
         except Exception as e:
             print(f"Error updating survey: {e}")
             import traceback
@@ -1259,10 +1530,11 @@ class UpdateBoardConfigurationMutation(graphene.Mutation):
     class Arguments:
         board_config_id = String(required=True)
         board_config = BoardConfigurationUpdateInput(required=True)
+        expected_modified_date = DateTime()
     
     board_configuration = Field(BoardConfigurationType)
     
-    def mutate(self, info, board_config_id, board_config):
+    def mutate(self, info, board_config_id, board_config, expected_modified_date=None):
         try:
             import schemas
             config_data = schemas.BoardConfigurationUpdate(
@@ -1272,11 +1544,14 @@ class UpdateBoardConfigurationMutation(graphene.Mutation):
                 IsDefault=board_config.IsDefault,
                 IsActive=board_config.IsActive
             )
-            updated_config = crud.update_board_configuration(board_config_id, config_data)
+            updated_config = crud.update_board_configuration(board_config_id, config_data,
+                                                             expected_modified_date=expected_modified_date)
             if updated_config:
                 return UpdateBoardConfigurationMutation(board_configuration=model_to_board_configuration(updated_config))
             else:
                 return UpdateBoardConfigurationMutation(board_configuration=None)
+        except crud.UpdateConflictError as e:
+            raise GraphQLError(str(e))
         except Exception as e:
             print(f"Error updating board configuration: {e}")
             import traceback
@@ -1297,6 +1572,89 @@ class DeleteBoardConfigurationMutation(graphene.Mutation):
             print(f"Error deleting board configuration: {e}")
             return DeleteBoardConfigurationMutation(success=False)
 
+class BulkCreateResultType(ObjectType):
+    index = Int()
+    success = Boolean()
+    id = String()
+    error = String()
+
+def bulk_create_payload(mutation_class, results):
+    """Build a bulk create mutation payload from crud per-row results"""
+    response = crud.bulk_create_response(results)
+    return mutation_class(
+        results=[BulkCreateResultType(**result) for result in response['results']],
+        created=response['created'],
+        failed=response['failed']
+    )
+
+class BulkCreateCustomersMutation(graphene.Mutation):
+    class Arguments:
+        input = List(CreateCustomerInput, required=True)
+    
+    results = List(BulkCreateResultType)
+    created = Int()
+    failed = Int()
+    
+    def mutate(self, info, input):
+        if len(input) > crud.BULK_CREATE_MAX_ROWS:
+            raise GraphQLError(f"At most {crud.BULK_CREATE_MAX_ROWS} rows per request")
+        return bulk_create_payload(BulkCreateCustomersMutation, crud.bulk_create_customers([dict(row) for row in input]))
+
+class BulkCreatePropertiesMutation(graphene.Mutation):
+    class Arguments:
+        input = List(PropertyInput, required=True)
+    
+    results = List(BulkCreateResultType)
+    created = Int()
+    failed = Int()
+    
+    def mutate(self, info, input):
+        if len(input) > crud.BULK_CREATE_MAX_ROWS:
+            raise GraphQLError(f"At most {crud.BULK_CREATE_MAX_ROWS} rows per request")
+        return bulk_create_payload(BulkCreatePropertiesMutation, crud.bulk_create_properties([dict(row) for row in input]))
+
+class BulkCreateSurveysMutation(graphene.Mutation):
+    class Arguments:
+        input = List(SurveyInput, required=True)
+    
+    results = List(BulkCreateResultType)
+    created = Int()
+    failed = Int()
+    
+    def mutate(self, info, input):
+        if len(input) > crud.BULK_CREATE_MAX_ROWS:
+            raise GraphQLError(f"At most {crud.BULK_CREATE_MAX_ROWS} rows per request")
+        return bulk_create_payload(BulkCreateSurveysMutation, crud.bulk_create_surveys([dict(row) for row in input]))
+
+class SurveyMoveInput(InputObjectType):
+    surveyId = String(required=True)
+    toStatusId = String(required=True)
+    position = Int()
+
+class SurveyMoveResultType(ObjectType):
+    surveyId = String()
+    statusId = String()
+    position = Int()
+
+class MoveSurveysMutation(graphene.Mutation):
+    """Board drag-and-drop: change only the status and position of one or more surveys"""
+    class Arguments:
+        moves = List(SurveyMoveInput, required=True)
+    
+    moves = List(SurveyMoveResultType)
+    
+    def mutate(self, info, moves):
+        if len(moves) > crud.MOVE_SURVEYS_MAX:
+            raise GraphQLError(f"At most {crud.MOVE_SURVEYS_MAX} surveys per move")
+        moved = crud.move_surveys([
+            {'SurveyId': move.surveyId, 'StatusId': move.toStatusId, 'Position': move.position}
+            for move in moves
+        ])
+        return MoveSurveysMutation(moves=[
+            SurveyMoveResultType(surveyId=m['SurveyId'], statusId=m['StatusId'], position=m['Position'])
+            for m in moved
+        ])
+
 class Mutation(graphene.ObjectType):
     createCustomer = CreateCustomerMutation.Field()
     updateCustomer = UpdateCustomerMutation.Field()
@@ -1309,6 +1667,7 @@ class Mutation(graphene.ObjectType):
     delete_township = DeleteTownshipMutation.Field()
     createSurvey = CreateSurveyMutation.Field()
     updateSurvey = UpdateSurveyMutation.Field()
+    moveSurveys = MoveSurveysMutation.Field()
     createSurveyType = CreateSurveyTypeMutation.Field()
     createSurveyStatus = CreateSurveyStatusMutation.Field()
     updateSurveyStatus = UpdateSurveyStatusMutation.Field()
@@ -1316,5 +1675,28 @@ class Mutation(graphene.ObjectType):
     createBoardConfiguration = CreateBoardConfigurationMutation.Field()
     updateBoardConfiguration = UpdateBoardConfigurationMutation.Field()
     deleteBoardConfiguration = DeleteBoardConfigurationMutation.Field()
-
-schema = graphene.Schema(query=Query, mutation=Mutation)
\ No newline at end of file
+    bulkCreateCustomers = BulkCreateCustomersMutation.Field()
+    bulkCreateProperties = BulkCreatePropertiesMutation.Field()
+    bulkCreateSurveys = BulkCreateSurveysMutation.Field()
+
+schema = graphene.Schema(query=Query, mutation=Mutation)
+
+# Root resolvers make blocking DynamoDB calls, so under async execution they run
+# in a bounded thread pool instead of on the event loop
+RESOLVER_THREADS = int(os.getenv("GRAPHQL_RESOLVER_THREADS", "16"))
+resolver_executor = ThreadPoolExecutor(max_workers=RESOLVER_THREADS, thread_name_prefix="graphql-resolver")
+
+class ThreadPoolMiddleware:
+    """Run top-level Query and Mutation resolvers in resolver_executor"""
+
+    def resolve(self, next, root, info, **args):
+        # Nested fields either read attributes of the already loaded objects or
+        # return DataLoader futures, whose batch functions already run in
+        # resolver_executor (see get_loaders)
+        if info.path.prev is not None:
+            return next(root, info, **args)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return next(root, info, **args)
+        return loop.run_in_executor(resolver_executor, functools.partial(next, root, info, **args))
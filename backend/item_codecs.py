@@ -0,0 +1,169 @@
+"""
+Precompiled codecs between stored items and the pydantic models.
+
+An ItemCodec is built once per model. It generates a decode function from
+the model's field annotations: straight-line code with one block per field
+that picks the stored value, converts it with the check for its type chosen
+ahead of time (ISO string to datetime, Decimal to int, ...) and fills
+defaults, then builds the instance the way model_construct() does, without
+validation or model_construct's generic per-field loop. Writing is one pass
+the other way (datetime to ISO string, float to Decimal, None dropped).
+
+Stored items are trusted, but not blindly: a value the fast path can't
+convert exactly (an unparseable date, an unexpected type, a missing
+required field with no fill) sends the item through the codec's validate
+function instead, so odd rows get exactly the old validated result or error.
+"""
+import copy
+import types
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Optional, Union, get_args, get_origin
+
+from pydantic import BaseModel
+
+# Defaults that can be shared between instances without copying
+_IMMUTABLE = (type(None), bool, int, float, str, Decimal, tuple, frozenset)
+
+
+def _unwrap_optional(annotation) -> tuple:
+    """(inner type, whether None is allowed)"""
+    if get_origin(annotation) in (Union, types.UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0], len(args) < len(get_args(annotation))
+    return annotation, annotation is Any
+
+
+def _encode_datetime(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _encode_decimal(value):
+    if isinstance(value, float):
+        return Decimal(str(value))
+    if type(value) is int:
+        return Decimal(value)
+    return value
+
+
+_ENCODERS = {datetime: _encode_datetime, Decimal: _encode_decimal}
+
+# Conversion of a present, non-None value v for each field type; ON_FAIL is
+# replaced by the fallback for the mode being generated
+_CONVERT = {
+    str: ["if v.__class__ is str:", "    values[NAME] = v", "else:", "    ON_FAIL"],
+    bool: ["if v.__class__ is bool:", "    values[NAME] = v", "else:", "    ON_FAIL"],
+    Decimal: ["if v.__class__ is Decimal:", "    values[NAME] = v", "else:", "    ON_FAIL"],
+    int: ["if v.__class__ is int:", "    values[NAME] = v",
+          "elif v.__class__ is Decimal and v == v.to_integral_value():", "    values[NAME] = int(v)",
+          "else:", "    ON_FAIL"],
+    float: ["if v.__class__ is Decimal or v.__class__ is int:", "    values[NAME] = float(v)",
+            "else:", "    ON_FAIL"],
+    datetime: ["if v.__class__ is str:", "    try:", "        values[NAME] = fromisoformat(v)",
+               "    except ValueError:", "        ON_FAIL",
+               "elif isinstance(v, datetime):", "    values[NAME] = v", "else:", "    ON_FAIL"],
+}
+
+
+class ItemCodec:
+    """Decode stored items into one model class, and encode its data for writes"""
+
+    def __init__(self, model: type, validate: Callable[[dict], BaseModel],
+                 aliases: Optional[Dict[str, str]] = None, fill: Optional[Dict[str, Callable[[], Any]]] = None):
+        # validate(item) is the slow, validating path for items the fast path can't handle.
+        # aliases maps a field to another stored attribute read when the field is absent;
+        # fill gives values for fields a stored item lacks, instead of failing over to validate
+        self.model = model
+        self.validate = validate
+        self._encoders = {}
+        for name, field in model.model_fields.items():
+            annotation, _ = _unwrap_optional(field.annotation)
+            if annotation in _ENCODERS:
+                self._encoders[name] = _ENCODERS[annotation]
+        self._decode = self._compile(aliases or {}, fill or {}, partial=False)
+        self._decode_partial = self._compile(aliases or {}, {}, partial=True)
+
+    def _compile(self, aliases: Dict[str, str], fill: Dict[str, Callable], partial: bool) -> Callable:
+        model = self.model
+        if model.__pydantic_post_init__ or model.__pydantic_root_model__:
+            return lambda item: model.model_construct(**{k: v for k, v in item.items() if k in model.model_fields})
+
+        namespace = {'MODEL': model, 'NEW': object.__new__, 'SET': object.__setattr__, 'Decimal': Decimal,
+                     'datetime': datetime, 'fromisoformat': datetime.fromisoformat, 'validate': self.validate,
+                     'FIELDS': set(model.model_fields)}
+        defaults = {}
+        lines = ["def decode(item):", "    get = item.get", "    values = DEFAULTS.copy()"]
+        for index, (name, field) in enumerate(model.model_fields.items()):
+            annotation, optional = _unwrap_optional(field.annotation)
+            required = field.is_required()
+            default = None if required or field.default_factory else field.default
+            if not isinstance(default, _IMMUTABLE):
+                namespace[f"COPY{index}"] = (lambda value: lambda: copy.deepcopy(value))(default)
+                default = None
+            # Every field has a slot, in field order, so __dict__ matches a validated model
+            defaults[name] = default
+
+            body = [f"v = get({name!r})"]
+            if name in aliases:
+                body += ["if v is None:", f"    v = get({aliases[name]!r})"]
+            body.append("if v is None:")
+            if optional and default is not None:
+                body += [f"    if {name!r} in item:", f"        values[{name!r}] = None"]
+            if name in fill and not partial:
+                namespace[f"FILL{index}"] = fill[name]
+                body.append(f"    values[{name!r}] = FILL{index}()")
+            elif required and not partial:
+                body.append("    return validate(item)")
+            elif field.default_factory:
+                namespace[f"FACTORY{index}"] = field.default_factory
+                body.append(f"    values[{name!r}] = FACTORY{index}()")
+            elif f"COPY{index}" in namespace:
+                body.append(f"    values[{name!r}] = COPY{index}()")
+            else:
+                body.append("    pass")
+            convert = _CONVERT.get(annotation)
+            if convert is None:
+                body += ["else:", f"    values[{name!r}] = v"]
+            else:
+                on_fail = f"values[{name!r}] = v" if partial else "return validate(item)"
+                body.append("else:")
+                body += ["    " + line.replace("NAME", repr(name)).replace("ON_FAIL", on_fail) for line in convert]
+            lines += ["    " + line for line in body]
+
+        lines += [
+            "    instance = NEW(MODEL)",
+            "    SET(instance, '__dict__', values)",
+            # A projection sets only the attributes it read; a complete row sets every field
+            "    SET(instance, '__pydantic_fields_set__', "
+            + ("FIELDS.intersection(item))" if partial else "FIELDS.copy())"),
+            "    SET(instance, '__pydantic_extra__', None)",
+            "    SET(instance, '__pydantic_private__', None)",
+            "    return instance",
+        ]
+        namespace['DEFAULTS'] = defaults
+        exec(compile('\n'.join(lines), f"<{model.__name__} item codec>", 'exec'), namespace)
+        return namespace['decode']
+
+    def decode(self, item: dict, partial: bool = False) -> Optional[BaseModel]:
+        """Model for a stored item; partial items (projections) skip the required-field checks"""
+        if not item:
+            return None
+        return self._decode_partial(item) if partial else self._decode(item)
+
+    def encode(self, data) -> dict:
+        """Item to store for a model or dict of its fields; None values are dropped"""
+        if isinstance(data, BaseModel):
+            data = data.__dict__
+        encoders = self._encoders
+        item = {}
+        for key, value in data.items():
+            if value is None:
+                continue
+            encode = encoders.get(key)
+            if encode is not None:
+                value = encode(value)
+            elif isinstance(value, datetime):
+                value = value.isoformat()
+            item[key] = value
+        return item
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Streaming import of legacy SQL Server table dumps into DynamoDB.
+
+Reads one CSV (or BCP character-mode) export per table from a dump directory,
+named <Table>.csv, and converts each row using the column types declared in
+Database Scripts/schema.sql. INT identity keys become UUIDs through an id map
+kept in a SQLite file, so foreign keys resolve the same way across tables and
+runs. Rows are written in chunks by parallel batched writers. After each
+chunk is written, the number of rows done is saved to a checkpoint file, and a
+rerun picks up after the last checkpointed row. Memory use is bounded by the
+chunk size and the number of chunks in flight, however large the dumps are.
+
+Usage: python legacy_import.py DUMP_DIR [--state-dir DIR] [--tables T1,T2]
+       [--delimiter ,] [--no-header] [--schema schema.sql] [--skip-counters]
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Add current directory to path for imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import counters
+import crud
+import search_index
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SCHEMA_PATH = os.path.join(BASE_DIR, '..', 'Database Scripts', 'schema.sql')
+
+IMPORT_CHUNK_ROWS = int(os.getenv("IMPORT_CHUNK_ROWS", "1000"))
+IMPORT_WRITERS = int(os.getenv("IMPORT_WRITERS", "4"))
+IMPORT_PROGRESS_SECONDS = float(os.getenv("IMPORT_PROGRESS_SECONDS", "5"))
+
+CREATE_TABLE = re.compile(r'CREATE TABLE \[dbo\]\.\[(\w+)\]\((.*?)\n\)', re.DOTALL)
+COLUMN = re.compile(r'^\s*\[(\w+)\] \[(\w+)\](?:\([^)]*\))?(?: IDENTITY\(\d+,\d+\))? (NOT NULL|NULL)', re.MULTILINE)
+DATETIME_FRACTION = re.compile(r'(\.\d{6})\d+')
+
+NULL_VALUES = {'', 'NULL'}
+INTEGER_TYPES = {'int', 'bigint', 'smallint', 'tinyint'}
+DECIMAL_TYPES = {'decimal', 'numeric', 'money', 'smallmoney', 'float', 'real'}
+DATETIME_TYPES = {'datetime2', 'datetime', 'smalldatetime', 'date'}
+
+
+def _property_names(item: dict) -> dict:
+    """Properties need a code and name; legacy rows only have the survey key and tax id"""
+    code = str(item['SurveyPrimaryKey'])
+    return {'PropertyCode': code, 'PropertyName': item.get('LegacyTax') or f"Property {code}"}
+
+
+def _survey_status(item: dict) -> dict:
+    """Surveys carry the status under both attribute names"""
+    return {'SurveyStatusId': item.get('StatusId')}
+
+
+# Legacy table -> DynamoDB table. 'key' is the legacy identity column and the new
+# UUID key name; 'foreign_keys' maps columns to the legacy table they reference;
+# 'derive' adds attributes once keys are mapped. Tables are imported in this order.
+TABLE_MAPPINGS = {
+    'SurveyStatuses': {
+        'target': 'SurveyStatuses',
+        'key': ('StatusId', 'SurveyStatusId')
+    },
+    'SurveyTypes': {
+        'target': 'SurveyTypes',
+        'key': ('SurveyTypeId', 'SurveyTypeId'),
+        'rename': {'TypeName': 'SurveyTypeName', 'TypeDescription': 'Description'}
+    },
+    'Townships': {
+        'target': 'Townships',
+        'key': ('TownshipId', 'TownshipId'),
+        'rename': {'Name': 'TownshipName'},
+        'defaults': {'County': 'Suffolk', 'State': 'New York', 'IsActive': True}
+    },
+    'Addresses': {
+        'target': 'Addresses',
+        'key': ('AddressId', 'AddressId')
+    },
+    'Customers': {
+        'target': 'Customers',
+        'key': ('CustomerId', 'CustomerId')
+    },
+    'CustomerAddresses': {
+        'target': 'CustomerAddresses',
+        'key': ('CustomerAddressId', 'CustomerAddressId'),
+        'foreign_keys': {'CustomerId': 'Customers', 'AddressId': 'Addresses'},
+        'defaults': {'IsActive': True}
+    },
+    'Properties': {
+        'target': 'Properties',
+        'key': ('PropertyId', 'PropertyId'),
+        'foreign_keys': {'AddressId': 'Addresses', 'TownshipId': 'Townships'},
+        'defaults': {'IsActive': True},
+        'derive': _property_names
+    },
+    'Surveys': {
+        'target': 'Surveys',
+        'key': ('SurveyId', 'SurveyId'),
+        'foreign_keys': {
+            'CustomerId': 'Customers',
+            'PropertyId': 'Properties',
+            'SurveyTypeId': 'SurveyTypes',
+            'StatusId': 'SurveyStatuses'
+        },
+        'defaults': {'IsActive': True},
+        'derive': _survey_status
+    },
+    'SurveyDocuments': {
+        'target': 'SurveyFiles',
+        'key': ('DocumentId', 'SurveyFileId'),
+        'rename': {'DocumentType': 'FileType', 'UploadedDate': 'CreatedDate'},
+        'foreign_keys': {'SurveyId': 'Surveys'},
+        'defaults': {'FileSize': 0, 'IsActive': True}
+    }
+}
+
+
+def load_schema(path: str = DEFAULT_SCHEMA_PATH) -> Dict[str, List[Tuple[str, str]]]:
+    """Return {table: [(column, sql_type), ...]} from the CREATE TABLE statements in schema.sql"""
+    with open(path, encoding='utf-8-sig') as f:
+        source = f.read()
+    return {
+        table: [(column, sql_type.lower()) for column, sql_type, _ in COLUMN.findall(body)]
+        for table, body in CREATE_TABLE.findall(source)
+    }
+
+
+def convert_value(sql_type: str, raw: Optional[str]):
+    """Convert a dumped column value to its DynamoDB type; NULLs become None"""
+    if raw is None or raw in NULL_VALUES:
+        return None
+    if sql_type == 'bit':
+        return raw.strip().lower() in ('1', 'true')
+    if sql_type in INTEGER_TYPES:
+        return int(raw)
+    if sql_type in DECIMAL_TYPES:
+        try:
+            return Decimal(raw.strip().lstrip('$').replace(',', ''))
+        except InvalidOperation:
+            raise ValueError(f"Invalid {sql_type} value: {raw!r}")
+    if sql_type in DATETIME_TYPES:
+        # datetime2(7) has 100ns precision; Python keeps microseconds
+        return datetime.fromisoformat(DATETIME_FRACTION.sub(r'\1', raw.strip())).isoformat()
+    return raw
+
+
+class IdMap:
+    """Persistent map of (legacy table, int identity) to UUID, stored in SQLite"""
+
+    def __init__(self, path: str):
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS id_map ("
+            "legacy_table TEXT NOT NULL, legacy_id INTEGER NOT NULL, new_id TEXT NOT NULL, "
+            "PRIMARY KEY (legacy_table, legacy_id)) WITHOUT ROWID"
+        )
+        self.connection.commit()
+
+    def get_many(self, legacy_table: str, legacy_ids) -> Dict[int, str]:
+        """UUIDs for legacy ids, assigning new ones for ids not seen before"""
+        ids = set(legacy_ids)
+        if not ids:
+            return {}
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO id_map (legacy_table, legacy_id, new_id) VALUES (?, ?, ?)",
+                [(legacy_table, legacy_id, str(uuid.uuid4())) for legacy_id in ids]
+            )
+        mapped = {}
+        id_list = list(ids)
+        # Stay under SQLite's bound parameter limit
+        for start in range(0, len(id_list), 500):
+            batch = id_list[start:start + 500]
+            rows = self.connection.execute(
+                f"SELECT legacy_id, new_id FROM id_map WHERE legacy_table = ? "
+                f"AND legacy_id IN ({','.join('?' * len(batch))})",
+                [legacy_table, *batch]
+            )
+            mapped.update(rows)
+        return mapped
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+class Checkpoint:
+    """Rows written per table, saved atomically to a JSON file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.tables = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.tables = json.load(f)
+
+    def rows_done(self, table: str) -> int:
+        return self.tables.get(table, {}).get('rows', 0)
+
+    def is_complete(self, table: str) -> bool:
+        return self.tables.get(table, {}).get('complete', False)
+
+    def save(self, table: str, rows: int, complete: bool = False) -> None:
+        self.tables[table] = {'rows': rows, 'complete': complete}
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(self.tables, f, indent=2)
+        os.replace(temp_path, self.path)
+
+
+def read_rows(path: str, columns: List[str], delimiter: str = ',', header: bool = True) -> Iterator[dict]:
+    """Stream a dump file as {column: raw value} dicts"""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        names = next(reader, None) if header else columns
+        if names is None:
+            return
+        for values in reader:
+            if values:
+                yield dict(zip(names, values))
+
+
+def convert_row(row: dict, column_types: Dict[str, str], mapping: dict) -> dict:
+    """Typed item for a raw row; keys are still legacy ints"""
+    rename = mapping.get('rename', {})
+    item = dict(mapping.get('defaults', {}))
+    for column, raw in row.items():
+        value = convert_value(column_types.get(column, 'nvarchar'), raw)
+        if value is not None:
+            item[rename.get(column, column)] = value
+    return item
+
+
+def map_chunk(items: List[dict], mapping: dict, legacy_table: str, id_map: IdMap) -> List[dict]:
+    """Replace legacy int keys and foreign keys in a chunk with UUIDs"""
+    legacy_key, key_name = mapping['key']
+    keys = id_map.get_many(legacy_table, [item[legacy_key] for item in items])
+    for item in items:
+        item[key_name] = keys[item.pop(legacy_key)]
+
+    for column, referenced_table in mapping.get('foreign_keys', {}).items():
+        references = id_map.get_many(referenced_table, [item[column] for item in items if item.get(column) is not None])
+        for item in items:
+            if item.get(column) is not None:
+                item[column] = references[item[column]]
+
+    derive = mapping.get('derive')
+    for item in items:
+        if derive:
+            item.update(derive(item))
+        for name in [name for name, value in item.items() if value is None]:
+            del item[name]
+    return items
+
+
+def import_table(legacy_table: str, dump_path: str, schema: Dict[str, List[Tuple[str, str]]],
+                 id_map: IdMap, checkpoint: Checkpoint, delimiter: str = ',', header: bool = True) -> bool:
+    """Stream one dump into its DynamoDB table, resuming after the checkpointed row"""
+    mapping = TABLE_MAPPINGS[legacy_table]
+    target, key_name = mapping['target'], mapping['key'][1]
+    column_types = dict(schema[legacy_table])
+    rows_done = checkpoint.rows_done(legacy_table)
+    if rows_done:
+        print(f"  Resuming {legacy_table} after row {rows_done:,}")
+
+    started = last_report = time.monotonic()
+    written = 0
+    in_flight = deque()
+    max_in_flight = IMPORT_WRITERS * 2
+
+    def finish_oldest() -> bool:
+        nonlocal rows_done, written, last_report
+        future, chunk_rows = in_flight.popleft()
+        failed = future.result()
+        if failed:
+            print(f"  ✗ {len(failed)} {target} items were not written; rerun to resume from row {rows_done:,}")
+            return False
+        rows_done += chunk_rows
+        written += chunk_rows
+        checkpoint.save(legacy_table, rows_done)
+        now = time.monotonic()
+        if now - last_report >= IMPORT_PROGRESS_SECONDS:
+            print(f"  {legacy_table}: {rows_done:,} rows ({written / (now - started):,.0f} rows/sec)")
+            last_report = now
+        return True
+
+    def chunks() -> Iterator[List[dict]]:
+        chunk = []
+        rows = read_rows(dump_path, [column for column, _ in schema[legacy_table]], delimiter, header)
+        for index, row in enumerate(rows):
+            if index < rows_done:
+                continue
+            chunk.append(convert_row(row, column_types, mapping))
+            if len(chunk) >= IMPORT_CHUNK_ROWS:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    ok = True
+    with ThreadPoolExecutor(max_workers=IMPORT_WRITERS) as executor:
+        for chunk in chunks():
+            items = map_chunk(chunk, mapping, legacy_table, id_map)
+            in_flight.append((executor.submit(crud.batch_put_items, target, key_name, items), len(items)))
+            # Chunks finish in submission order so the checkpoint only covers written rows
+            if len(in_flight) >= max_in_flight:
+                ok = finish_oldest()
+                if not ok:
+                    break
+        while ok and in_flight:
+            ok = finish_oldest()
+    if not ok:
+        return False
+
+    elapsed = time.monotonic() - started
+    checkpoint.save(legacy_table, rows_done, complete=True)
+    rate = written / elapsed if elapsed else 0
+    print(f"  ✓ {legacy_table} -> {target}: {written:,} rows in {elapsed:.1f}s ({rate:,.0f} rows/sec)")
+    return True
+
+
+def run_import(dump_dir: str, state_dir: Optional[str] = None, tables: Optional[List[str]] = None,
+               schema_path: str = DEFAULT_SCHEMA_PATH, delimiter: str = ',', header: bool = True,
+               update_counters: bool = True) -> bool:
+    """Import every mapped table with a dump file in dump_dir, in dependency order"""
+    state_dir = state_dir or dump_dir
+    os.makedirs(state_dir, exist_ok=True)
+    schema = load_schema(schema_path)
+    id_map = IdMap(os.path.join(state_dir, 'id_map.sqlite'))
+    checkpoint = Checkpoint(os.path.join(state_dir, 'checkpoint.json'))
+
+    imported = []
+    try:
+        for legacy_table in TABLE_MAPPINGS:
+            if tables and legacy_table not in tables:
+                continue
+            dump_path = os.path.join(dump_dir, f"{legacy_table}.csv")
+            if not os.path.exists(dump_path):
+                print(f"  - No dump for {legacy_table}, skipping")
+                continue
+            if checkpoint.is_complete(legacy_table):
+                print(f"  - {legacy_table} already imported, skipping")
+                continue
+            if not import_table(legacy_table, dump_path, schema, id_map, checkpoint, delimiter, header):
+                return False
+            imported.append(TABLE_MAPPINGS[legacy_table]['target'])
+    finally:
+        id_map.close()
+
+    if update_counters:
+        counters.reconcile()
+    # Imported rows bypass crud, so index them for search in one pass
+    for target in imported:
+        if target in search_index.SEARCHABLE:
+            search_index.rebuild(target)
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import legacy SQL Server table dumps into DynamoDB")
+    parser.add_argument('dump_dir', help="Directory of <Table>.csv dumps")
+    parser.add_argument('--state-dir', help="Where the id map and checkpoint are kept (default: dump_dir)")
+    parser.add_argument('--tables', help="Comma-separated legacy tables to import (default: all)")
+    parser.add_argument('--schema', default=DEFAULT_SCHEMA_PATH, help="SQL Server schema script")
+    parser.add_argument('--delimiter', default=',', help="Field delimiter, e.g. '|' for BCP -t'|' exports")
+    parser.add_argument('--no-header', action='store_true', help="Dumps have no header row (BCP); use schema column order")
+    parser.add_argument('--skip-counters', action='store_true', help="Don't reconcile counters afterwards")
+    args = parser.parse_args()
+
+    csv.field_size_limit(sys.maxsize)
+    print(f"Importing legacy dumps from {args.dump_dir}")
+    tables = args.tables.split(',') if args.tables else None
+    ok = run_import(args.dump_dir, args.state_dir, tables, args.schema, args.delimiter,
+                    not args.no_header, not args.skip_counters)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+In-process TTL cache for small, rarely changing lookup tables.
+
+Survey types, survey statuses, townships and board configurations are read on
+nearly every page load but only change through a handful of crud functions.
+Reads are cached per process for LOOKUP_CACHE_TTL_SECONDS; the crud write
+paths invalidate the affected table so this process sees its own changes
+immediately, and the TTL bounds staleness for other processes. Cached values
+are shared between callers and must not be mutated.
+"""
+import functools
+import os
+import threading
+import time
+from collections import OrderedDict
+
+LOOKUP_CACHE_TTL_SECONDS = float(os.getenv("LOOKUP_CACHE_TTL_SECONDS", "60"))
+LOOKUP_CACHE_MAX_ENTRIES = int(os.getenv("LOOKUP_CACHE_MAX_ENTRIES", "256"))
+
+
+class LookupCache:
+    """Size-bounded LRU cache with per-entry expiry and hit/miss counters"""
+
+    def __init__(self, ttl_seconds: float = LOOKUP_CACHE_TTL_SECONDS, max_entries: int = LOOKUP_CACHE_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_load(self, key: tuple, loader):
+        """Return the cached value for key, calling loader() on a miss or expiry"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            generation = self._generation
+
+        value = loader()
+        if self.ttl_seconds <= 0:
+            return value
+
+        with self._lock:
+            # An invalidation while loading means the value may already be stale
+            if generation != self._generation:
+                return value
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, table_name: str = None) -> None:
+        """Drop cached entries for one table, or everything if no table is given"""
+        with self._lock:
+            self._generation += 1
+            if table_name is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if key[0] == table_name]:
+                del self._entries[key]
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'entries': len(self._entries),
+                'ttl_seconds': self.ttl_seconds,
+                'max_entries': self.max_entries
+            }
+
+    def reset_stats(self) -> None:
+        """Reset the hit/miss counters"""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def cached(self, table_name: str):
+        """Decorator caching a read function's result per argument set under table_name"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                key = (table_name, func.__name__, args, tuple(sorted(kwargs.items())))
+                return self.get_or_load(key, lambda: func(*args, **kwargs))
+            return wrapper
+        return decorator
+
+
+lookup_cache = LookupCache()
@@ -1,9 +1,19 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, HTMLResponse
+from graphql import OperationType, get_operation_ast
 import graphene
-from routers import customers, surveys, properties, lookup, townships, user_settings, board_configurations
-from graphql_schema_simple import schema
+import json
+import os
+from routers import customers, surveys, properties, lookup, townships, user_settings, board_configurations, board
+from routers import autocomplete as autocomplete_router
+from graphql_schema_simple import schema, ThreadPoolMiddleware, resolver_executor
+from document_cache import DocumentCache
+from persisted_queries import PersistedQueryStore, PersistedQueryError
+import counters
+import crud
+from autocomplete import autocomplete
+import survey_search
 
 app = FastAPI(
     title="Survey Management API",
@@ -20,13 +30,23 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Parsed and validated documents, keyed by query hash
+document_cache = DocumentCache(schema.graphql_schema)
+
+# Automatic persisted queries (optionally locked down to a build-time allowlist)
+persisted_queries = PersistedQueryStore.from_env()
+
+# Cache-Control max-age for successful GET queries (0 disables the header)
+GRAPHQL_GET_MAX_AGE = int(os.getenv("GRAPHQL_GET_MAX_AGE", "0"))
+
 # GraphQL endpoint
 @app.post("/graphql")
 @app.get("/graphql")
 @app.post("/graphql/")  # Handle trailing slash
 @app.get("/graphql/")   # Handle trailing slash
 async def graphql_endpoint(request: Request):
-    if request.method == "GET":
+    is_get = request.method == "GET"
+    if is_get and not ("query" in request.query_params or "extensions" in request.query_params):
         # Return GraphiQL interface for GET requests
         return HTMLResponse("""
         <!DOCTYPE html>
@@ -58,24 +78,74 @@ async def graphql_endpoint(request: Request):
         </html>
         """)
     
-    # Handle POST requests
+    # Handle POST requests and GET requests carrying a query or persisted query hash
     try:
-        body = await request.json()
-        query = body.get("query", "")
-        variables = body.get("variables", {})
+        if is_get:
+            params = request.query_params
+            body = {
+                "query": params.get("query"),
+                "variables": json.loads(params["variables"]) if params.get("variables") else {},
+                "operationName": params.get("operationName"),
+                "extensions": json.loads(params["extensions"]) if params.get("extensions") else {},
+            }
+        else:
+            body = await request.json()
+        variables = body.get("variables") or {}
+        operation_name = body.get("operationName")
+        
+        try:
+            query = persisted_queries.resolve(body.get("query"), body.get("extensions"))
+        except PersistedQueryError as e:
+            return JSONResponse({"errors": [e.to_dict()]})
+        
+        if is_get:
+            # GET may be cached and replayed by intermediaries, so it only runs queries
+            document, _ = document_cache.get(query)
+            operation = get_operation_ast(document, operation_name) if document else None
+            if operation is not None and operation.operation != OperationType.QUERY:
+                return JSONResponse({"errors": ["Only query operations can be sent with GET"]}, status_code=405)
         
-        result = schema.execute(query, variables=variables)
+        result = await document_cache.execute(
+            query,
+            variables=variables,
+            operation_name=operation_name,
+            middleware=[ThreadPoolMiddleware()]
+        )
         
         response_data = {"data": result.data}
         if result.errors:
             response_data["errors"] = [str(error) for error in result.errors]
+        
+        headers = {}
+        if is_get and GRAPHQL_GET_MAX_AGE > 0 and not result.errors:
+            headers["Cache-Control"] = f"public, max-age={GRAPHQL_GET_MAX_AGE}"
             
-        return JSONResponse(response_data)
+        return JSONResponse(response_data, headers=headers)
     except Exception as e:
         return JSONResponse({
             "errors": [str(e)]
         }, status_code=400)
 
+# Periodic counter reconciliation (enabled with COUNTER_RECONCILE_INTERVAL_SECONDS)
+# autocomplete index rebuilds (AUTOCOMPLETE_REBUILD_SECONDS) and survey search
+# sidecar syncs (SURVEY_SEARCH_DB, SURVEY_SEARCH_SYNC_SECONDS)
+@app.on_event("startup")
+def start_background_jobs():
+    counters.start_reconciler()
+    autocomplete.start_rebuilder()
+    if survey_search.sidecar:
+        survey_search.sidecar.start_syncer()
+
+@app.on_event("shutdown")
+def stop_background_jobs():
+    counters.stop_reconciler()
+    autocomplete.stop_rebuilder()
+    if survey_search.sidecar:
+        survey_search.sidecar.stop_syncer()
+    # Write out settings saves still waiting in the coalescing buffer
+    crud.user_settings_writes.close()
+    resolver_executor.shutdown(wait=False)
+
 # Include REST API routers
 app.include_router(customers.router, prefix="/api")
 app.include_router(surveys.router, prefix="/api")
@@ -84,6 +154,8 @@ app.include_router(townships.router, prefix="/api")
 app.include_router(lookup.router, prefix="/api")
 app.include_router(user_settings.router, prefix="/api")
 app.include_router(board_configurations.router, prefix="/api")
+app.include_router(board.router, prefix="/api")
+app.include_router(autocomplete_router.router, prefix="/api")
 
 @app.get("/")
 def read_root():
@@ -93,6 +165,11 @@ def read_root():
 def health_check():
     return {"status": "healthy"}
 
+@app.get("/graphql-cache-stats")
+def graphql_cache_stats():
+    """Hit/miss counters for the GraphQL document cache"""
+    return document_cache.stats()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
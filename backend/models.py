@@ -153,6 +153,7 @@ class Survey(BaseModel):
     IsScanned: bool = False
     IsDelivered: bool = False
     SurveyorNotes: Optional[str] = None
+    BoardPosition: Optional[int] = None
     IsActive: bool = True
     CreatedDate: datetime = Field(default_factory=datetime.utcnow)
     ModifiedDate: datetime = Field(default_factory=datetime.utcnow)
@@ -197,6 +198,10 @@ class Document(BaseModel):
             datetime: lambda v: v.isoformat()
         }
 
+def user_settings_key(user_id: str, settings_type: str) -> str:
+    """UserSettingsId for a user's settings of one type; one item per (user, type)"""
+    return f"{user_id}#{settings_type}"
+
 class UserSettings(BaseModel):
     UserSettingsId: str = Field(default_factory=lambda: str(uuid.uuid4()))
     UserId: str  # For now, we'll use a default user ID since we don't have user authentication
@@ -229,6 +234,12 @@ class BoardConfiguration(BaseModel):
             datetime: lambda v: v.isoformat()
         }
 
+# Sparse index of the live rows of soft-deleted tables: ActiveId holds the
+# item's key while IsActive and is removed on soft delete, so list reads of
+# ActiveIndex never touch deleted rows
+ACTIVE_INDEX = 'ActiveIndex'
+ACTIVE_KEY = 'ActiveId'
+
 # DynamoDB table configurations
 DYNAMODB_TABLES = {
     'Addresses': {
@@ -273,6 +284,15 @@ DYNAMODB_TABLES = {
                 'KeySchema': [
                     {'AttributeName': 'CompanyName', 'KeyType': 'HASH'}
                 ]
+            },
+            {
+                'IndexName': 'ActiveIndex',
+                'KeySchema': [
+                    {'AttributeName': 'ActiveId', 'KeyType': 'HASH'}
+                ],
+                'AttributeDefinitions': [
+                    {'AttributeName': 'ActiveId', 'AttributeType': 'S'}
+                ]
             }
         ]
     },
@@ -309,6 +329,15 @@ DYNAMODB_TABLES = {
                 'KeySchema': [
                     {'AttributeName': 'TownshipName', 'KeyType': 'HASH'}
                 ]
+            },
+            {
+                'IndexName': 'ActiveIndex',
+                'KeySchema': [
+                    {'AttributeName': 'ActiveId', 'KeyType': 'HASH'}
+                ],
+                'AttributeDefinitions': [
+                    {'AttributeName': 'ActiveId', 'AttributeType': 'S'}
+                ]
             }
         ]
     },
@@ -327,6 +356,15 @@ DYNAMODB_TABLES = {
                 'KeySchema': [
                     {'AttributeName': 'PropertyCode', 'KeyType': 'HASH'}
                 ]
+            },
+            {
+                'IndexName': 'ActiveIndex',
+                'KeySchema': [
+                    {'AttributeName': 'ActiveId', 'KeyType': 'HASH'}
+                ],
+                'AttributeDefinitions': [
+                    {'AttributeName': 'ActiveId', 'AttributeType': 'S'}
+                ]
             }
         ]
     },
@@ -370,6 +408,17 @@ DYNAMODB_TABLES = {
                 'KeySchema': [
                     {'AttributeName': 'CustomerId', 'KeyType': 'HASH'}
                 ]
+            },
+            {
+                'IndexName': 'StatusIdIndex',
+                'KeySchema': [
+                    {'AttributeName': 'StatusId', 'KeyType': 'HASH'},
+                    {'AttributeName': 'ModifiedDate', 'KeyType': 'RANGE'}
+                ],
+                'AttributeDefinitions': [
+                    {'AttributeName': 'StatusId', 'AttributeType': 'S'},
+                    {'AttributeName': 'ModifiedDate', 'AttributeType': 'S'}
+                ]
             }
         ]
     },
@@ -417,6 +466,15 @@ DYNAMODB_TABLES = {
                     {'AttributeName': 'UserId', 'KeyType': 'HASH'},
                     {'AttributeName': 'SettingsType', 'KeyType': 'RANGE'}
                 ]
+            },
+            {
+                'IndexName': 'ActiveIndex',
+                'KeySchema': [
+                    {'AttributeName': 'ActiveId', 'KeyType': 'HASH'}
+                ],
+                'AttributeDefinitions': [
+                    {'AttributeName': 'ActiveId', 'AttributeType': 'S'}
+                ]
             }
         ]
     },
@@ -442,7 +500,43 @@ DYNAMODB_TABLES = {
                 'KeySchema': [
                     {'AttributeName': 'UserId', 'KeyType': 'HASH'}
                 ]
+            },
+            {
+                'IndexName': 'ActiveIndex',
+                'KeySchema': [
+                    {'AttributeName': 'ActiveId', 'KeyType': 'HASH'}
+                ],
+                'AttributeDefinitions': [
+                    {'AttributeName': 'ActiveId', 'AttributeType': 'S'}
+                ]
             }
         ]
+    },
+    'Counters': {
+        'TableName': 'Counters',
+        'KeySchema': [
+            {'AttributeName': 'CounterName', 'KeyType': 'HASH'}
+        ],
+        'AttributeDefinitions': [
+            {'AttributeName': 'CounterName', 'AttributeType': 'S'}
+        ]
+    },
+    'SearchIndex': {
+        'TableName': 'SearchIndex',
+        'KeySchema': [
+            {'AttributeName': 'Term', 'KeyType': 'HASH'},
+            {'AttributeName': 'ItemId', 'KeyType': 'RANGE'}
+        ],
+        'AttributeDefinitions': [
+            {'AttributeName': 'Term', 'AttributeType': 'S'},
+            {'AttributeName': 'ItemId', 'AttributeType': 'S'}
+        ]
     }
 }
+
+# Tables with an ActiveIndex, and the key attribute each one copies into ActiveId
+ACTIVE_INDEX_KEYS = {
+    table_name: table_def['KeySchema'][0]['AttributeName']
+    for table_name, table_def in DYNAMODB_TABLES.items()
+    if any(gsi['IndexName'] == ACTIVE_INDEX for gsi in table_def.get('GlobalSecondaryIndexes', []))
+}
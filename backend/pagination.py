@@ -0,0 +1,80 @@
+"""
+Opaque, signed pagination cursors for DynamoDB-backed list endpoints.
+
+A cursor wraps the ExclusiveStartKey DynamoDB needs to resume a scan or query.
+It is base64url encoded JSON plus an HMAC signature, so clients can pass it
+back verbatim but cannot forge keys into other partitions.
+"""
+import base64
+import hashlib
+import hmac
+import json
+import os
+from decimal import Decimal
+from typing import Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+CURSOR_SECRET = os.getenv("CURSOR_SECRET", os.getenv("SECRET_KEY", "dev-cursor-secret"))
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a cursor is malformed or its signature does not match"""
+
+
+def _encode_value(value):
+    if isinstance(value, Decimal):
+        return {"N": str(value)}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict) and set(value) == {"N"}:
+        return Decimal(value["N"])
+    return value
+
+
+def _sign(payload: bytes) -> str:
+    digest = hmac.new(CURSOR_SECRET.encode(), payload, hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest[:16]).decode().rstrip("=")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def encode_cursor(key: Optional[dict]) -> Optional[str]:
+    """Encode a DynamoDB LastEvaluatedKey as an opaque, signed cursor"""
+    if not key:
+        return None
+    payload = json.dumps(
+        {k: _encode_value(v) for k, v in key.items()},
+        sort_keys=True,
+        separators=(",", ":")
+    ).encode()
+    body = base64.urlsafe_b64encode(payload).decode().rstrip("=")
+    return f"{body}.{_sign(payload)}"
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[dict]:
+    """Decode a cursor back into an ExclusiveStartKey, verifying its signature"""
+    if not cursor:
+        return None
+    try:
+        body, signature = cursor.split(".", 1)
+        payload = _b64decode(body)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError("Malformed cursor") from e
+
+    if not hmac.compare_digest(signature, _sign(payload)):
+        raise InvalidCursorError("Cursor signature mismatch")
+
+    try:
+        key = json.loads(payload)
+    except ValueError as e:
+        raise InvalidCursorError("Malformed cursor") from e
+    if not isinstance(key, dict):
+        raise InvalidCursorError("Malformed cursor")
+    return {k: _decode_value(v) for k, v in key.items()}
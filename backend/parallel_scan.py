@@ -0,0 +1,197 @@
+"""
+Parallel segmented scans for full-table reads.
+
+A scan is split into Segment/TotalSegments slices that run on a thread pool.
+Their pages are merged into one stream through a bounded queue, so only a few
+pages are held in memory however large the table is. Reads can be held to a
+read-capacity budget shared by all segments. An optional checkpoint file
+records each segment's LastEvaluatedKey once the consumer has taken the page,
+so an interrupted backfill can resume where it stopped. Used by exports,
+counter reconciliation and the seed scripts.
+"""
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional
+
+from botocore.exceptions import ClientError
+
+from pagination import decode_cursor, encode_cursor
+
+PARALLEL_SCAN_SEGMENTS = int(os.getenv("PARALLEL_SCAN_SEGMENTS", "4"))
+
+# Capacity assumed per item when the response does not report ConsumedCapacity
+# (eventually consistent read of an item under 4 KB)
+ESTIMATED_UNITS_PER_ITEM = 0.5
+
+_DONE = object()
+
+
+class ReadCapacityBudget:
+    """Token bucket of read capacity units per second, shared by scan segments"""
+
+    def __init__(self, units_per_second: float):
+        self.units_per_second = units_per_second
+        self._available = units_per_second
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, units: float) -> None:
+        """Charge units already read, sleeping while the budget is overdrawn"""
+        with self._lock:
+            now = time.monotonic()
+            self._available = min(self.units_per_second,
+                                  self._available + (now - self._updated) * self.units_per_second)
+            self._updated = now
+            self._available -= units
+            wait = -self._available / self.units_per_second if self._available < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+
+class ScanCheckpoint:
+    """Per-segment resume keys for one scan, saved atomically to a JSON file"""
+
+    def __init__(self, path: str, segments: int):
+        self.path = path
+        self.segments = segments
+        self._keys = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                saved = json.load(f)
+            if saved.get('segments') != segments:
+                raise ValueError(f"Checkpoint {path} was written for {saved.get('segments')} segments, not {segments}")
+            self._keys = {int(segment): cursor for segment, cursor in saved['keys'].items()}
+
+    def start_key(self, segment: int) -> Optional[dict]:
+        """ExclusiveStartKey to resume a segment from, or None to start it fresh"""
+        cursor = self._keys.get(segment)
+        return decode_cursor(cursor) if cursor else None
+
+    def is_done(self, segment: int) -> bool:
+        return self._keys.get(segment) == ''
+
+    def update(self, segment: int, last_key: Optional[dict]) -> None:
+        """Record a segment's progress; a None key marks the segment finished"""
+        self._keys[segment] = encode_cursor(last_key) if last_key else ''
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump({'segments': self.segments, 'keys': self._keys}, f)
+        os.replace(temp_path, self.path)
+
+    def is_complete(self) -> bool:
+        return all(self.is_done(segment) for segment in range(self.segments))
+
+
+def _projection_params(projection: List[str], scan_kwargs: dict) -> dict:
+    names = dict(scan_kwargs.get('ExpressionAttributeNames', {}))
+    names.update({f"#p{i}": name for i, name in enumerate(projection)})
+    return {
+        'ProjectionExpression': ', '.join(f"#p{i}" for i in range(len(projection))),
+        'ExpressionAttributeNames': names
+    }
+
+
+def _put_until_stopped(pages: queue.Queue, value, stop: threading.Event) -> None:
+    """Put into a bounded queue, giving up once the consumer has gone away"""
+    while not stop.is_set():
+        try:
+            pages.put(value, timeout=0.1)
+            return
+        except queue.Full:
+            continue
+
+
+def _scan_segment(table, params: dict, pages: queue.Queue, stop: threading.Event,
+                  budget: Optional[ReadCapacityBudget]) -> None:
+    """Scan one segment into the queue as (segment, items, last_key); _DONE marks the end"""
+    segment = params.get('Segment', 0)
+    try:
+        while not stop.is_set():
+            response = table.scan(**params)
+            items = response.get('Items', [])
+            last_key = response.get('LastEvaluatedKey')
+            if budget:
+                consumed = response.get('ConsumedCapacity', {}).get('CapacityUnits')
+                budget.consume(consumed if consumed is not None else len(items) * ESTIMATED_UNITS_PER_ITEM)
+            _put_until_stopped(pages, (segment, items, last_key), stop)
+            if not last_key:
+                break
+            params['ExclusiveStartKey'] = last_key
+    except ClientError as e:
+        print(f"Error scanning segment {segment} of {table.name}: {e}")
+    finally:
+        _put_until_stopped(pages, _DONE, stop)
+
+
+def scan_pages(table, segments: int = PARALLEL_SCAN_SEGMENTS, projection: Optional[List[str]] = None,
+               max_read_units: Optional[float] = None, checkpoint_path: Optional[str] = None,
+               **scan_kwargs) -> Iterator[List[dict]]:
+    """Yield pages of raw items from a parallel scan of table.
+
+    scan_kwargs are passed to every Scan call (FilterExpression, Limit, ...).
+    projection limits the attributes read; max_read_units caps read capacity
+    per second across all segments; checkpoint_path makes the scan resumable.
+    Pages from different segments are interleaved in no particular order.
+    """
+    segments = max(1, segments)
+    params = dict(scan_kwargs)
+    if projection:
+        params.update(_projection_params(projection, scan_kwargs))
+    budget = ReadCapacityBudget(max_read_units) if max_read_units else None
+    if budget:
+        params['ReturnConsumedCapacity'] = 'TOTAL'
+    checkpoint = ScanCheckpoint(checkpoint_path, segments) if checkpoint_path else None
+
+    segment_params = []
+    for segment in range(segments):
+        if checkpoint and checkpoint.is_done(segment):
+            continue
+        request = dict(params)
+        if 'ExpressionAttributeNames' in request:
+            # boto3 adds the filter's placeholders to this dict, so each segment gets its own
+            request['ExpressionAttributeNames'] = dict(request['ExpressionAttributeNames'])
+        if segments > 1:
+            request.update(Segment=segment, TotalSegments=segments)
+        start_key = checkpoint.start_key(segment) if checkpoint else None
+        if start_key:
+            request['ExclusiveStartKey'] = start_key
+        segment_params.append(request)
+    if not segment_params:
+        return
+
+    pages = queue.Queue(maxsize=len(segment_params) * 2)
+    stop = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=len(segment_params))
+    for request in segment_params:
+        executor.submit(_scan_segment, table, request, pages, stop, budget)
+    try:
+        remaining = len(segment_params)
+        while remaining:
+            page = pages.get()
+            if page is _DONE:
+                remaining -= 1
+                continue
+            segment, items, last_key = page
+            if items:
+                yield items
+            # The consumer has finished with this page, so the segment can resume after it
+            if checkpoint:
+                checkpoint.update(segment, last_key)
+    finally:
+        stop.set()
+        executor.shutdown(wait=True)
+
+
+def scan_items(table, segments: int = PARALLEL_SCAN_SEGMENTS, **kwargs) -> Iterator[dict]:
+    """Yield items from a parallel scan one at a time (see scan_pages)"""
+    for page in scan_pages(table, segments=segments, **kwargs):
+        yield from page
+
+
+def scan_all(table, segments: int = PARALLEL_SCAN_SEGMENTS, **kwargs) -> List[dict]:
+    """Every item from a parallel scan, for tables small enough to hold in memory"""
+    return list(scan_items(table, segments=segments, **kwargs))
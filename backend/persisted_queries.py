@@ -0,0 +1,100 @@
+"""
+Apollo-compatible automatic persisted queries for the /graphql endpoint.
+
+Clients send extensions.persistedQuery.sha256Hash instead of the query text.
+An unknown hash gets a PersistedQueryNotFound error, and the client retries
+once with the full text, which registers it. Optionally, an allowlist file
+generated from frontend/src/graphql/queries.ts (see
+generate_query_allowlist.py) can be loaded at startup. With
+PERSISTED_QUERIES_ONLY set, only the documents on that list can run.
+"""
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from document_cache import query_hash
+
+PERSISTED_QUERIES_ALLOWLIST = os.getenv("PERSISTED_QUERIES_ALLOWLIST", "")
+PERSISTED_QUERIES_ONLY = os.getenv("PERSISTED_QUERIES_ONLY", "false").lower() == "true"
+PERSISTED_QUERIES_MAX_ENTRIES = int(os.getenv("PERSISTED_QUERIES_MAX_ENTRIES", "1000"))
+
+
+class PersistedQueryError(Exception):
+    """A persisted query request that cannot be served, in Apollo's error format"""
+
+    def __init__(self, message: str, code: str):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+
+    def to_dict(self) -> dict:
+        return {"message": self.message, "extensions": {"code": self.code}}
+
+
+class PersistedQueryStore:
+    """Maps sha256 hashes to query text: a fixed allowlist plus registered queries"""
+
+    def __init__(self, allowlist: Optional[Dict[str, str]] = None, allowlist_only: bool = False,
+                 max_entries: int = PERSISTED_QUERIES_MAX_ENTRIES):
+        self.allowlist = dict(allowlist or {})
+        self.allowlist_only = allowlist_only
+        self.max_entries = max_entries
+        self._registered = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "PersistedQueryStore":
+        """Build the store from PERSISTED_QUERIES_ALLOWLIST and PERSISTED_QUERIES_ONLY"""
+        allowlist = {}
+        if PERSISTED_QUERIES_ALLOWLIST:
+            with open(PERSISTED_QUERIES_ALLOWLIST) as f:
+                allowlist = json.load(f)
+            print(f"Loaded {len(allowlist)} persisted queries from {PERSISTED_QUERIES_ALLOWLIST}")
+        return cls(allowlist=allowlist, allowlist_only=PERSISTED_QUERIES_ONLY)
+
+    def lookup(self, sha256_hash: str) -> Optional[str]:
+        """Query text for a hash, or None if it is unknown"""
+        if sha256_hash in self.allowlist:
+            return self.allowlist[sha256_hash]
+        with self._lock:
+            query = self._registered.get(sha256_hash)
+            if query is not None:
+                self._registered.move_to_end(sha256_hash)
+            return query
+
+    def register(self, sha256_hash: str, query: str) -> None:
+        """Remember a query sent with its hash"""
+        with self._lock:
+            self._registered[sha256_hash] = query
+            self._registered.move_to_end(sha256_hash)
+            while len(self._registered) > self.max_entries:
+                self._registered.popitem(last=False)
+
+    def resolve(self, query: Optional[str], extensions: Optional[dict]) -> str:
+        """Return the query text to execute for a request, registering it if needed"""
+        persisted = (extensions or {}).get("persistedQuery")
+
+        if not persisted:
+            if self.allowlist_only and (not query or query_hash(query) not in self.allowlist):
+                raise PersistedQueryError("Query is not in the persisted query allowlist", "PERSISTED_QUERY_NOT_ALLOWED")
+            return query or ""
+
+        if persisted.get("version") != 1:
+            raise PersistedQueryError("Unsupported persisted query version", "PERSISTED_QUERY_NOT_SUPPORTED")
+        sha256_hash = persisted.get("sha256Hash", "")
+
+        if not query:
+            query = self.lookup(sha256_hash)
+            if query is None:
+                raise PersistedQueryError("PersistedQueryNotFound", "PERSISTED_QUERY_NOT_FOUND")
+            return query
+
+        if query_hash(query) != sha256_hash:
+            raise PersistedQueryError("provided sha does not match query", "PERSISTED_QUERY_HASH_MISMATCH")
+        if sha256_hash not in self.allowlist:
+            if self.allowlist_only:
+                raise PersistedQueryError("Query is not in the persisted query allowlist", "PERSISTED_QUERY_NOT_ALLOWED")
+            self.register(sha256_hash, query)
+        return query
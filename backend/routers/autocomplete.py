@@ -0,0 +1,15 @@
+from fastapi import APIRouter, Query
+from typing import List
+import schemas
+from autocomplete import AUTOCOMPLETE_DEFAULT_LIMIT, autocomplete
+
+router = APIRouter(prefix="/autocomplete", tags=["autocomplete"])
+
+@router.get("", response_model=List[schemas.AutocompleteSuggestion])
+def read_autocomplete(
+    entity: str = Query(..., pattern="^(customer|property|township)$"),
+    q: str = Query(""),
+    limit: int = Query(AUTOCOMPLETE_DEFAULT_LIMIT, ge=1, le=50)
+):
+    """Typeahead suggestions (id and label) for a customer, property or township picker"""
+    return autocomplete.suggest(entity, q, limit=limit)
@@ -0,0 +1,35 @@
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+import crud
+import schemas
+from pagination import InvalidCursorError
+
+router = APIRouter(prefix="/board", tags=["board"])
+
+@router.get("/{board_slug}", response_model=schemas.BoardView)
+def read_board(
+    board_slug: str,
+    per_column_limit: int = Query(25, ge=1, le=200),
+    after: Optional[str] = Query(None, description="Cursor from a previous board's next_cursor")
+):
+    """Get a board's status columns with per-column totals and first page of surveys"""
+    try:
+        board_view = crud.get_board_view(board_slug=board_slug, per_column_limit=per_column_limit, after=after)
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    if board_view is None:
+        raise HTTPException(status_code=404, detail="Board configuration not found")
+    return {
+        "board": board_view["board"],
+        "columns": [
+            {
+                "StatusId": column["status"].SurveyStatusId,
+                "StatusName": column["status"].StatusName,
+                "total": column["total"],
+                "surveys": column["surveys"],
+                "next_cursor": column["next_cursor"]
+            }
+            for column in board_view["columns"]
+        ],
+        "next_cursor": board_view["next_cursor"]
+    }
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException, Path, Query
+from datetime import datetime
 from typing import List, Optional
 
 import crud
@@ -71,19 +72,18 @@ def get_board_configuration(board_config_id: str = Path(..., description="Board
 @router.put("/{board_config_id}", response_model=BoardConfiguration)
 def update_board_configuration(
     board_config_id: str, 
-    board_config: schemas.BoardConfigurationUpdate
+    board_config: schemas.BoardConfigurationUpdate,
+    expected_modified_date: Optional[datetime] = Query(None, description="Only update if the stored ModifiedDate still equals this value (409 otherwise)")
 ):
     """Update a board configuration"""
     try:
-        # First check if the board configuration exists
-        existing = crud.get_board_configuration(board_config_id)
-        if not existing:
-            raise HTTPException(status_code=404, detail="Board configuration not found")
-        
-        updated_config = crud.update_board_configuration(board_config_id, board_config)
+        updated_config = crud.update_board_configuration(board_config_id, board_config,
+                                                         expected_modified_date=expected_modified_date)
         if not updated_config:
-            raise HTTPException(status_code=400, detail="Failed to update board configuration")
+            raise HTTPException(status_code=404, detail="Board configuration not found")
         return updated_config
+    except crud.UpdateConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except HTTPException:
         raise
     except Exception as e:
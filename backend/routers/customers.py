@@ -1,7 +1,9 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Body, HTTPException, Query
 from typing import List, Optional
 import crud
+import exports
 import schemas
+from pagination import InvalidCursorError
 
 router = APIRouter(prefix="/customers", tags=["customers"])
 
@@ -9,16 +11,31 @@ router = APIRouter(prefix="/customers", tags=["customers"])
 def read_customers(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    search: Optional[str] = Query(None)
+    search: Optional[str] = Query(None),
+    after: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
+    exact_total: bool = Query(False, description="Count with a full table scan instead of the maintained counter")
 ):
-    customers, total = crud.get_customers(skip=skip, limit=limit, search=search)
+    try:
+        customers, next_cursor = crud.get_customers_page(limit=limit, after=after, search=search, skip=skip)
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    total = crud.count_customers(search=search, exact=exact_total)
     return {
         "customers": customers,
         "total": total,
         "page": skip // limit + 1,
-        "size": limit
+        "size": limit,
+        "next_cursor": next_cursor
     }
 
+@router.get("/export")
+def export_customers(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    search: Optional[str] = Query(None)
+):
+    """Stream every customer as NDJSON or CSV"""
+    return exports.export_response("customers", format=format, search=search)
+
 @router.get("/{customer_id}", response_model=schemas.Customer)
 def read_customer(customer_id: str):  # Changed from int to str
     db_customer = crud.get_customer(customer_id=customer_id)
@@ -33,6 +50,13 @@ def create_customer(customer: schemas.CustomerCreate):
         raise HTTPException(status_code=400, detail="Failed to create customer")
     return result
 
+@router.post("/bulk", response_model=schemas.BulkCreateResponse)
+def bulk_create_customers(rows: List[dict] = Body(...)):
+    """Create many customers in one request; each row is validated and reported separately"""
+    if len(rows) > crud.BULK_CREATE_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"At most {crud.BULK_CREATE_MAX_ROWS} rows per request")
+    return crud.bulk_create_response(crud.bulk_create_customers(rows))
+
 @router.put("/{customer_id}", response_model=schemas.Customer)
 def update_customer(
     customer_id: str,  # Changed from int to str
@@ -2,6 +2,7 @@ from fastapi import APIRouter
 from typing import List
 import crud
 import schemas
+from lookup_cache import lookup_cache
 
 router = APIRouter(prefix="/lookup", tags=["lookup"])
 
@@ -28,3 +29,8 @@ def create_survey_status(survey_status: schemas.SurveyStatusCreate):
 @router.post("/townships", response_model=schemas.Township)
 def create_township(township: schemas.TownshipCreate):
     return crud.create_township(township=township)
+
+@router.get("/cache-stats")
+def read_cache_stats():
+    """Hit/miss counters for the lookup table cache"""
+    return lookup_cache.stats()
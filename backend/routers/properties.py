@@ -1,7 +1,9 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Body, HTTPException, Query
 from typing import List, Optional
 import crud
+import exports
 import schemas
+from pagination import InvalidCursorError
 
 router = APIRouter(prefix="/properties", tags=["properties"])
 
@@ -9,16 +11,31 @@ router = APIRouter(prefix="/properties", tags=["properties"])
 def read_properties(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    search: Optional[str] = Query(None)
+    search: Optional[str] = Query(None),
+    after: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
+    exact_total: bool = Query(False, description="Count with a full table scan instead of the maintained counter")
 ):
-    properties, total = crud.get_properties(skip=skip, limit=limit, search=search)
+    try:
+        properties, next_cursor = crud.get_properties_page(limit=limit, after=after, search=search, skip=skip)
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    total = crud.count_properties(search=search, exact=exact_total)
     return {
         "properties": properties,
         "total": total,
         "page": skip // limit + 1,
-        "size": limit
+        "size": limit,
+        "next_cursor": next_cursor
     }
 
+@router.get("/export")
+def export_properties(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    search: Optional[str] = Query(None)
+):
+    """Stream every property as NDJSON or CSV"""
+    return exports.export_response("properties", format=format, search=search)
+
 @router.get("/{property_id}", response_model=schemas.Property)
 def read_property(property_id: str):
     db_property = crud.get_property(property_id=property_id)
@@ -30,6 +47,13 @@ def read_property(property_id: str):
 def create_property(property: schemas.PropertyCreate):
     return crud.create_property(property=property)
 
+@router.post("/bulk", response_model=schemas.BulkCreateResponse)
+def bulk_create_properties(rows: List[dict] = Body(...)):
+    """Create many properties in one request; each row is validated and reported separately"""
+    if len(rows) > crud.BULK_CREATE_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"At most {crud.BULK_CREATE_MAX_ROWS} rows per request")
+    return crud.bulk_create_response(crud.bulk_create_properties(rows))
+
 @router.put("/{property_id}", response_model=schemas.Property)
 def update_property(
     property_id: str,
@@ -1,7 +1,10 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Body, HTTPException, Query
+from datetime import datetime
 from typing import List, Optional
 import crud
+import exports
 import schemas
+from pagination import InvalidCursorError
 
 router = APIRouter(prefix="/surveys", tags=["surveys"])
 
@@ -9,16 +12,31 @@ router = APIRouter(prefix="/surveys", tags=["surveys"])
 def read_surveys(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    search: Optional[str] = Query(None)
+    search: Optional[str] = Query(None),
+    after: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
+    exact_total: bool = Query(False, description="Count with a full table scan instead of the maintained counter")
 ):
-    surveys, total = crud.get_surveys(skip=skip, limit=limit, search=search)
+    try:
+        surveys, next_cursor = crud.get_surveys_page(limit=limit, after=after, search=search, skip=skip)
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    total = crud.count_surveys(search=search, exact=exact_total)
     return {
         "surveys": surveys,
         "total": total,
         "page": skip // limit + 1,
-        "size": limit
+        "size": limit,
+        "next_cursor": next_cursor
     }
 
+@router.get("/export")
+def export_surveys(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    search: Optional[str] = Query(None)
+):
+    """Stream every survey as NDJSON or CSV"""
+    return exports.export_response("surveys", format=format, search=search)
+
 @router.get("/{survey_id}", response_model=schemas.Survey)
 def read_survey(survey_id: str):
     db_survey = crud.get_survey(survey_id=survey_id)
@@ -30,12 +48,24 @@ def read_survey(survey_id: str):
 def create_survey(survey: schemas.SurveyCreate):
     return crud.create_survey(survey=survey)
 
+@router.post("/bulk", response_model=schemas.BulkCreateResponse)
+def bulk_create_surveys(rows: List[dict] = Body(...)):
+    """Create many surveys in one request; each row is validated and reported separately"""
+    if len(rows) > crud.BULK_CREATE_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"At most {crud.BULK_CREATE_MAX_ROWS} rows per request")
+    return crud.bulk_create_response(crud.bulk_create_surveys(rows))
+
 @router.put("/{survey_id}", response_model=schemas.Survey)
 def update_survey(
     survey_id: str,
-    survey: schemas.SurveyUpdate
+    survey: schemas.SurveyUpdate,
+    expected_modified_date: Optional[datetime] = Query(None, description="Only update if the stored ModifiedDate still equals this value (409 otherwise)")
 ):
-    db_survey = crud.update_survey(survey_id=survey_id, survey=survey)
+    try:
+        db_survey = crud.update_survey(survey_id=survey_id, survey=survey,
+                                       expected_modified_date=expected_modified_date)
+    except crud.UpdateConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     if db_survey is None:
         raise HTTPException(status_code=404, detail="Survey not found")
     return db_survey
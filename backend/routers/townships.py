@@ -1,4 +1,5 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from datetime import datetime
 from typing import List, Optional
 import crud
 import schemas
@@ -33,9 +34,17 @@ def create_township(township: schemas.TownshipCreate):
     return db_township
 
 @router.put("/{township_id}", response_model=schemas.Township)
-def update_township(township_id: str, township: schemas.TownshipUpdate):
+def update_township(
+    township_id: str,
+    township: schemas.TownshipUpdate,
+    expected_modified_date: Optional[datetime] = Query(None, description="Only update if the stored ModifiedDate still equals this value (409 otherwise)")
+):
     """Update an existing township"""
-    db_township = crud.update_township(township_id=township_id, township=township)
+    try:
+        db_township = crud.update_township(township_id=township_id, township=township,
+                                           expected_modified_date=expected_modified_date)
+    except crud.UpdateConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     if db_township is None:
         raise HTTPException(status_code=404, detail="Township not found")
     return db_township
@@ -2,6 +2,7 @@ from fastapi import APIRouter, HTTPException, status
 from typing import List
 import crud
 import schemas
+from models import user_settings_key
 
 router = APIRouter()
 
@@ -44,20 +45,12 @@ async def create_user_settings(settings_data: schemas.UserSettingsCreate):
 @router.put("/user-settings/{settings_type}", response_model=schemas.UserSettings)
 async def update_user_settings(settings_type: str, settings_data: schemas.UserSettingsUpdate):
     """Update user settings by type"""
-    # First get the existing settings
-    existing_settings = crud.get_user_settings(DEFAULT_USER_ID, settings_type)
-    if not existing_settings:
+    updated_settings = crud.update_user_settings(user_settings_key(DEFAULT_USER_ID, settings_type), settings_data)
+    if not updated_settings:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Settings not found for type: {settings_type}"
         )
-    
-    updated_settings = crud.update_user_settings(existing_settings.UserSettingsId, settings_data)
-    if not updated_settings:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Failed to update user settings"
-        )
     return updated_settings
 
 
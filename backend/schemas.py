@@ -295,18 +295,33 @@ class SurveyListResponse(BaseModel):
     total: int
     page: int
     size: int
+    next_cursor: Optional[str] = None
 
 class CustomerListResponse(BaseModel):
     customers: List[Customer]
     total: int
     page: int
     size: int
+    next_cursor: Optional[str] = None
 
 class PropertyListResponse(BaseModel):
     properties: List[Property]
     total: int
     page: int
     size: int
+    next_cursor: Optional[str] = None
+
+# Bulk create schemas
+class BulkCreateResult(BaseModel):
+    index: int
+    success: bool
+    id: Optional[str] = None
+    error: Optional[str] = None
+
+class BulkCreateResponse(BaseModel):
+    results: List[BulkCreateResult]
+    created: int
+    failed: int
 
 # UserSettings Schemas
 class UserSettingsBase(BaseModel):
@@ -363,3 +378,21 @@ class BoardConfigurationListResponse(BaseModel):
     total: int
     page: int
     size: int
+
+# Board View Schemas
+class BoardColumn(BaseModel):
+    StatusId: str
+    StatusName: str
+    total: int
+    surveys: List[Survey]
+    next_cursor: Optional[str] = None
+
+class BoardView(BaseModel):
+    board: Optional[BoardConfiguration] = None
+    columns: List[BoardColumn]
+    next_cursor: Optional[str] = None
+
+# Autocomplete Schemas
+class AutocompleteSuggestion(BaseModel):
+    id: str
+    label: str
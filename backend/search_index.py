@@ -0,0 +1,256 @@
+"""
+Trigram search index for customer, property and survey free-text search.
+
+Searchable field values are casefolded and split into trigrams. The first one
+and two characters of every word are also indexed (as '^a', '^ab') so that
+queries shorter than three characters can match word prefixes. The SearchIndex
+table holds one posting item per (entity#gram, item id). Each indexed row also
+has a manifest item listing its grams, so an update can drop the postings that
+no longer apply.
+
+A search queries the postings for the query's grams in parallel and
+intersects them. crud then fetches the candidates' searchable fields and ranks
+them with rank(): exact matches first, then prefix, then word-prefix, then
+substring. The cost depends on how common the query's grams are, not on the
+table size. Queries with more than SEARCH_MAX_CANDIDATES candidates fall back
+to the scans. Ranked results are cached briefly in search_results, so a page
+and its total share one search; the write hooks here invalidate them.
+
+Tables are searched through the index once rebuild() has run for them; until
+then crud falls back to its FilterExpression scans.
+Usage: python search_index.py [Customers Properties Surveys]
+"""
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional
+
+from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import parallel_scan
+from database import get_table
+from lookup_cache import LookupCache, lookup_cache
+
+SEARCH_INDEX_TABLE = 'SearchIndex'
+SEARCH_MAX_CANDIDATES = int(os.getenv("SEARCH_MAX_CANDIDATES", "1000"))
+SEARCH_QUERY_WORKERS = 8
+# Longer queries are narrowed with this many of their grams, spread across the query
+SEARCH_MAX_QUERY_GRAMS = 6
+READY_TERM = '_ready'
+SEARCH_RESULTS_TTL_SECONDS = float(os.getenv("SEARCH_RESULTS_TTL_SECONDS", "10"))
+SEARCH_RESULTS_MAX_ENTRIES = 64
+
+SEARCHABLE = {
+    'Customers': {'key': 'CustomerId', 'fields': ['CompanyName', 'CustomerCode', 'Email']},
+    'Properties': {'key': 'PropertyId', 'fields': ['PropertyName', 'PropertyCode', 'OwnerName']},
+    'Surveys': {'key': 'SurveyId', 'fields': ['SurveyNumber', 'Notes']},
+}
+
+
+# Ranked ids per (table, normalized query), filled by crud.search_matches
+search_results = LookupCache(ttl_seconds=SEARCH_RESULTS_TTL_SECONDS, max_entries=SEARCH_RESULTS_MAX_ENTRIES)
+
+
+def normalize(text) -> str:
+    """Casefold and collapse whitespace"""
+    return ' '.join(str(text).casefold().split())
+
+
+def text_grams(text) -> set:
+    """Trigrams of a value plus the one and two character prefixes of its words"""
+    text = normalize(text)
+    grams = {text[i:i + 3] for i in range(len(text) - 2)}
+    for word in text.split():
+        grams.update({f"^{word[:1]}", f"^{word[:2]}"})
+    return grams
+
+
+def item_grams(table_name: str, item: dict) -> set:
+    """Grams for every searchable field of an item"""
+    grams = set()
+    for field in SEARCHABLE[table_name]['fields']:
+        if item.get(field):
+            grams |= text_grams(item[field])
+    return grams
+
+
+def query_grams(query: str) -> List[str]:
+    """Grams a matching item must have; short queries match word prefixes"""
+    text = normalize(query)
+    if len(text) < 3:
+        return [f"^{text}"] if text else []
+    grams = list(dict.fromkeys(text[i:i + 3] for i in range(len(text) - 2)))
+    if len(grams) > SEARCH_MAX_QUERY_GRAMS:
+        step = (len(grams) - 1) / (SEARCH_MAX_QUERY_GRAMS - 1)
+        grams = [grams[round(i * step)] for i in range(SEARCH_MAX_QUERY_GRAMS)]
+    return grams
+
+
+def _term(table_name: str, gram: str) -> str:
+    return f"{table_name}#{gram}"
+
+
+def _manifest_key(table_name: str, item_id: str) -> dict:
+    return {'Term': f"{table_name}@{item_id}", 'ItemId': item_id}
+
+
+def _write(index, table_name: str, item_id: str, puts: Iterable[str], deletes: Iterable[str],
+           grams: Optional[set]) -> None:
+    with index.batch_writer() as batch:
+        for gram in puts:
+            batch.put_item(Item={'Term': _term(table_name, gram), 'ItemId': item_id})
+        for gram in deletes:
+            batch.delete_item(Key={'Term': _term(table_name, gram), 'ItemId': item_id})
+        if grams is None:
+            batch.delete_item(Key=_manifest_key(table_name, item_id))
+        else:
+            batch.put_item(Item=dict(_manifest_key(table_name, item_id), Grams=sorted(grams)))
+
+
+def index_item(table_name: str, item: dict) -> None:
+    """Bring an item's postings in line with its current field values"""
+    index = get_table(SEARCH_INDEX_TABLE)
+    item_id = item[SEARCHABLE[table_name]['key']]
+    grams = item_grams(table_name, item)
+    try:
+        manifest = index.get_item(Key=_manifest_key(table_name, item_id)).get('Item')
+        old_grams = set(manifest.get('Grams', [])) if manifest else set()
+        _write(index, table_name, item_id, grams - old_grams, old_grams - grams, grams)
+    except ClientError as e:
+        print(f"Error indexing {table_name} item {item_id}: {e}")
+    search_results.invalidate(table_name)
+
+
+def index_new_items(table_name: str, items: List[dict]) -> None:
+    """Index freshly created items, which have no postings to replace"""
+    index = get_table(SEARCH_INDEX_TABLE)
+    if not items:
+        return
+    key_name = SEARCHABLE[table_name]['key']
+    try:
+        with index.batch_writer() as batch:
+            for item in items:
+                grams = item_grams(table_name, item)
+                for gram in grams:
+                    batch.put_item(Item={'Term': _term(table_name, gram), 'ItemId': item[key_name]})
+                batch.put_item(Item=dict(_manifest_key(table_name, item[key_name]), Grams=sorted(grams)))
+    except ClientError as e:
+        print(f"Error indexing {len(items)} {table_name} items: {e}")
+    search_results.invalidate(table_name)
+
+
+def remove_item(table_name: str, item_id: str) -> None:
+    """Drop every posting for a deleted item"""
+    index = get_table(SEARCH_INDEX_TABLE)
+    try:
+        manifest = index.get_item(Key=_manifest_key(table_name, item_id)).get('Item')
+        if manifest:
+            _write(index, table_name, item_id, [], manifest.get('Grams', []), None)
+    except ClientError as e:
+        print(f"Error removing {table_name} item {item_id} from search index: {e}")
+    search_results.invalidate(table_name)
+
+
+@lookup_cache.cached(SEARCH_INDEX_TABLE)
+def is_ready(table_name: str) -> bool:
+    """Whether rebuild() has indexed the table's existing rows"""
+    index = get_table(SEARCH_INDEX_TABLE)
+    try:
+        return 'Item' in index.get_item(Key={'Term': READY_TERM, 'ItemId': table_name})
+    except ClientError:
+        return False
+
+
+def _posting_ids(index, term: str) -> set:
+    params = {'KeyConditionExpression': Key('Term').eq(term), 'ProjectionExpression': 'ItemId'}
+    ids = set()
+    while True:
+        response = index.query(**params)
+        ids.update(item['ItemId'] for item in response.get('Items', []))
+        last_key = response.get('LastEvaluatedKey')
+        if not last_key:
+            return ids
+        params['ExclusiveStartKey'] = last_key
+
+
+def search_ids(table_name: str, query: str) -> Optional[List[str]]:
+    """IDs of items that have every gram of the query, or None when the index can't be used.
+
+    More than SEARCH_MAX_CANDIDATES candidates also returns None: they are
+    not ranked yet, so any cut could drop the best matches and the total.
+    """
+    grams = query_grams(query)
+    if not grams or not is_ready(table_name):
+        return None
+    index = get_table(SEARCH_INDEX_TABLE)
+    try:
+        with ThreadPoolExecutor(max_workers=min(len(grams), SEARCH_QUERY_WORKERS)) as executor:
+            postings = list(executor.map(lambda gram: _posting_ids(index, _term(table_name, gram)), grams))
+    except ClientError as e:
+        print(f"Error searching {table_name}: {e}")
+        return None
+    postings.sort(key=len)
+    ids = postings[0]
+    for posting in postings[1:]:
+        ids &= posting
+    if len(ids) > SEARCH_MAX_CANDIDATES:
+        return None
+    return sorted(ids)
+
+
+def match_rank(item: dict, query: str, fields: List[str]) -> Optional[tuple]:
+    """Sort key for an item matching query: exact, prefix, word prefix, then substring; None if no match"""
+    text = normalize(query)
+    best = None
+    for field in fields:
+        value = normalize(item.get(field) or '')
+        if not value or text not in value:
+            continue
+        if value == text:
+            score = 0
+        elif value.startswith(text):
+            score = 1
+        elif f" {text}" in f" {value}":
+            score = 2
+        else:
+            score = 3
+        if best is None or (score, len(value)) < best:
+            best = (score, len(value))
+    return best
+
+
+def rank(table_name: str, items: Iterable[dict], query: str) -> List[dict]:
+    """Items that really contain the query, best matches first"""
+    spec = SEARCHABLE[table_name]
+    ranked = []
+    for item in items:
+        key = match_rank(item, query, spec['fields'])
+        if key is not None:
+            ranked.append((key, item[spec['key']], item))
+    ranked.sort(key=lambda entry: entry[:2])
+    return [item for _, _, item in ranked]
+
+
+def rebuild(table_name: str) -> int:
+    """Index every existing row of a table and mark it ready for indexed search"""
+    index = get_table(SEARCH_INDEX_TABLE)
+    table = get_table(table_name)
+    spec = SEARCHABLE[table_name]
+    count = 0
+    for page in parallel_scan.scan_pages(table, projection=[spec['key'], *spec['fields']]):
+        with ThreadPoolExecutor(max_workers=SEARCH_QUERY_WORKERS) as executor:
+            list(executor.map(lambda item: index_item(table_name, item), page))
+        count += len(page)
+    index.put_item(Item={'Term': READY_TERM, 'ItemId': table_name})
+    lookup_cache.invalidate(SEARCH_INDEX_TABLE)
+    search_results.invalidate(table_name)
+    return count
+
+
+if __name__ == "__main__":
+    for name in sys.argv[1:] or SEARCHABLE:
+        print(f"Indexing {name}...")
+        print(f"  {rebuild(name)} rows indexed")
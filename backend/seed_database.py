@@ -109,7 +109,7 @@ def create_township_direct(township_data):
             'ModifiedBy': 'system'
         }
         
-        table.put_item(Item=item)
+        table.put_item(Item=crud.with_active_key('Townships', item))
         return True
     except Exception as e:
         print(f"Error creating township: {e}")
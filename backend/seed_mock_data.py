@@ -19,6 +19,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from models import Customer, Property, Survey
 import crud
+from parallel_scan import scan_all
 
 def get_local_dynamodb():
     """Get a direct connection to local moto DynamoDB"""
@@ -35,20 +36,11 @@ def get_existing_data():
     try:
         dynamodb = get_local_dynamodb()
         
-        # Get survey types
-        survey_types_table = dynamodb.Table('SurveyTypes')
-        survey_types_response = survey_types_table.scan(FilterExpression=Attr('IsActive').eq(True))
-        survey_types = survey_types_response.get('Items', [])
-        
-        # Get survey statuses
-        survey_statuses_table = dynamodb.Table('SurveyStatuses')
-        survey_statuses_response = survey_statuses_table.scan(FilterExpression=Attr('IsActive').eq(True))
-        survey_statuses = survey_statuses_response.get('Items', [])
-        
-        # Get townships
-        townships_table = dynamodb.Table('Townships')
-        townships_response = townships_table.scan(FilterExpression=Attr('IsActive').eq(True))
-        townships = townships_response.get('Items', [])
+        # Read every page, not just the first 1 MB
+        active = Attr('IsActive').eq(True)
+        survey_types = scan_all(dynamodb.Table('SurveyTypes'), FilterExpression=active)
+        survey_statuses = scan_all(dynamodb.Table('SurveyStatuses'), FilterExpression=active)
+        townships = scan_all(dynamodb.Table('Townships'), FilterExpression=active)
         
         return survey_types, survey_statuses, townships
     except Exception as e:
@@ -79,7 +71,7 @@ def create_customer_direct(customer_data):
             'ModifiedBy': 'system'
         }
         
-        table.put_item(Item=item)
+        table.put_item(Item=crud.with_active_key('Customers', item))
         return item
     except Exception as e:
         print(f"Error creating customer: {e}")
@@ -120,7 +112,7 @@ def create_property_direct(property_data):
             'ModifiedBy': 'system'
         }
         
-        table.put_item(Item=item)
+        table.put_item(Item=crud.with_active_key('Properties', item))
         return item
     except Exception as e:
         print(f"Error creating property: {e}")
@@ -5,12 +5,13 @@ Combines functionality from setup_tables.py and setup_additional_tables.py
 """
 import sys
 import os
+import time
 import boto3
 
 # Add current directory to path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from models import DYNAMODB_TABLES
+from models import ACTIVE_INDEX_KEYS, ACTIVE_KEY, DYNAMODB_TABLES, user_settings_key
 
 def connect_to_dynamodb():
     """Connect to local DynamoDB instance"""
@@ -89,6 +90,124 @@ def create_table_from_model(dynamodb, table_name):
         print(f"✗ Error creating table '{table_name}': {e}")
         return False
 
+def add_missing_indexes(dynamodb, table_name):
+    """Add Global Secondary Indexes from models.py that an existing table is missing"""
+    
+    table_def = DYNAMODB_TABLES.get(table_name, {})
+    if 'GlobalSecondaryIndexes' not in table_def:
+        return True
+    
+    try:
+        table = dynamodb.Table(table_name)
+        existing_indexes = [gsi['IndexName'] for gsi in (table.global_secondary_indexes or [])]
+        
+        for gsi in table_def['GlobalSecondaryIndexes']:
+            if gsi['IndexName'] in existing_indexes:
+                continue
+            
+            print(f"  Adding index {gsi['IndexName']} to {table_name}")
+            table.update(
+                AttributeDefinitions=gsi.get('AttributeDefinitions', []),
+                GlobalSecondaryIndexUpdates=[{
+                    'Create': {
+                        'IndexName': gsi['IndexName'],
+                        'KeySchema': gsi['KeySchema'],
+                        'Projection': {'ProjectionType': 'ALL'}
+                    }
+                }]
+            )
+            # DynamoDB allows one index creation per update, so wait for it to finish
+            print(f"  Waiting for index {gsi['IndexName']} to be ready...")
+            while True:
+                table.reload()
+                statuses = {index['IndexName']: index.get('IndexStatus') for index in table.global_secondary_indexes or []}
+                if statuses.get(gsi['IndexName']) == 'ACTIVE':
+                    break
+                time.sleep(2)
+            print(f"✓ Index {gsi['IndexName']} added to {table_name}")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Error adding indexes to '{table_name}': {e}")
+        return False
+
+def migrate_user_settings_keys(dynamodb):
+    """Re-key UserSettings items with random ids to user_settings_key(UserId, SettingsType)"""
+    
+    try:
+        table = dynamodb.Table('UserSettings')
+        scan_kwargs = {}
+        items = []
+        while True:
+            response = table.scan(**scan_kwargs)
+            items.extend(response.get('Items', []))
+            if 'LastEvaluatedKey' not in response:
+                break
+            scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        
+        # Where a user has several items of one type, keep the most recently modified
+        latest = {}
+        for item in items:
+            key = user_settings_key(item['UserId'], item['SettingsType'])
+            if key not in latest or item.get('ModifiedDate', '') > latest[key].get('ModifiedDate', ''):
+                latest[key] = item
+        
+        migrated = 0
+        with table.batch_writer() as batch:
+            for item in items:
+                key = user_settings_key(item['UserId'], item['SettingsType'])
+                if item['UserSettingsId'] == key:
+                    continue
+                if latest[key] is item:
+                    batch.put_item(Item=dict(item, UserSettingsId=key))
+                    migrated += 1
+                batch.delete_item(Key={'UserSettingsId': item['UserSettingsId']})
+        if migrated:
+            print(f"✓ Re-keyed {migrated} UserSettings items")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Error migrating UserSettings keys: {e}")
+        return False
+
+def backfill_active_keys(dynamodb, table_name):
+    """Set ActiveId on active rows written before the table had an ActiveIndex"""
+    
+    key_name = ACTIVE_INDEX_KEYS.get(table_name)
+    if key_name is None:
+        return True
+    
+    try:
+        table = dynamodb.Table(table_name)
+        scan_kwargs = {
+            'FilterExpression': 'attribute_not_exists(#active_key) AND '
+                                '(attribute_not_exists(IsActive) OR IsActive = :true)',
+            'ProjectionExpression': '#key',
+            'ExpressionAttributeNames': {'#active_key': ACTIVE_KEY, '#key': key_name},
+            'ExpressionAttributeValues': {':true': True}
+        }
+        backfilled = 0
+        while True:
+            response = table.scan(**scan_kwargs)
+            for item in response.get('Items', []):
+                table.update_item(
+                    Key={key_name: item[key_name]},
+                    UpdateExpression='SET #active_key = :key',
+                    ExpressionAttributeNames={'#active_key': ACTIVE_KEY},
+                    ExpressionAttributeValues={':key': item[key_name]}
+                )
+                backfilled += 1
+            if 'LastEvaluatedKey' not in response:
+                break
+            scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        if backfilled:
+            print(f"✓ Backfilled {ACTIVE_KEY} on {backfilled} {table_name} items")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Error backfilling {ACTIVE_KEY} on '{table_name}': {e}")
+        return False
+
 def create_table_simple(dynamodb, table_name, key_attribute, key_type='S'):
     """Create a simple table with just a hash key (fallback method)"""
     try:
@@ -145,7 +264,9 @@ def setup_all_tables():
         'SurveyFiles',
         'Documents',
         'UserSettings',
-        'BoardConfigurations'
+        'BoardConfigurations',
+        'Counters',
+        'SearchIndex'
     ]
     
     print(f"\n📋 Required tables: {all_tables}")
@@ -161,7 +282,10 @@ def setup_all_tables():
         
         if table_name in existing_tables:
             print(f"✓ Table {table_name} already exists")
-            success_count += 1
+            if add_missing_indexes(dynamodb, table_name) and \
+                    (table_name != 'UserSettings' or migrate_user_settings_keys(dynamodb)) and \
+                    backfill_active_keys(dynamodb, table_name):
+                success_count += 1
             continue
         
         # Try to create table using model definition
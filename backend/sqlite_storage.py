@@ -0,0 +1,304 @@
+"""
+SQLite storage engine for offline and edge deployments.
+
+Each DYNAMODB_TABLES definition becomes a WITHOUT ROWID SQLite table in WAL
+mode. Key attributes and every GSI key attribute are real columns, and each
+GSI is a partial B-tree index over (hash, range, table key), so items
+missing the index keys stay out of it just like a sparse DynamoDB index.
+The whole item is stored alongside as DynamoDB-typed JSON.
+
+Key conditions become indexed WHERE clauses, query and scan pages are read
+in key order with keyset pagination (ExclusiveStartKey is a row-value
+comparison, never an OFFSET), and filter, projection, condition and update
+expressions are evaluated by the shared code in storage.py. Table
+definitions are kept in the file, so reopening it takes milliseconds.
+
+Select it with STORAGE_BACKEND=sqlite and SQLITE_STORAGE_PATH (database.py).
+"""
+import base64
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from decimal import Decimal
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from boto3.dynamodb.types import Binary, TypeDeserializer, TypeSerializer
+
+from storage import Database, TableStore, item_size
+
+# Rows fetched per SELECT while paging through a query or scan
+FETCH_ROWS = 256
+DEFINITIONS_TABLE = '$tables'
+COLUMN_AFFINITY = {'S': 'TEXT', 'N': 'NUMERIC', 'B': 'BLOB'}
+
+_serializer = TypeSerializer()
+_deserializer = TypeDeserializer()
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _to_json(value: dict):
+    """DynamoDB wire value with binary data base64-encoded"""
+    (type_code, data), = value.items()
+    if type_code == 'B':
+        return {'B': base64.b64encode(bytes(data)).decode()}
+    if type_code == 'BS':
+        return {'BS': [base64.b64encode(bytes(v)).decode() for v in data]}
+    if type_code == 'L':
+        return {'L': [_to_json(v) for v in data]}
+    if type_code == 'M':
+        return {'M': {k: _to_json(v) for k, v in data.items()}}
+    return value
+
+
+def _from_json(value: dict) -> dict:
+    (type_code, data), = value.items()
+    if type_code == 'B':
+        return {'B': base64.b64decode(data)}
+    if type_code == 'BS':
+        return {'BS': [base64.b64decode(v) for v in data]}
+    if type_code == 'L':
+        return {'L': [_from_json(v) for v in data]}
+    if type_code == 'M':
+        return {'M': {k: _from_json(v) for k, v in data.items()}}
+    return value
+
+
+def encode_item(item: dict) -> str:
+    return json.dumps({key: _to_json(_serializer.serialize(value)) for key, value in item.items()},
+                      separators=(',', ':'))
+
+
+def decode_item(text: str) -> dict:
+    return {key: _deserializer.deserialize(_from_json(value)) for key, value in json.loads(text).items()}
+
+
+def _column_value(value):
+    """Value stored in a key column, in a form SQLite orders the way DynamoDB does"""
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, Binary):
+        return bytes(value.value)
+    return value
+
+
+class _SQLiteStore(TableStore):
+    """One table: key and GSI key columns, the item JSON and its size"""
+
+    def __init__(self, database: 'SQLiteDatabase', definition: dict):
+        self._database = database
+        self.connection = database.connection
+        super().__init__(definition)
+        self.table = _quote(self.name)
+        key_columns = ', '.join(_quote(name) for name in self.key_names)
+        self.connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} ({self._column_definitions(self.key_names)}, "
+            f"\"$item\" TEXT NOT NULL, \"$size\" INTEGER NOT NULL, PRIMARY KEY ({key_columns})) WITHOUT ROWID"
+        )
+        for index in self.indexes.values():
+            self._create_index(index)
+
+    def _column_definitions(self, names: List[str]) -> str:
+        return ', '.join(f"{_quote(name)} {COLUMN_AFFINITY.get(self.attribute_type(name), '')}".rstrip()
+                         for name in names)
+
+    @property
+    def columns(self) -> List[str]:
+        """Key attributes, then every GSI key attribute"""
+        names = list(self.key_names)
+        for index in self.indexes.values():
+            names += [name for name in (index['hash'], index['range']) if name and name not in names]
+        return names
+
+    def transaction(self):
+        return self._database.transaction()
+
+    def count(self) -> int:
+        return self.connection.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def _create_index(self, index: dict) -> None:
+        existing = {row[1] for row in self.connection.execute(f"PRAGMA table_info({self.table})")}
+        added = [name for name in (index['hash'], index['range']) if name and name not in existing]
+        for name in added:
+            self.connection.execute(f"ALTER TABLE {self.table} ADD COLUMN {self._column_definitions([name])}")
+        if added:
+            # Backfill the new columns from the stored items
+            assignments = ', '.join(f"{_quote(name)} = ?" for name in added)
+            keys = ' AND '.join(f"{_quote(name)} = ?" for name in self.key_names)
+            rows = self.connection.execute(f"SELECT \"$item\" FROM {self.table}").fetchall()
+            for (text,) in rows:
+                item = decode_item(text)
+                self.connection.execute(
+                    f"UPDATE {self.table} SET {assignments} WHERE {keys}",
+                    [_column_value(item.get(name)) for name in added] +
+                    [_column_value(item[name]) for name in self.key_names]
+                )
+        index_keys = [name for name in (index['hash'], index['range']) if name]
+        columns = index_keys + [name for name in self.key_names if name not in index_keys]
+        sparse = ' AND '.join(f"{_quote(name)} IS NOT NULL" for name in index_keys)
+        self.connection.execute(
+            f"CREATE INDEX IF NOT EXISTS {_quote(self.name + '.' + index['definition']['IndexName'])} "
+            f"ON {self.table} ({', '.join(_quote(name) for name in columns)}) WHERE {sparse}"
+        )
+
+    def add_index(self, gsi: dict) -> None:
+        self._create_index(self._add_index_spec(gsi))
+
+    def drop_index(self, name: str) -> None:
+        if self.indexes.pop(name, None) is not None:
+            self.connection.execute(f"DROP INDEX IF EXISTS {_quote(self.name + '.' + name)}")
+
+    def get(self, key: tuple) -> Optional[dict]:
+        where = ' AND '.join(f"{_quote(name)} = ?" for name in self.key_names)
+        row = self.connection.execute(f"SELECT \"$item\" FROM {self.table} WHERE {where}",
+                                      [_column_value(value) for value in key]).fetchone()
+        return decode_item(row[0]) if row else None
+
+    def write(self, key: tuple, item: Optional[dict]) -> None:
+        if item is None:
+            where = ' AND '.join(f"{_quote(name)} = ?" for name in self.key_names)
+            self.connection.execute(f"DELETE FROM {self.table} WHERE {where}",
+                                    [_column_value(value) for value in key])
+            return
+        columns = self.columns
+        names = ', '.join(_quote(name) for name in columns)
+        placeholders = ', '.join('?' for _ in range(len(columns) + 2))
+        self.connection.execute(
+            f"INSERT OR REPLACE INTO {self.table} ({names}, \"$item\", \"$size\") VALUES ({placeholders})",
+            [_column_value(item.get(name)) for name in columns] + [encode_item(item), item_size(item)]
+        )
+
+    def _rows(self, where: List[str], params: list, order: List[str], start: Optional[list],
+              forward: bool) -> Iterator[Tuple[dict, int]]:
+        """Rows in order, fetched in chunks that each resume after the previous chunk's last row"""
+        columns = ', '.join(_quote(name) for name in order)
+        direction = 'ASC' if forward else 'DESC'
+        order_by = ', '.join(f"{_quote(name)} {direction}" for name in order)
+        while True:
+            clauses = list(where)
+            values = list(params)
+            if start is not None:
+                clauses.append(f"({columns}) {'>' if forward else '<'} ({', '.join('?' for _ in order)})")
+                values += start
+            where_sql = f" WHERE {' AND '.join(clauses)}" if clauses else ''
+            rows = self.connection.execute(
+                f"SELECT {columns}, \"$item\", \"$size\" FROM {self.table}{where_sql} "
+                f"ORDER BY {order_by} LIMIT {FETCH_ROWS}", values
+            ).fetchall()
+            for row in rows:
+                yield decode_item(row[-2]), row[-1]
+            if len(rows) < FETCH_ROWS:
+                return
+            start = list(rows[-1][:len(order)])
+
+    def scan(self, start: Optional[tuple]) -> Iterator[Tuple[dict, int]]:
+        start = [_column_value(value) for value in start] if start is not None else None
+        return self._rows([], [], self.key_names, start, True)
+
+    def scan_index(self, index_name: str, start: Optional[dict]) -> Iterator[Tuple[dict, int]]:
+        # Ordered like the GSI's partial index, so the scan reads it rather than the table
+        index = self.indexes[index_name]
+        index_keys = [name for name in (index['hash'], index['range']) if name]
+        order = index_keys + [name for name in self.key_names if name not in index_keys]
+        where = [f"{_quote(name)} IS NOT NULL" for name in index_keys]
+        if start is not None:
+            start = [_column_value(start.get(name)) for name in order]
+        return self._rows(where, [], order, start, True)
+
+    def query(self, index_name: Optional[str], hash_value, range_term: Optional[tuple],
+              start: Optional[dict], forward: bool) -> Iterator[Tuple[dict, int]]:
+        index = self.indexes.get(index_name) if index_name else None
+        hash_name, range_name = (index['hash'], index['range']) if index else (self.hash_key, self.range_key)
+        where = [f"{_quote(hash_name)} = ?"]
+        params = [_column_value(hash_value)]
+        if range_name:
+            column = _quote(range_name)
+            if index:
+                where.append(f"{column} IS NOT NULL")
+            if range_term is not None:
+                op, operands = range_term
+                operands = [_column_value(value) for value in operands]
+                if op == 'BETWEEN':
+                    where.append(f"{column} BETWEEN ? AND ?")
+                    params += operands
+                elif op == 'begins_with':
+                    # The >= bound lets the index seek; substr checks the prefix exactly
+                    where.append(f"{column} >= ? AND substr({column}, 1, ?) = ?")
+                    params += [operands[0], len(operands[0]), operands[0]]
+                else:
+                    where.append(f"{column} {op} ?")
+                    params += operands
+        order = ([range_name] if range_name else []) + [name for name in self.key_names if name != range_name]
+        if start is not None:
+            start = [_column_value(start.get(name)) for name in order]
+        return self._rows(where, params, order, start, forward)
+
+
+class SQLiteDatabase(Database):
+    """Storage engine keeping every table in one SQLite file"""
+
+    def __init__(self, path: str, table_definitions: Optional[Dict[str, dict]] = None):
+        super().__init__()
+        self.path = path
+        self.lock = threading.RLock()
+        self._depth = 0
+        self.connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        with self.transaction():
+            self.connection.execute(f"CREATE TABLE IF NOT EXISTS {_quote(DEFINITIONS_TABLE)} "
+                                    "(TableName TEXT PRIMARY KEY, Definition TEXT NOT NULL)")
+            for name, definition in self.connection.execute(
+                    f"SELECT TableName, Definition FROM {_quote(DEFINITIONS_TABLE)}").fetchall():
+                self._stores[name] = _SQLiteStore(self, json.loads(definition))
+            for definition in (table_definitions or {}).values():
+                store = self._stores.get(definition['TableName'])
+                if store is None:
+                    self.create_table(**definition)
+                    continue
+                # Indexes added to the models since the file was created
+                for gsi in definition.get('GlobalSecondaryIndexes', []):
+                    if gsi['IndexName'] not in store.indexes:
+                        store.add_index(gsi)
+                        self._schema_changed(store)
+
+    @contextmanager
+    def transaction(self):
+        """Serialize access to the connection; the outermost block is one SQLite transaction"""
+        with self.lock:
+            if self._depth == 0:
+                self.connection.execute("BEGIN IMMEDIATE")
+            self._depth += 1
+            try:
+                yield
+            except BaseException:
+                self._depth -= 1
+                if self._depth == 0:
+                    self.connection.execute("ROLLBACK")
+                raise
+            self._depth -= 1
+            if self._depth == 0:
+                self.connection.execute("COMMIT")
+
+    def _new_store(self, definition: dict) -> TableStore:
+        with self.transaction():
+            store = _SQLiteStore(self, definition)
+            self._schema_changed(store)
+        return store
+
+    def _schema_changed(self, store: TableStore) -> None:
+        self.connection.execute(f"INSERT OR REPLACE INTO {_quote(DEFINITIONS_TABLE)} VALUES (?, ?)",
+                                (store.name, json.dumps(store.definition())))
+
+    def _drop_table(self, name: str) -> None:
+        with self.transaction():
+            if self._stores.pop(name, None) is not None:
+                self.connection.execute(f"DROP TABLE IF EXISTS {_quote(name)}")
+                self.connection.execute(f"DELETE FROM {_quote(DEFINITIONS_TABLE)} WHERE TableName = ?", (name,))
+
+    def close(self) -> None:
+        with self.lock:
+            self.connection.close()
@@ -0,0 +1,1076 @@
+"""
+Storage backends behind database.get_dynamodb().
+
+The application talks to storage through the part of the boto3 DynamoDB
+resource API it uses: Table(name) with get_item, put_item, update_item,
+delete_item, query, scan and batch_writer, plus batch_get_item and
+batch_write_item on the database. Three backends provide it:
+
+- dynamodb: the boto3 resource itself (DynamoDB, or DynamoDB Local)
+- memory: MemoryDatabase, a thread-safe in-process engine created from
+  models.DYNAMODB_TABLES. Benchmarks and load tests use it to run the
+  production code paths with no network.
+- sqlite: SQLiteDatabase in sqlite_storage.py, for offline deployments
+
+The local engines share Database and Table below. They enforce the key
+schemas, keep every GSI (sparse, like DynamoDB's), evaluate condition,
+filter, key condition, projection and update expressions (strings or boto3
+Key/Attr objects), store numbers as Decimal, page results at 1 MB and raise
+the same ClientError codes. An engine only supplies a TableStore holding
+the items.
+
+STORAGE_BACKEND selects the backend at startup (see database.py).
+"""
+import copy
+import re
+import threading
+import zlib
+from bisect import bisect_left, bisect_right, insort
+from decimal import Decimal
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from boto3.dynamodb.conditions import ConditionBase, ConditionExpressionBuilder
+from boto3.dynamodb.types import Binary, TypeDeserializer, TypeSerializer
+from botocore.exceptions import ClientError
+
+# DynamoDB stops a Query or Scan page after this much data
+PAGE_SIZE_BYTES = 1024 * 1024
+BATCH_GET_MAX_KEYS = 100
+BATCH_WRITE_MAX_ITEMS = 25
+
+_serializer = TypeSerializer()
+_deserializer = TypeDeserializer()
+
+
+def client_error(code: str, message: str, operation: str, **extra) -> ClientError:
+    """ClientError shaped like the ones botocore raises for DynamoDB"""
+    response = {'Error': {'Code': code, 'Message': message}, 'ResponseMetadata': {'HTTPStatusCode': 400}}
+    response.update(extra)
+    return ClientError(response, operation)
+
+
+def normalize_value(value):
+    """Store a value the way DynamoDB returns it (numbers become Decimal; floats are rejected)"""
+    return _deserializer.deserialize(_serializer.serialize(value))
+
+
+def copy_item(item: dict) -> dict:
+    return {key: value if isinstance(value, (str, Decimal, bool, int, bytes, Binary)) or value is None
+            else copy.deepcopy(value) for key, value in item.items()}
+
+
+def _sort_value(value):
+    return value.value if isinstance(value, Binary) else value
+
+
+def _type_code(value) -> Optional[str]:
+    try:
+        return next(iter(_serializer.serialize(value)))
+    except TypeError:
+        return None
+
+
+# Expressions --------------------------------------------------------------
+
+_TOKEN = re.compile(r"\s*(?:(#[A-Za-z0-9_]+)|(:[A-Za-z0-9_]+)|([A-Za-z_][A-Za-z0-9_]*)|(\d+)|(<>|<=|>=|[=<>(),.\[\]+-]))")
+_COMPARATORS = {'=', '<>', '<', '<=', '>', '>='}
+_MISSING = object()
+
+
+class _Parser:
+    """Recursive-descent parser for condition and update expressions"""
+
+    def __init__(self, expression: str, names: dict, values: dict, operation: str):
+        self.operation = operation
+        self.names = names or {}
+        self.values = values or {}
+        self.tokens = []
+        position = 0
+        expression = expression.rstrip()
+        while position < len(expression):
+            match = _TOKEN.match(expression, position)
+            if not match:
+                raise self.error(f"Invalid syntax in expression: {expression[position:]!r}")
+            position = match.end()
+            kind = match.lastindex
+            self.tokens.append((('name', 'value', 'word', 'number', 'op')[kind - 1], match.group(kind)))
+        self.position = 0
+
+    def error(self, message: str) -> ClientError:
+        return client_error('ValidationException', message, self.operation)
+
+    def peek(self, offset: int = 0):
+        index = self.position + offset
+        return self.tokens[index] if index < len(self.tokens) else (None, None)
+
+    def take(self):
+        token = self.peek()
+        if token[0] is None:
+            raise self.error("Unexpected end of expression")
+        self.position += 1
+        return token
+
+    def keyword(self, *words) -> Optional[str]:
+        kind, text = self.peek()
+        if kind == 'word' and text.upper() in words:
+            self.position += 1
+            return text.upper()
+        return None
+
+    def expect(self, op: str) -> None:
+        kind, text = self.take()
+        if kind != 'op' or text != op:
+            raise self.error(f"Expected {op!r} but found {text!r}")
+
+    def done(self) -> bool:
+        return self.position >= len(self.tokens)
+
+    # Operands
+    def path(self) -> tuple:
+        parts = [self.name_part()]
+        while True:
+            kind, text = self.peek()
+            if kind == 'op' and text == '.':
+                self.position += 1
+                parts.append(self.name_part())
+            elif kind == 'op' and text == '[':
+                self.position += 1
+                kind, number = self.take()
+                if kind != 'number':
+                    raise self.error("List index must be a number")
+                self.expect(']')
+                parts.append(int(number))
+            else:
+                return tuple(parts)
+
+    def name_part(self) -> str:
+        kind, text = self.take()
+        if kind == 'name':
+            if text not in self.names:
+                raise self.error(f"An expression attribute name used in the document path is not defined; attribute name: {text}")
+            return self.names[text]
+        if kind == 'word':
+            return text
+        raise self.error(f"Expected an attribute name but found {text!r}")
+
+    def value(self):
+        kind, text = self.take()
+        if text not in self.values:
+            raise self.error(f"An expression attribute value used in expression is not defined; attribute value: {text}")
+        return self.values[text]
+
+    def operand(self) -> Callable:
+        kind, text = self.peek()
+        if kind == 'value':
+            value = self.value()
+            return lambda item: value
+        if kind == 'word' and text.lower() == 'size' and self.peek(1) == ('op', '('):
+            self.position += 2
+            path = self.path()
+            self.expect(')')
+
+            def size(item):
+                found = get_path(item, path)
+                if found is _MISSING:
+                    return _MISSING
+                return Decimal(len(found.value if isinstance(found, Binary) else found))
+            return size
+        path = self.path()
+        return lambda item: get_path(item, path)
+
+    # Conditions
+    def condition(self) -> Callable:
+        left = self.conjunction()
+        while self.keyword('OR'):
+            right = self.conjunction()
+            left = (lambda a, b: lambda item: a(item) or b(item))(left, right)
+        return left
+
+    def conjunction(self) -> Callable:
+        left = self.negation()
+        while self.keyword('AND'):
+            right = self.negation()
+            left = (lambda a, b: lambda item: a(item) and b(item))(left, right)
+        return left
+
+    def negation(self) -> Callable:
+        if self.keyword('NOT'):
+            inner = self.negation()
+            return lambda item: not inner(item)
+        return self.primary()
+
+    def primary(self) -> Callable:
+        kind, text = self.peek()
+        if (kind, text) == ('op', '('):
+            self.position += 1
+            inner = self.condition()
+            self.expect(')')
+            return inner
+        if kind == 'word' and self.peek(1) == ('op', '('):
+            function = text.lower()
+            if function in ('attribute_exists', 'attribute_not_exists'):
+                self.position += 2
+                path = self.path()
+                self.expect(')')
+                exists = function == 'attribute_exists'
+                return lambda item: (get_path(item, path) is not _MISSING) == exists
+            if function in ('begins_with', 'contains', 'attribute_type'):
+                self.position += 2
+                path = self.path()
+                self.expect(',')
+                operand = self.operand()
+                self.expect(')')
+                test = {'begins_with': _begins_with, 'contains': _contains, 'attribute_type': _attribute_type}[function]
+                return lambda item: test(get_path(item, path), operand(item))
+        left = self.operand()
+        if self.keyword('BETWEEN'):
+            low = self.operand()
+            if not self.keyword('AND'):
+                raise self.error("BETWEEN requires AND")
+            high = self.operand()
+            return lambda item: _compare('>=', left(item), low(item)) and _compare('<=', left(item), high(item))
+        if self.keyword('IN'):
+            self.expect('(')
+            options = [self.operand()]
+            while self.peek() == ('op', ','):
+                self.position += 1
+                options.append(self.operand())
+            self.expect(')')
+            return lambda item: any(_compare('=', left(item), option(item)) for option in options)
+        kind, op = self.take()
+        if kind != 'op' or op not in _COMPARATORS:
+            raise self.error(f"Expected a comparison but found {op!r}")
+        right = self.operand()
+        return lambda item: _compare(op, left(item), right(item))
+
+    # Updates
+    def update_value(self) -> Callable:
+        left = self.update_operand()
+        kind, text = self.peek()
+        if kind == 'op' and text in '+-':
+            self.position += 1
+            right = self.update_operand()
+            sign = 1 if text == '+' else -1
+
+            def arithmetic(item):
+                a, b = left(item), right(item)
+                if not isinstance(a, Decimal) or not isinstance(b, Decimal):
+                    raise self.error("An operand in the update expression has an incorrect data type")
+                return a + sign * b
+            return arithmetic
+        return left
+
+    def update_operand(self) -> Callable:
+        kind, text = self.peek()
+        if kind == 'word' and self.peek(1) == ('op', '(') and text.lower() in ('if_not_exists', 'list_append'):
+            self.position += 2
+            if text.lower() == 'if_not_exists':
+                path = self.path()
+                self.expect(',')
+                fallback = self.update_value()
+                self.expect(')')
+
+                def if_not_exists(item):
+                    found = get_path(item, path)
+                    return fallback(item) if found is _MISSING else found
+                return if_not_exists
+            first = self.update_value()
+            self.expect(',')
+            second = self.update_value()
+            self.expect(')')
+            return lambda item: list(first(item)) + list(second(item))
+        operand = self.operand()
+
+        def resolved(item):
+            found = operand(item)
+            if found is _MISSING:
+                raise self.error("The provided expression refers to an attribute that does not exist in the item")
+            return found
+        return resolved
+
+    def update(self) -> List[tuple]:
+        """[(action, path, value function)] in expression order"""
+        actions = []
+        while not self.done():
+            clause = self.keyword('SET', 'REMOVE', 'ADD', 'DELETE')
+            if clause is None:
+                raise self.error(f"Invalid UpdateExpression: unexpected {self.peek()[1]!r}")
+            while True:
+                path = self.path()
+                if clause == 'SET':
+                    self.expect('=')
+                    actions.append(('SET', path, self.update_value()))
+                elif clause == 'REMOVE':
+                    actions.append(('REMOVE', path, None))
+                else:
+                    value = self.value()
+                    actions.append((clause, path, lambda item, value=value: value))
+                if self.peek() != ('op', ','):
+                    break
+                self.position += 1
+        return actions
+
+    def key_condition(self) -> Dict[str, tuple]:
+        """{attribute: (operator, operands)} for a key condition: hash = :v [AND range condition]"""
+        terms = {}
+        depth = 0
+        while True:
+            while self.peek() == ('op', '('):
+                self.position += 1
+                depth += 1
+            kind, text = self.peek()
+            if kind == 'word' and text.lower() == 'begins_with' and self.peek(1) == ('op', '('):
+                self.position += 2
+                path = self.path()
+                self.expect(',')
+                term = ('begins_with', (self.value(),))
+                self.expect(')')
+            else:
+                path = self.path()
+                if self.keyword('BETWEEN'):
+                    low = self.value()
+                    if not self.keyword('AND'):
+                        raise self.error("BETWEEN requires AND")
+                    term = ('BETWEEN', (low, self.value()))
+                else:
+                    kind, op = self.take()
+                    if kind != 'op' or op not in _COMPARATORS or op == '<>':
+                        raise self.error(f"Unsupported operator in KeyConditionExpression: {op!r}")
+                    term = (op, (self.value(),))
+            if len(path) != 1 or path[0] in terms:
+                raise self.error("Invalid KeyConditionExpression")
+            terms[path[0]] = term
+            while depth and self.peek() == ('op', ')'):
+                self.position += 1
+                depth -= 1
+            if not self.keyword('AND'):
+                break
+        if depth or not self.done():
+            raise self.error("Invalid KeyConditionExpression")
+        return terms
+
+
+def get_path(item, path: tuple):
+    current = item
+    for part in path:
+        if isinstance(part, int):
+            if not isinstance(current, list) or part >= len(current):
+                return _MISSING
+        elif not isinstance(current, dict) or part not in current:
+            return _MISSING
+        current = current[part]
+    return current
+
+
+def _comparable(a, b) -> bool:
+    if a is _MISSING or b is _MISSING:
+        return False
+    if isinstance(a, bool) or isinstance(b, bool):
+        return isinstance(a, bool) and isinstance(b, bool)
+    for kind in (str, Decimal, Binary):
+        if isinstance(a, kind):
+            return isinstance(b, kind)
+    return type(a) is type(b)
+
+
+def _compare(op: str, a, b) -> bool:
+    if op in ('=', '<>'):
+        equal = _comparable(a, b) and a == b
+        return equal if op == '=' else not equal
+    if not _comparable(a, b) or not isinstance(a, (str, Decimal, Binary)):
+        return False
+    a, b = _sort_value(a), _sort_value(b)
+    return {'<': a < b, '<=': a <= b, '>': a > b, '>=': a >= b}[op]
+
+
+def _begins_with(value, prefix) -> bool:
+    if isinstance(value, str) and isinstance(prefix, str):
+        return value.startswith(prefix)
+    if isinstance(value, Binary) and isinstance(prefix, Binary):
+        return value.value.startswith(prefix.value)
+    return False
+
+
+def _contains(value, operand) -> bool:
+    if isinstance(value, str):
+        return isinstance(operand, str) and operand in value
+    if isinstance(value, (set, list)):
+        return operand in value
+    return False
+
+
+def _attribute_type(value, type_code) -> bool:
+    return value is not _MISSING and _type_code(value) == type_code
+
+
+def key_matches(value, term: tuple) -> bool:
+    """Whether a range key value satisfies a key condition term"""
+    op, operands = term
+    if op == 'begins_with':
+        return _begins_with(value, operands[0])
+    if op == 'BETWEEN':
+        return _compare('>=', value, operands[0]) and _compare('<=', value, operands[1])
+    return _compare(op, value, operands[0])
+
+
+class _Request:
+    """Expression attribute names and values for one request, with boto3 conditions expanded"""
+
+    def __init__(self, operation: str, kwargs: dict):
+        self.operation = operation
+        self.names = dict(kwargs.get('ExpressionAttributeNames') or {})
+        self.values = {key: normalize_value(value)
+                       for key, value in (kwargs.get('ExpressionAttributeValues') or {}).items()}
+        self._builder = ConditionExpressionBuilder()
+
+    def expression(self, expression, is_key_condition: bool = False) -> str:
+        if isinstance(expression, ConditionBase):
+            built = self._builder.build_expression(expression, is_key_condition=is_key_condition)
+            self.names.update(built.attribute_name_placeholders)
+            self.values.update({key: normalize_value(value)
+                                for key, value in built.attribute_value_placeholders.items()})
+            return built.condition_expression
+        return expression
+
+    def parser(self, expression) -> _Parser:
+        return _Parser(self.expression(expression), self.names, self.values, self.operation)
+
+    def condition(self, expression) -> Optional[Callable]:
+        if expression is None:
+            return None
+        parser = self.parser(expression)
+        condition = parser.condition()
+        if not parser.done():
+            raise parser.error(f"Invalid syntax near {parser.peek()[1]!r}")
+        return condition
+
+    def projection(self, expression) -> Optional[List[tuple]]:
+        if not expression:
+            return None
+        parser = self.parser(expression)
+        paths = [parser.path()]
+        while not parser.done():
+            parser.expect(',')
+            paths.append(parser.path())
+        return paths
+
+
+def project(item: dict, paths: Optional[List[tuple]]) -> dict:
+    if paths is None:
+        return copy_item(item)
+    projected = {}
+    for path in paths:
+        # List elements are returned with their whole top-level attribute
+        if any(isinstance(part, int) for part in path):
+            path = path[:1]
+        value = get_path(item, path)
+        if value is _MISSING:
+            continue
+        target = projected
+        for part in path[:-1]:
+            target = target.setdefault(part, {})
+        target[path[-1]] = copy.deepcopy(value)
+    return projected
+
+
+def _set_path(item: dict, path: tuple, value, operation: str) -> None:
+    target = get_path(item, path[:-1]) if len(path) > 1 else item
+    last = path[-1]
+    if isinstance(last, int) and isinstance(target, list):
+        if last < len(target):
+            target[last] = value
+        else:
+            target.append(value)
+    elif isinstance(last, str) and isinstance(target, dict):
+        target[last] = value
+    else:
+        raise client_error('ValidationException',
+                           'The document path provided in the update expression is invalid for update', operation)
+
+
+def _remove_path(item: dict, path: tuple) -> None:
+    target = get_path(item, path[:-1]) if len(path) > 1 else item
+    last = path[-1]
+    if isinstance(last, int) and isinstance(target, list) and last < len(target):
+        del target[last]
+    elif isinstance(target, dict):
+        target.pop(last, None)
+
+
+def item_size(item: dict) -> int:
+    return sum(len(key) + len(str(value)) for key, value in item.items())
+
+
+# Tables -------------------------------------------------------------------
+
+class TableStore:
+    """Key schema and GSIs of one table; engines subclass it to hold the items.
+
+    An engine implements get, write, scan, scan_index, query, count,
+    add_index, drop_index and transaction. scan, scan_index and query yield
+    (item, size) pairs in key order and are consumed while transaction() is
+    held.
+    """
+
+    def __init__(self, definition: dict):
+        self.name = definition['TableName']
+        self.key_schema = list(definition['KeySchema'])
+        self.attribute_definitions = list(definition.get('AttributeDefinitions', []))
+        self.hash_key = next(k['AttributeName'] for k in self.key_schema if k['KeyType'] == 'HASH')
+        self.range_key = next((k['AttributeName'] for k in self.key_schema if k['KeyType'] == 'RANGE'), None)
+        self.indexes: Dict[str, dict] = {}
+        for gsi in definition.get('GlobalSecondaryIndexes', []):
+            self._add_index_spec(gsi)
+
+    @property
+    def key_names(self) -> List[str]:
+        return [self.hash_key] + ([self.range_key] if self.range_key else [])
+
+    def definition(self) -> dict:
+        """The table's CreateTable parameters"""
+        definition = {'TableName': self.name, 'KeySchema': self.key_schema,
+                      'AttributeDefinitions': self.attribute_definitions}
+        if self.indexes:
+            definition['GlobalSecondaryIndexes'] = [
+                {key: index['definition'][key] for key in ('IndexName', 'KeySchema', 'Projection')}
+                for index in self.indexes.values()
+            ]
+        return definition
+
+    def attribute_type(self, name: str) -> Optional[str]:
+        return next((a['AttributeType'] for a in self.attribute_definitions if a['AttributeName'] == name), None)
+
+    def _add_index_spec(self, gsi: dict) -> dict:
+        for definition in gsi.get('AttributeDefinitions', []):
+            if definition not in self.attribute_definitions:
+                self.attribute_definitions.append(definition)
+        index = {
+            'definition': {'IndexName': gsi['IndexName'], 'KeySchema': gsi['KeySchema'],
+                           'Projection': gsi.get('Projection', {'ProjectionType': 'ALL'}), 'IndexStatus': 'ACTIVE'},
+            'hash': next(k['AttributeName'] for k in gsi['KeySchema'] if k['KeyType'] == 'HASH'),
+            'range': next((k['AttributeName'] for k in gsi['KeySchema'] if k['KeyType'] == 'RANGE'), None),
+        }
+        self.indexes[gsi['IndexName']] = index
+        return index
+
+    def key_of(self, item: dict, operation: str) -> tuple:
+        key = []
+        for name in self.key_names:
+            value = item.get(name)
+            if value is None:
+                raise client_error('ValidationException',
+                                   'The provided key element does not match the schema', operation)
+            if _type_code(value) != self.attribute_type(name):
+                raise client_error('ValidationException',
+                                   f"One or more parameter values were invalid: Type mismatch for key {name}",
+                                   operation)
+            key.append(_sort_value(value))
+        return tuple(key)
+
+    def validate_indexed(self, item: dict, operation: str) -> None:
+        for index in self.indexes.values():
+            for name in filter(None, (index['hash'], index['range'])):
+                if name in item and _type_code(item[name]) != self.attribute_type(name):
+                    raise client_error('ValidationException',
+                                       f"One or more parameter values were invalid: Type mismatch for Index Key {name}",
+                                       operation)
+
+
+class _MemoryStore(TableStore):
+    """Items in a dict, with sorted key lists standing in for the table and index B-trees"""
+
+    def __init__(self, definition: dict):
+        self.lock = threading.RLock()
+        self.items: Dict[tuple, dict] = {}
+        self.sizes: Dict[tuple, int] = {}
+        # Every key in sorted order (scan order) and, with a range key, per partition (query order)
+        self.keys: List[tuple] = []
+        self.partitions: Dict[object, List[tuple]] = {}
+        super().__init__(definition)
+
+    def transaction(self):
+        return self.lock
+
+    def count(self) -> int:
+        return len(self.items)
+
+    def _add_index_spec(self, gsi: dict) -> dict:
+        index = super()._add_index_spec(gsi)
+        index['partitions'] = {}
+        # Every entry as (hash, range, key), in index scan order
+        index['entries'] = []
+        for key, item in self.items.items():
+            self._index_add(index, key, item)
+        return index
+
+    def add_index(self, gsi: dict) -> None:
+        self._add_index_spec(gsi)
+
+    def drop_index(self, name: str) -> None:
+        self.indexes.pop(name, None)
+
+    def _index_entry(self, index: dict, key: tuple, item: dict) -> Optional[tuple]:
+        hash_value = item.get(index['hash'])
+        range_value = item.get(index['range']) if index['range'] else ''
+        # Sparse: items without the index keys are not in the index
+        if hash_value is None or range_value is None:
+            return None
+        return _sort_value(hash_value), (_sort_value(range_value), key)
+
+    def _index_add(self, index: dict, key: tuple, item: dict) -> None:
+        entry = self._index_entry(index, key, item)
+        if entry:
+            insort(index['partitions'].setdefault(entry[0], []), entry[1])
+            insort(index['entries'], (entry[0], *entry[1]))
+
+    def _index_remove(self, index: dict, key: tuple, item: dict) -> None:
+        entry = self._index_entry(index, key, item)
+        if entry:
+            partition = index['partitions'][entry[0]]
+            del partition[bisect_left(partition, entry[1])]
+            if not partition:
+                del index['partitions'][entry[0]]
+            del index['entries'][bisect_left(index['entries'], (entry[0], *entry[1]))]
+
+    def get(self, key: tuple) -> Optional[dict]:
+        return self.items.get(key)
+
+    def write(self, key: tuple, item: Optional[dict]) -> None:
+        """Replace (or with None, delete) the item at key, keeping every index in step"""
+        old = self.items.get(key)
+        if old is not None:
+            for index in self.indexes.values():
+                self._index_remove(index, key, old)
+        if item is None:
+            if old is not None:
+                del self.items[key]
+                del self.sizes[key]
+                del self.keys[bisect_left(self.keys, key)]
+                if self.range_key:
+                    partition = self.partitions[key[0]]
+                    del partition[bisect_left(partition, key)]
+                    if not partition:
+                        del self.partitions[key[0]]
+            return
+        if old is None:
+            insort(self.keys, key)
+            if self.range_key:
+                insort(self.partitions.setdefault(key[0], []), key)
+        self.items[key] = item
+        self.sizes[key] = item_size(item)
+        for index in self.indexes.values():
+            self._index_add(index, key, item)
+
+    def scan(self, start: Optional[tuple]) -> Iterator[Tuple[dict, int]]:
+        position = bisect_right(self.keys, start) if start is not None else 0
+        while position < len(self.keys):
+            key = self.keys[position]
+            yield self.items[key], self.sizes[key]
+            position += 1
+
+    def scan_index(self, index_name: str, start: Optional[dict]) -> Iterator[Tuple[dict, int]]:
+        index = self.indexes[index_name]
+        entries = index['entries']
+        position = 0
+        if start is not None:
+            position = bisect_right(entries, (
+                _sort_value(start[index['hash']]),
+                _sort_value(start[index['range']]) if index['range'] else '',
+                self.key_of(start, 'Scan')
+            ))
+        while position < len(entries):
+            key = entries[position][2]
+            yield self.items[key], self.sizes[key]
+            position += 1
+
+    def query(self, index_name: Optional[str], hash_value, range_term: Optional[tuple],
+              start: Optional[dict], forward: bool) -> Iterator[Tuple[dict, int]]:
+        index = self.indexes.get(index_name) if index_name else None
+        hash_value = _sort_value(hash_value)
+        if index:
+            range_name = index['range']
+            positions = index['partitions'].get(hash_value, [])
+            keys = [key for _, key in positions]
+        elif self.range_key:
+            range_name = self.range_key
+            positions = keys = self.partitions.get(hash_value, [])
+        else:
+            range_name = None
+            key = (hash_value,)
+            positions = keys = [key] if key in self.items else []
+
+        if start is not None:
+            table_key = self.key_of(start, 'Query')
+            position = ((_sort_value(start[range_name]) if range_name else '', table_key)
+                        if index else table_key)
+            if forward:
+                keys = keys[bisect_right(positions, position):]
+            else:
+                keys = keys[:bisect_left(positions, position)]
+        for key in (keys if forward else reversed(keys)):
+            item = self.items[key]
+            if range_term is None or key_matches(item.get(range_name, _MISSING), range_term):
+                yield item, self.sizes[key]
+
+
+class Table:
+    """boto3 Table-compatible handle on a table of a storage engine"""
+
+    def __init__(self, database: 'Database', name: str):
+        self._database = database
+        self.name = name
+        self.table_name = name
+
+    def _store(self, operation: str) -> TableStore:
+        store = self._database._stores.get(self.name)
+        if store is None:
+            raise client_error('ResourceNotFoundException', 'Requested resource not found', operation)
+        return store
+
+    # Description
+    @property
+    def key_schema(self) -> List[dict]:
+        return self._store('DescribeTable').key_schema
+
+    @property
+    def attribute_definitions(self) -> List[dict]:
+        return self._store('DescribeTable').attribute_definitions
+
+    @property
+    def global_secondary_indexes(self) -> Optional[List[dict]]:
+        indexes = self._store('DescribeTable').indexes
+        return [dict(index['definition']) for index in indexes.values()] or None
+
+    @property
+    def table_status(self) -> str:
+        self._store('DescribeTable')
+        return 'ACTIVE'
+
+    @property
+    def item_count(self) -> int:
+        store = self._store('DescribeTable')
+        with store.transaction():
+            return store.count()
+
+    def load(self) -> None:
+        self._store('DescribeTable')
+
+    reload = load
+
+    def wait_until_exists(self) -> None:
+        self._store('DescribeTable')
+
+    def update(self, GlobalSecondaryIndexUpdates=(), AttributeDefinitions=(), **kwargs) -> dict:
+        store = self._store('UpdateTable')
+        with store.transaction():
+            for definition in AttributeDefinitions:
+                if definition not in store.attribute_definitions:
+                    store.attribute_definitions.append(definition)
+            for change in GlobalSecondaryIndexUpdates:
+                if 'Create' in change:
+                    store.add_index(change['Create'])
+                elif 'Delete' in change:
+                    store.drop_index(change['Delete']['IndexName'])
+            self._database._schema_changed(store)
+        return {}
+
+    def delete(self) -> dict:
+        self._database._drop_table(self.name)
+        return {}
+
+    # Items
+    def _check(self, request: _Request, condition_expression, existing: Optional[dict], kwargs: dict) -> None:
+        condition = request.condition(condition_expression)
+        if condition is not None and not condition(existing or {}):
+            extra = {}
+            if existing is not None and kwargs.get('ReturnValuesOnConditionCheckFailure') == 'ALL_OLD':
+                extra['Item'] = {key: _serializer.serialize(value) for key, value in existing.items()}
+            raise client_error('ConditionalCheckFailedException', 'The conditional request failed',
+                               request.operation, **extra)
+
+    def get_item(self, Key: dict, **kwargs) -> dict:
+        store = self._store('GetItem')
+        request = _Request('GetItem', kwargs)
+        key = store.key_of({name: normalize_value(value) for name, value in Key.items()}, 'GetItem')
+        paths = request.projection(kwargs.get('ProjectionExpression'))
+        with store.transaction():
+            item = store.get(key)
+        return {'Item': project(item, paths)} if item is not None else {}
+
+    def put_item(self, Item: dict, **kwargs) -> dict:
+        store = self._store('PutItem')
+        request = _Request('PutItem', kwargs)
+        item = {name: normalize_value(value) for name, value in Item.items()}
+        key = store.key_of(item, 'PutItem')
+        store.validate_indexed(item, 'PutItem')
+        with store.transaction():
+            existing = store.get(key) if kwargs.get('ConditionExpression') or kwargs.get('ReturnValues') else None
+            self._check(request, kwargs.get('ConditionExpression'), existing, kwargs)
+            store.write(key, item)
+        if kwargs.get('ReturnValues') == 'ALL_OLD' and existing is not None:
+            return {'Attributes': copy_item(existing)}
+        return {}
+
+    def delete_item(self, Key: dict, **kwargs) -> dict:
+        store = self._store('DeleteItem')
+        request = _Request('DeleteItem', kwargs)
+        key = store.key_of({name: normalize_value(value) for name, value in Key.items()}, 'DeleteItem')
+        with store.transaction():
+            existing = store.get(key)
+            self._check(request, kwargs.get('ConditionExpression'), existing, kwargs)
+            if existing is not None:
+                store.write(key, None)
+        if kwargs.get('ReturnValues') == 'ALL_OLD' and existing is not None:
+            return {'Attributes': existing}
+        return {}
+
+    def update_item(self, Key: dict, **kwargs) -> dict:
+        operation = 'UpdateItem'
+        store = self._store(operation)
+        request = _Request(operation, kwargs)
+        key_item = {name: normalize_value(value) for name, value in Key.items()}
+        key = store.key_of(key_item, operation)
+        actions = request.parser(kwargs['UpdateExpression']).update() if kwargs.get('UpdateExpression') else []
+        with store.transaction():
+            existing = store.get(key)
+            self._check(request, kwargs.get('ConditionExpression'), existing, kwargs)
+            old = existing or dict(key_item)
+            new = copy.deepcopy(old)
+            # Values are computed from the item as it was before the update
+            values = [(action, path, compute(old) if compute else None) for action, path, compute in actions]
+            for action, path, value in values:
+                if path[0] in store.key_names:
+                    raise client_error('ValidationException',
+                                       f"Cannot update attribute {path[0]}. This attribute is part of the key",
+                                       operation)
+                if action == 'SET':
+                    _set_path(new, path, value, operation)
+                elif action == 'REMOVE':
+                    _remove_path(new, path)
+                else:
+                    current = get_path(new, path)
+                    if action == 'ADD' and isinstance(value, Decimal):
+                        current = Decimal(0) if current is _MISSING else current
+                        if not isinstance(current, Decimal):
+                            raise client_error('ValidationException',
+                                               'An operand in the update expression has an incorrect data type',
+                                               operation)
+                        _set_path(new, path, current + value, operation)
+                    elif isinstance(value, set):
+                        current = set() if current is _MISSING else current
+                        if not isinstance(current, set):
+                            raise client_error('ValidationException',
+                                               'An operand in the update expression has an incorrect data type',
+                                               operation)
+                        result = current | value if action == 'ADD' else current - value
+                        if result:
+                            _set_path(new, path, result, operation)
+                        else:
+                            _remove_path(new, path)
+                    else:
+                        raise client_error('ValidationException',
+                                           f"Incorrect operand type for operator or function; operator: {action}",
+                                           operation)
+            store.validate_indexed(new, operation)
+            store.write(key, new)
+
+        return_values = kwargs.get('ReturnValues', 'NONE')
+        if return_values == 'ALL_NEW':
+            return {'Attributes': copy_item(new)}
+        if return_values == 'ALL_OLD':
+            return {'Attributes': copy_item(existing)} if existing is not None else {}
+        if return_values in ('UPDATED_OLD', 'UPDATED_NEW'):
+            source = old if return_values == 'UPDATED_OLD' else new
+            names = {path[0] for _, path, _ in actions}
+            attributes = {name: copy.deepcopy(source[name]) for name in names if name in source}
+            return {'Attributes': attributes} if attributes else {}
+        return {}
+
+    # Reads
+    def _page(self, rows: Iterator[Tuple[dict, int]], request: _Request, kwargs: dict,
+              last_key: Callable[[dict], dict]) -> dict:
+        condition = request.condition(kwargs.get('FilterExpression'))
+        paths = request.projection(kwargs.get('ProjectionExpression'))
+        limit = kwargs.get('Limit')
+        count_only = kwargs.get('Select') == 'COUNT'
+        items = []
+        scanned = 0
+        size = 0
+        stopped_at = None
+        rows = iter(rows)
+        for item, item_bytes in rows:
+            scanned += 1
+            size += item_bytes
+            if condition is None or condition(item):
+                items.append(None if count_only else project(item, paths))
+            if (limit is not None and scanned >= limit) or size >= PAGE_SIZE_BYTES:
+                stopped_at = item
+                break
+        response = {'Count': len(items), 'ScannedCount': scanned}
+        if not count_only:
+            response['Items'] = items
+        # A page that ends exactly at the last item has no LastEvaluatedKey
+        if stopped_at is not None and next(rows, None) is not None:
+            response['LastEvaluatedKey'] = last_key(stopped_at)
+        return response
+
+    def _key_attributes(self, store: TableStore, item: dict, index: Optional[dict] = None) -> dict:
+        names = store.key_names + ([name for name in (index['hash'], index['range']) if name] if index else [])
+        return {name: copy.deepcopy(item[name]) for name in names}
+
+    def scan(self, **kwargs) -> dict:
+        operation = 'Scan'
+        store = self._store(operation)
+        request = _Request(operation, kwargs)
+        segment = kwargs.get('Segment')
+        total_segments = kwargs.get('TotalSegments')
+        index_name = kwargs.get('IndexName')
+        if index_name and index_name not in store.indexes:
+            raise client_error('ValidationException',
+                               f"The table does not have the specified index: {index_name}", operation)
+        index = store.indexes.get(index_name) if index_name else None
+        start = None
+        if kwargs.get('ExclusiveStartKey'):
+            start = {k: normalize_value(v) for k, v in kwargs['ExclusiveStartKey'].items()}
+        with store.transaction():
+            # A sparse index scan only reads the items that carry the index keys
+            rows = store.scan_index(index_name, start) if index else \
+                store.scan(store.key_of(start, operation) if start else None)
+            if total_segments:
+                rows = (row for row in rows
+                        if zlib.crc32(repr(_sort_value(row[0][store.hash_key])).encode()) % total_segments == segment)
+            return self._page(rows, request, kwargs, lambda item: self._key_attributes(store, item, index))
+
+    def query(self, **kwargs) -> dict:
+        operation = 'Query'
+        store = self._store(operation)
+        request = _Request(operation, kwargs)
+        index_name = kwargs.get('IndexName')
+        if index_name and index_name not in store.indexes:
+            raise client_error('ValidationException',
+                               f"The table does not have the specified index: {index_name}", operation)
+        index = store.indexes.get(index_name) if index_name else None
+        hash_name, range_name = (index['hash'], index['range']) if index else (store.hash_key, store.range_key)
+
+        terms = _Parser(request.expression(kwargs['KeyConditionExpression'], is_key_condition=True),
+                        request.names, request.values, operation).key_condition()
+        hash_term = terms.pop(hash_name, None)
+        if hash_term is None or hash_term[0] != '=':
+            raise client_error('ValidationException',
+                               f"Query condition missed key schema element: {hash_name}", operation)
+        range_term = terms.pop(range_name, None) if range_name else None
+        if terms:
+            raise client_error('ValidationException',
+                               f"Query key condition not supported: {', '.join(terms)} is not a key attribute",
+                               operation)
+
+        start = None
+        if kwargs.get('ExclusiveStartKey'):
+            start = {k: normalize_value(v) for k, v in kwargs['ExclusiveStartKey'].items()}
+        with store.transaction():
+            rows = store.query(index_name, hash_term[1][0], range_term, start, kwargs.get('ScanIndexForward', True))
+            return self._page(rows, request, kwargs, lambda item: self._key_attributes(store, item, index))
+
+    def batch_writer(self, overwrite_by_pkeys=None) -> 'BatchWriter':
+        return BatchWriter(self)
+
+
+class BatchWriter:
+    """Context manager matching boto3's BatchWriter; writes are applied in one transaction on exit"""
+
+    def __init__(self, table: Table):
+        self._table = table
+        self._requests = []
+
+    def put_item(self, Item: dict) -> None:
+        self._requests.append(('put', Item))
+
+    def delete_item(self, Key: dict) -> None:
+        self._requests.append(('delete', Key))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._requests:
+            with self._table._store('BatchWriteItem').transaction():
+                for action, value in self._requests:
+                    if action == 'put':
+                        self._table.put_item(Item=value)
+                    else:
+                        self._table.delete_item(Key=value)
+            self._requests = []
+        return False
+
+
+class _TableCollection:
+    def __init__(self, database: 'Database'):
+        self._database = database
+
+    def all(self) -> List[Table]:
+        return [Table(self._database, name) for name in list(self._database._stores)]
+
+
+class Database:
+    """boto3 DynamoDB resource-compatible front for a storage engine"""
+
+    def __init__(self):
+        self._stores: Dict[str, TableStore] = {}
+        self.tables = _TableCollection(self)
+
+    def _new_store(self, definition: dict) -> TableStore:
+        raise NotImplementedError
+
+    def _schema_changed(self, store: TableStore) -> None:
+        """Hook for engines that persist table definitions"""
+
+    def _drop_table(self, name: str) -> None:
+        self._stores.pop(name, None)
+
+    def create_table(self, **definition) -> Table:
+        if definition['TableName'] in self._stores:
+            raise client_error('ResourceInUseException', f"Table already exists: {definition['TableName']}",
+                               'CreateTable')
+        self._stores[definition['TableName']] = self._new_store(definition)
+        return Table(self, definition['TableName'])
+
+    def Table(self, name: str) -> Table:
+        return Table(self, name)
+
+    def batch_get_item(self, RequestItems: dict, **kwargs) -> dict:
+        if sum(len(request['Keys']) for request in RequestItems.values()) > BATCH_GET_MAX_KEYS:
+            raise client_error('ValidationException', 'Too many items requested for the BatchGetItem call',
+                               'BatchGetItem')
+        responses = {}
+        for table_name, request in RequestItems.items():
+            table = self.Table(table_name)
+            options = {name: request[name] for name in ('ProjectionExpression', 'ExpressionAttributeNames')
+                       if name in request}
+            items = (table.get_item(Key=key, **options).get('Item') for key in request['Keys'])
+            responses[table_name] = [item for item in items if item is not None]
+        return {'Responses': responses, 'UnprocessedKeys': {}}
+
+    def batch_write_item(self, RequestItems: dict, **kwargs) -> dict:
+        if sum(len(requests) for requests in RequestItems.values()) > BATCH_WRITE_MAX_ITEMS:
+            raise client_error('ValidationException',
+                               'Too many items requested for the BatchWriteItem call', 'BatchWriteItem')
+        for table_name, requests in RequestItems.items():
+            with self.Table(table_name).batch_writer() as batch:
+                for request in requests:
+                    if 'PutRequest' in request:
+                        batch.put_item(Item=request['PutRequest']['Item'])
+                    else:
+                        batch.delete_item(Key=request['DeleteRequest']['Key'])
+        return {'UnprocessedItems': {}}
+
+
+class MemoryDatabase(Database):
+    """In-process engine holding every table in memory"""
+
+    def __init__(self, table_definitions: Optional[Dict[str, dict]] = None):
+        super().__init__()
+        for definition in (table_definitions or {}).values():
+            self.create_table(**definition)
+
+    def _new_store(self, definition: dict) -> TableStore:
+        return _MemoryStore(definition)
@@ -0,0 +1,279 @@
+"""
+Optional local full-text search over surveys, backed by SQLite FTS5.
+
+Surveys, customers, properties, addresses and townships are mirrored into a
+SQLite file. Each survey gets one denormalized search document holding its
+number, title, description and notes, plus its customer's name, its
+property's name, lot/block and address, and its township. The mirror is kept
+current incrementally: each sync reads only the rows whose ModifiedDate
+(CreatedDate for addresses) is at or after the last watermark, then
+refreshes the documents of the surveys those rows touch. Queries rank with
+bm25 and return snippets of Notes and SurveyorNotes, so questions like "lot 14
+smithtown" are answered locally without scanning DynamoDB.
+
+Enabled by setting SURVEY_SEARCH_DB to the path of the SQLite file.
+"""
+import os
+import re
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+from boto3.dynamodb.conditions import Attr
+from botocore.exceptions import ClientError
+
+import parallel_scan
+from database import get_table
+
+SURVEY_SEARCH_DB = os.getenv("SURVEY_SEARCH_DB", "")
+SURVEY_SEARCH_SYNC_SECONDS = int(os.getenv("SURVEY_SEARCH_SYNC_SECONDS", "60"))
+
+# Mirrored tables: key, attributes copied and the timestamp used as the sync watermark
+MIRRORS = {
+    'Townships': {'key': 'TownshipId', 'columns': ['TownshipName'], 'watermark': 'ModifiedDate'},
+    'Addresses': {'key': 'AddressId', 'columns': ['AddressLine1', 'AddressLine2', 'City', 'ZipCode'],
+                  'watermark': 'CreatedDate'},
+    'Customers': {'key': 'CustomerId', 'columns': ['CompanyName', 'ContactFirstName', 'ContactLastName'],
+                  'watermark': 'ModifiedDate'},
+    'Properties': {'key': 'PropertyId',
+                   'columns': ['PropertyName', 'PropertyCode', 'Lot', 'Block', 'Address', 'City',
+                               'AddressId', 'TownshipId'],
+                   'watermark': 'ModifiedDate'},
+    'Surveys': {'key': 'SurveyId',
+                'columns': ['SurveyNumber', 'Title', 'Description', 'Notes', 'SurveyorNotes', 'CustomerId',
+                            'PropertyId', 'SurveyTypeId', 'StatusId', 'SurveyStatusId', 'IsActive'],
+                'watermark': 'ModifiedDate'},
+}
+
+DOCUMENT_COLUMNS = ['SurveyNumber', 'Title', 'Description', 'CustomerName', 'PropertyName', 'Address',
+                    'Township', 'Notes', 'SurveyorNotes']
+FILTER_COLUMNS = ['StatusId', 'SurveyTypeId', 'CustomerId', 'PropertyId', 'TownshipId', 'IsActive']
+# bm25 weights, in DOCUMENT_COLUMNS order
+COLUMN_WEIGHTS = [10.0, 4.0, 1.0, 3.0, 3.0, 3.0, 3.0, 1.0, 1.0]
+
+STOPWORDS = {'a', 'an', 'and', 'are', 'at', 'by', 'for', 'from', 'in', 'is', 'of', 'on', 'or', 'the',
+             'to', 'with', 'which', 'what', 'that'}
+TOKEN = re.compile(r'\w+')
+
+
+def match_expression(query: str) -> Optional[str]:
+    """FTS5 MATCH expression requiring every term; the last term also matches as a prefix"""
+    tokens = TOKEN.findall(query.casefold())
+    tokens = [token for token in tokens if token not in STOPWORDS] or tokens
+    if not tokens:
+        return None
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def _join(*parts) -> str:
+    return ' '.join(str(part) for part in parts if part)
+
+
+class SurveySearchIndex:
+    """SQLite mirror of the survey tables with an FTS5 index of survey documents"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        statements = [
+            f"CREATE TABLE IF NOT EXISTS m_{table} ({spec['key']} TEXT PRIMARY KEY, "
+            + ', '.join(f"{column} TEXT" for column in spec['columns']) + ")"
+            for table, spec in MIRRORS.items()
+        ]
+        statements += [
+            "CREATE TABLE IF NOT EXISTS watermarks (TableName TEXT PRIMARY KEY, Value TEXT)",
+            "CREATE TABLE IF NOT EXISTS documents (rowid INTEGER PRIMARY KEY, SurveyId TEXT UNIQUE NOT NULL, "
+            + ', '.join(f"{column} TEXT" for column in FILTER_COLUMNS + DOCUMENT_COLUMNS) + ")",
+            "CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5("
+            + ', '.join(DOCUMENT_COLUMNS)
+            + ", content='documents', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2')",
+            # Keep the external-content FTS table in step with documents
+            "CREATE TRIGGER IF NOT EXISTS documents_ai AFTER INSERT ON documents BEGIN "
+            f"INSERT INTO documents_fts(rowid, {', '.join(DOCUMENT_COLUMNS)}) "
+            f"VALUES (new.rowid, {', '.join('new.' + c for c in DOCUMENT_COLUMNS)}); END",
+            "CREATE TRIGGER IF NOT EXISTS documents_ad AFTER DELETE ON documents BEGIN "
+            f"INSERT INTO documents_fts(documents_fts, rowid, {', '.join(DOCUMENT_COLUMNS)}) "
+            f"VALUES ('delete', old.rowid, {', '.join('old.' + c for c in DOCUMENT_COLUMNS)}); END",
+            "CREATE TRIGGER IF NOT EXISTS documents_au AFTER UPDATE ON documents BEGIN "
+            f"INSERT INTO documents_fts(documents_fts, rowid, {', '.join(DOCUMENT_COLUMNS)}) "
+            f"VALUES ('delete', old.rowid, {', '.join('old.' + c for c in DOCUMENT_COLUMNS)}); "
+            f"INSERT INTO documents_fts(rowid, {', '.join(DOCUMENT_COLUMNS)}) "
+            f"VALUES (new.rowid, {', '.join('new.' + c for c in DOCUMENT_COLUMNS)}); END",
+        ]
+        with self._lock, self.connection:
+            for statement in statements:
+                self.connection.execute(statement)
+
+    def _sync_table(self, table_name: str) -> List[str]:
+        """Copy rows changed since the table's watermark into its mirror; returns their keys"""
+        spec = MIRRORS[table_name]
+        table = get_table(table_name)
+        row = self.connection.execute("SELECT Value FROM watermarks WHERE TableName = ?", (table_name,)).fetchone()
+        watermark = row['Value'] if row else None
+        scan_kwargs = {'FilterExpression': Attr(spec['watermark']).gte(watermark)} if watermark else {}
+
+        columns = [spec['key'], *spec['columns']]
+        changed = []
+        newest = watermark
+        for page in parallel_scan.scan_pages(table, projection=[*columns, spec['watermark']], **scan_kwargs):
+            rows = [[None if item.get(column) is None else str(item[column]) for column in columns] for item in page]
+            with self._lock, self.connection:
+                self.connection.executemany(
+                    f"INSERT OR REPLACE INTO m_{table_name} ({', '.join(columns)}) "
+                    f"VALUES ({', '.join('?' * len(columns))})",
+                    rows
+                )
+            changed.extend(row[0] for row in rows)
+            stamps = [str(item[spec['watermark']]) for item in page if item.get(spec['watermark'])]
+            if stamps:
+                newest = max([newest, *stamps]) if newest else max(stamps)
+
+        if newest and newest != watermark:
+            with self._lock, self.connection:
+                self.connection.execute("INSERT OR REPLACE INTO watermarks VALUES (?, ?)", (table_name, newest))
+        return changed
+
+    def _affected_surveys(self, changed: Dict[str, List[str]]) -> List[str]:
+        """Surveys whose documents include any of the changed rows"""
+        conditions = {
+            'Surveys': "s.SurveyId IN ({})",
+            'Customers': "s.CustomerId IN ({})",
+            'Properties': "s.PropertyId IN ({})",
+            'Addresses': "p.AddressId IN ({})",
+            'Townships': "p.TownshipId IN ({})",
+        }
+        survey_ids = set()
+        for table_name, keys in changed.items():
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                rows = self.connection.execute(
+                    "SELECT s.SurveyId FROM m_Surveys s LEFT JOIN m_Properties p ON p.PropertyId = s.PropertyId "
+                    "WHERE " + conditions[table_name].format(','.join('?' * len(batch))),
+                    batch
+                )
+                survey_ids.update(row['SurveyId'] for row in rows)
+        return sorted(survey_ids)
+
+    def _refresh_documents(self, survey_ids: List[str]) -> None:
+        for start in range(0, len(survey_ids), 500):
+            batch = survey_ids[start:start + 500]
+            rows = self.connection.execute(
+                "SELECT s.*, c.CompanyName, c.ContactFirstName, c.ContactLastName, p.PropertyName, p.PropertyCode, "
+                "p.Lot, p.Block, p.Address AS PropertyAddress, p.City AS PropertyCity, p.TownshipId, "
+                "a.AddressLine1, a.AddressLine2, a.City, a.ZipCode, t.TownshipName "
+                "FROM m_Surveys s "
+                "LEFT JOIN m_Customers c ON c.CustomerId = s.CustomerId "
+                "LEFT JOIN m_Properties p ON p.PropertyId = s.PropertyId "
+                "LEFT JOIN m_Addresses a ON a.AddressId = p.AddressId "
+                "LEFT JOIN m_Townships t ON t.TownshipId = p.TownshipId "
+                f"WHERE s.SurveyId IN ({','.join('?' * len(batch))})",
+                batch
+            ).fetchall()
+            documents = [{
+                'SurveyId': row['SurveyId'],
+                'StatusId': row['StatusId'] or row['SurveyStatusId'],
+                'SurveyTypeId': row['SurveyTypeId'],
+                'CustomerId': row['CustomerId'],
+                'PropertyId': row['PropertyId'],
+                'TownshipId': row['TownshipId'],
+                'IsActive': row['IsActive'],
+                'SurveyNumber': row['SurveyNumber'],
+                'Title': row['Title'],
+                'Description': row['Description'],
+                'CustomerName': _join(row['CompanyName'], row['ContactFirstName'], row['ContactLastName']),
+                'PropertyName': _join(row['PropertyName'], row['PropertyCode'],
+                                      row['Lot'] and f"Lot {row['Lot']}", row['Block'] and f"Block {row['Block']}"),
+                'Address': _join(row['AddressLine1'], row['AddressLine2'], row['City'], row['ZipCode'],
+                                 row['PropertyAddress'], row['PropertyCity']),
+                'Township': row['TownshipName'],
+                'Notes': row['Notes'],
+                'SurveyorNotes': row['SurveyorNotes'],
+            } for row in rows]
+            columns = ['SurveyId', *FILTER_COLUMNS, *DOCUMENT_COLUMNS]
+            with self._lock, self.connection:
+                self.connection.executemany(
+                    f"INSERT INTO documents ({', '.join(columns)}) VALUES ({', '.join(':' + c for c in columns)}) "
+                    "ON CONFLICT(SurveyId) DO UPDATE SET "
+                    + ', '.join(f"{c} = excluded.{c}" for c in columns[1:]),
+                    documents
+                )
+
+    def sync(self) -> int:
+        """Pull rows changed since the last sync and refresh the affected documents"""
+        try:
+            changed = {table_name: self._sync_table(table_name) for table_name in MIRRORS}
+        except ClientError as e:
+            print(f"Error syncing survey search index: {e}")
+            return 0
+        survey_ids = self._affected_surveys({name: keys for name, keys in changed.items() if keys})
+        self._refresh_documents(survey_ids)
+        return len(survey_ids)
+
+    def rebuild(self) -> int:
+        """Drop the mirror and resync everything, clearing rows deleted from DynamoDB"""
+        with self._lock, self.connection:
+            for table_name in MIRRORS:
+                self.connection.execute(f"DELETE FROM m_{table_name}")
+            self.connection.execute("DELETE FROM watermarks")
+            self.connection.execute("DELETE FROM documents")
+        return self.sync()
+
+    def search(self, query: str, filters: Optional[dict] = None, limit: int = 25, offset: int = 0) -> dict:
+        """Matching survey ids ranked by bm25, with Notes/SurveyorNotes snippets and the total"""
+        expression = match_expression(query)
+        if expression is None:
+            return {'total': 0, 'hits': []}
+        where = ["documents_fts MATCH ?"]
+        params = [expression]
+        for column, value in (filters or {}).items():
+            if column in FILTER_COLUMNS and value is not None:
+                where.append(f"d.{column} = ?")
+                params.append(str(value))
+        where_sql = ' AND '.join(where)
+        notes = DOCUMENT_COLUMNS.index('Notes')
+        surveyor_notes = DOCUMENT_COLUMNS.index('SurveyorNotes')
+        with self._lock:
+            total = self.connection.execute(
+                f"SELECT COUNT(*) FROM documents_fts JOIN documents d ON d.rowid = documents_fts.rowid "
+                f"WHERE {where_sql}", params
+            ).fetchone()[0]
+            rows = self.connection.execute(
+                f"SELECT d.SurveyId, bm25(documents_fts, {', '.join(map(str, COLUMN_WEIGHTS))}) AS score, "
+                f"snippet(documents_fts, {notes}, '<mark>', '</mark>', '…', 12) AS NotesSnippet, "
+                f"snippet(documents_fts, {surveyor_notes}, '<mark>', '</mark>', '…', 12) AS SurveyorNotesSnippet "
+                f"FROM documents_fts JOIN documents d ON d.rowid = documents_fts.rowid "
+                f"WHERE {where_sql} ORDER BY score LIMIT ? OFFSET ?",
+                [*params, limit, offset]
+            ).fetchall()
+        return {'total': total, 'hits': [dict(row) for row in rows]}
+
+    def _sync_loop(self, interval_seconds: int) -> None:
+        while True:
+            try:
+                self.sync()
+            except Exception as e:
+                print(f"Survey search sync failed: {e}")
+            if interval_seconds <= 0 or self._stop_event.wait(interval_seconds):
+                return
+
+    def start_syncer(self, interval_seconds: int = SURVEY_SEARCH_SYNC_SECONDS) -> threading.Thread:
+        """Sync in a daemon thread, then every interval_seconds (0 syncs once)"""
+        self._stop_event.clear()
+        thread = threading.Thread(target=self._sync_loop, args=(interval_seconds,),
+                                  name="survey-search-sync", daemon=True)
+        thread.start()
+        return thread
+
+    def stop_syncer(self) -> None:
+        self._stop_event.set()
+
+
+sidecar = SurveySearchIndex(SURVEY_SEARCH_DB) if SURVEY_SEARCH_DB else None
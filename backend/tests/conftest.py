@@ -15,6 +15,8 @@ from fastapi import FastAPI
 # from main import app  # Temporarily disabled for testing
 from models import Customer, Survey, Property, DYNAMODB_TABLES
 from database import get_dynamodb
+from lookup_cache import lookup_cache
+from search_index import search_results
 
 # Create a test FastAPI app
 test_app = FastAPI(title="Test Survey Management API")
@@ -34,6 +36,9 @@ def test_env_vars():
 @pytest.fixture
 def mock_dynamodb_tables(test_env_vars):
     """Create mock DynamoDB tables for testing"""
+    # Cached lookups from a previous test's tables must not leak into this one
+    lookup_cache.invalidate()
+    search_results.invalidate()
     with mock_aws():
         # Create DynamoDB resource
         dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
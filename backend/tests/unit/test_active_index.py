@@ -0,0 +1,110 @@
+"""
+Unit tests for the sparse ActiveIndex of soft-deleted tables
+"""
+import crud
+import schemas
+import setup_tables
+from database import get_table
+from models import ACTIVE_INDEX, ACTIVE_KEY
+
+
+def _create_customers(count):
+    return [
+        crud.create_customer(schemas.CustomerCreate(CustomerCode=f"ACT{i:03d}", CompanyName=f"Active Co {i}"))
+        for i in range(count)
+    ]
+
+
+def _index_ids(table_name, key_name):
+    return sorted(item[key_name] for item in get_table(table_name).scan(IndexName=ACTIVE_INDEX)['Items'])
+
+
+class TestActiveIndex:
+    """Test soft deletes leave the index and list reads only see live rows"""
+
+    def test_customer_lists_skip_deleted(self, mock_dynamodb_tables):
+        """Test a soft-deleted customer is gone from pages, exact counts and search"""
+        created = _create_customers(3)
+        assert crud.delete_customer(created[0].CustomerId) is True
+
+        live = sorted(c.CustomerId for c in created[1:])
+        assert _index_ids('Customers', 'CustomerId') == live
+        page, next_cursor = crud.get_customers_page(limit=10)
+        assert sorted(c.CustomerId for c in page) == live and next_cursor is None
+        assert crud.count_customers(exact=True) == 2
+        assert [c.CustomerCode for c in crud.get_customers_page(search='ACT000')[0]] == []
+        # The row itself is kept, only its index entry is gone
+        assert ACTIVE_KEY not in get_table('Customers').get_item(Key={'CustomerId': created[0].CustomerId})['Item']
+
+        crud.update_customer(created[0].CustomerId, schemas.CustomerUpdate(IsActive=True))
+        assert crud.count_customers(exact=True) == 3
+
+    def test_pages_follow_index_cursor(self, mock_dynamodb_tables):
+        """Test paging through ActiveIndex returns every live customer once"""
+        created = _create_customers(5)
+        crud.delete_customer(created[2].CustomerId)
+
+        seen, cursor = [], None
+        while True:
+            page, cursor = crud.get_customers_page(limit=2, after=cursor)
+            seen += [c.CustomerId for c in page]
+            if cursor is None:
+                break
+        assert sorted(seen) == sorted(c.CustomerId for i, c in enumerate(created) if i != 2)
+
+    def test_townships_and_boards(self, mock_dynamodb_tables):
+        """Test township and board configuration soft deletes and reactivation"""
+        township = crud.create_township(schemas.TownshipCreate(TownshipName='Gone', County='C', State='NJ'))
+        crud.create_township(schemas.TownshipCreate(TownshipName='Kept', County='C', State='NJ'))
+        crud.delete_township(township.TownshipId)
+        assert [t.TownshipName for t in crud.get_townships()[0]] == ['Kept']
+        crud.update_township(township.TownshipId, schemas.TownshipUpdate(IsActive=True))
+        assert [t.TownshipName for t in crud.get_townships()[0]] == ['Gone', 'Kept']
+
+        board = crud.create_board_configuration(schemas.BoardConfigurationCreate(BoardName='Main', IsDefault=True))
+        assert crud.get_default_board_configuration().BoardConfigId == board.BoardConfigId
+        crud.delete_board_configuration(board.BoardConfigId)
+        assert crud.get_board_configurations() == []
+        assert crud.get_default_board_configuration() is None
+
+    def test_townships_follow_index_pages(self, mock_dynamodb_tables, monkeypatch):
+        """Test every active township is listed when the index scan returns several pages"""
+        for name in ['Delta', 'Alpha', 'Echo', 'Bravo', 'Charlie']:
+            crud.create_township(schemas.TownshipCreate(TownshipName=name, County='C', State='NJ'))
+        table = get_table('Townships')
+        real_scan = table.scan
+        calls = []
+
+        def small_pages(**kwargs):
+            calls.append(kwargs)
+            return real_scan(Limit=2, **kwargs)
+
+        monkeypatch.setattr(table, 'scan', small_pages)
+        monkeypatch.setattr(crud, 'get_table', lambda table_name: table)
+
+        townships, total = crud.get_townships(limit=3)
+        assert [t.TownshipName for t in townships] == ['Alpha', 'Bravo', 'Charlie'] and total == 5
+        assert len(calls) == 3
+
+    def test_user_settings_deactivation(self, mock_dynamodb_tables):
+        """Test settings leave the index when deactivated and return on upsert"""
+        settings = crud.create_user_settings(schemas.UserSettingsCreate(UserId='u1', SettingsType='board',
+                                                                        SettingsData={'a': 1}))
+        assert _index_ids('UserSettings', 'UserSettingsId') == [settings.UserSettingsId]
+
+        crud.update_user_settings(settings.UserSettingsId, schemas.UserSettingsUpdate(IsActive=False))
+        assert _index_ids('UserSettings', 'UserSettingsId') == []
+
+        crud.upsert_user_settings('u1', 'board', {'a': 2})
+        crud.user_settings_writes.flush(settings.UserSettingsId)
+        assert _index_ids('UserSettings', 'UserSettingsId') == [settings.UserSettingsId]
+
+    def test_backfill_existing_rows(self, mock_dynamodb_tables):
+        """Test setup backfills ActiveId on active rows written before the index existed"""
+        table = mock_dynamodb_tables.Table('Customers')
+        table.put_item(Item={'CustomerId': 'old', 'CompanyName': 'Old Co'})
+        table.put_item(Item={'CustomerId': 'deleted', 'CompanyName': 'Deleted Co', 'IsActive': False})
+
+        assert setup_tables.backfill_active_keys(mock_dynamodb_tables, 'Customers') is True
+        assert _index_ids('Customers', 'CustomerId') == ['old']
+        assert setup_tables.backfill_active_keys(mock_dynamodb_tables, 'Surveys') is True
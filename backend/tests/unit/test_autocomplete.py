@@ -0,0 +1,109 @@
+"""
+Unit tests for typeahead suggestions (autocomplete.py)
+"""
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+import crud
+import schemas
+from autocomplete import PrefixIndex, autocomplete
+from graphql_schema_simple import schema
+
+
+class TestPrefixIndex:
+    """Test prefix lookups over the sorted term array"""
+
+    def test_search_and_remove(self):
+        """Test word-boundary prefixes, de-duplication, limits and removal"""
+        index = PrefixIndex([
+            ('1', 'Acme Corp', ['acme corp', 'corp']),
+            ('2', 'Big Acme', ['big acme', 'acme']),
+            ('3', 'Acorn', ['acorn']),
+        ])
+
+        assert [s['id'] for s in index.search('ac')] == ['2', '1', '3']
+        assert index.search('ac', limit=1) == [{'id': '2', 'label': 'Big Acme'}]
+        index.remove('2')
+        index.upsert('4', 'Corpus', ['corpus'])
+        assert [s['label'] for s in index.search('corp')] == ['Acme Corp', 'Corpus']
+        assert index.search('zz') == []
+
+
+class TestAutocomplete:
+    """Test suggestions kept fresh by crud hooks"""
+
+    def test_customer_suggestions_follow_writes(self, mock_dynamodb_tables):
+        """Test build on first use, then create/update/delete hooks"""
+        autocomplete.clear()
+        acme = crud.create_customer(schemas.CustomerCreate(CustomerCode='AC1', CompanyName='Acme Surveying'))
+        assert autocomplete.suggest('customer', 'acm') == [{'id': acme.CustomerId, 'label': 'Acme Surveying'}]
+
+        with patch('autocomplete.get_table') as get_table:
+            crud.bulk_create_customers([{'CustomerCode': 'SV2', 'CompanyName': 'Survey Partners'}])
+            assert {s['label'] for s in autocomplete.suggest('customer', 'SURV')} == {'Acme Surveying', 'Survey Partners'}
+            assert [s['label'] for s in autocomplete.suggest('customer', 'sv')] == ['Survey Partners']
+            assert not get_table.called
+
+        crud.update_customer(acme.CustomerId, schemas.CustomerUpdate(CompanyName='Apex Land'))
+        assert autocomplete.suggest('customer', 'acme') == []
+        crud.delete_customer(acme.CustomerId)
+        assert autocomplete.suggest('customer', 'apex') == []
+
+    def test_graphql_township(self, mock_dynamodb_tables):
+        """Test the GraphQL field returns only id and label"""
+        autocomplete.clear()
+        crud.create_township(schemas.TownshipCreate(TownshipName='Southampton', County='Suffolk', State='NY'))
+
+        result = schema.execute('{ autocomplete(entity: "township", q: "south") { id label } }')
+
+        assert result.errors is None
+        assert [s['label'] for s in result.data['autocomplete']] == ['Southampton']
+
+    def test_concurrent_first_lookups_build_once(self, mock_dynamodb_tables):
+        """Test racing first lookups share one build and keep writes made during it"""
+        autocomplete.clear()
+        crud.create_customer(schemas.CustomerCreate(CustomerCode='AC1', CompanyName='Acme Surveying'))
+        real_load = autocomplete._load
+        loads = []
+
+        def slow_load(entity):
+            loads.append(entity)
+            index = real_load(entity)
+            time.sleep(0.2)
+            return index
+
+        results, errors = [], []
+
+        def lookup():
+            try:
+                results.append(autocomplete.suggest('customer', 'a'))
+            except Exception as e:
+                errors.append(e)
+
+        with patch.object(autocomplete, '_load', slow_load):
+            threads = [threading.Thread(target=lookup) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            time.sleep(0.05)
+            crud.create_customer(schemas.CustomerCreate(CustomerCode='AP2', CompanyName='Apex Land'))
+            for thread in threads:
+                thread.join()
+
+        assert errors == [] and loads == ['customer']
+        assert len(results) == 4
+        assert {s['label'] for s in autocomplete.suggest('customer', 'a')} == {'Acme Surveying', 'Apex Land'}
+
+    def test_failed_build_clears_pending_writes(self, mock_dynamodb_tables):
+        """Test a build that raises leaves no pending list behind and the next lookup retries"""
+        autocomplete.clear()
+        crud.create_customer(schemas.CustomerCreate(CustomerCode='AC1', CompanyName='Acme Surveying'))
+
+        with patch.object(autocomplete, '_load', side_effect=RuntimeError('scan failed')):
+            with pytest.raises(RuntimeError):
+                autocomplete.suggest('customer', 'acme')
+        assert 'customer' not in autocomplete._pending
+
+        assert [s['label'] for s in autocomplete.suggest('customer', 'acme')] == ['Acme Surveying']
@@ -0,0 +1,86 @@
+"""
+Unit tests for BatchGetItem bulk reads (crud.batch_get_items and *_by_ids)
+"""
+import pytest
+from unittest.mock import patch
+
+import crud
+import schemas
+from database import get_dynamodb
+
+
+def _create_customers(count):
+    return [
+        crud.create_customer(schemas.CustomerCreate(CustomerCode=f"BG{i:03d}", CompanyName=f"Batch Co {i}"))
+        for i in range(count)
+    ]
+
+
+class TestBatchGet:
+    """Test bulk fetch by ID"""
+
+    def test_order_and_missing(self, mock_dynamodb_tables):
+        """Test that results follow the requested order with None for missing ids"""
+        created = _create_customers(3)
+        ids = [created[2].CustomerId, 'missing', created[0].CustomerId, created[2].CustomerId]
+
+        customers = crud.get_customers_by_ids(ids)
+
+        assert [c.CompanyName if c else None for c in customers] == ['Batch Co 2', None, 'Batch Co 0', 'Batch Co 2']
+
+    def test_chunks_over_100_keys(self, mock_dynamodb_tables):
+        """Test that more than 100 ids are split into several BatchGetItem calls"""
+        created = _create_customers(150)
+        ids = [c.CustomerId for c in created]
+
+        with patch('crud._batch_get_chunk', wraps=crud._batch_get_chunk) as chunk:
+            customers = crud.get_customers_by_ids(ids)
+
+        assert chunk.call_count == 2
+        assert [c.CustomerId for c in customers] == ids
+
+    def test_projection(self, mock_dynamodb_tables):
+        """Test that a projection only returns the requested attributes and the key"""
+        created = _create_customers(1)
+
+        customer, = crud.get_customers_by_ids([created[0].CustomerId], projection=['CompanyName'])
+
+        assert customer.CustomerId == created[0].CustomerId
+        assert customer.CompanyName == 'Batch Co 0'
+        assert 'CustomerCode' not in customer.model_fields_set
+
+    def test_unprocessed_keys_retried(self, mock_dynamodb_tables):
+        """Test that UnprocessedKeys are retried until every item is read"""
+        created = _create_customers(2)
+        dynamodb = get_dynamodb()
+        real_batch_get = dynamodb.batch_get_item
+        calls = []
+
+        def throttled_batch_get(RequestItems):
+            calls.append(RequestItems)
+            if len(calls) == 1:
+                keys = RequestItems['Customers']['Keys']
+                response = real_batch_get(RequestItems={'Customers': dict(RequestItems['Customers'], Keys=keys[:1])})
+                response['UnprocessedKeys'] = {'Customers': dict(RequestItems['Customers'], Keys=keys[1:])}
+                return response
+            return real_batch_get(RequestItems=RequestItems)
+
+        with patch.object(dynamodb, 'batch_get_item', side_effect=throttled_batch_get), \
+                patch('crud.time.sleep') as sleep:
+            customers = crud.get_customers_by_ids([c.CustomerId for c in created])
+
+        assert len(calls) == 2
+        sleep.assert_called_once()
+        assert all(customers)
+
+    def test_surveys_and_properties(self, mock_dynamodb_tables):
+        """Test the survey and property variants"""
+        survey = crud.create_survey(schemas.SurveyCreate(SurveyNumber="BG-S1", StatusId='open'))
+        prop = crud.create_property(schemas.PropertyCreate(PropertyCode="BG-P1", PropertyName="Batch Property"))
+
+        surveys = crud.get_surveys_by_ids([survey.SurveyId, 'missing'])
+        properties = crud.get_properties_by_ids([prop.PropertyId])
+
+        assert surveys[0].SurveyNumber == 'BG-S1' and surveys[0].SurveyStatusId == 'open'
+        assert surveys[1] is None
+        assert properties[0].PropertyName == 'Batch Property'
@@ -0,0 +1,144 @@
+"""
+Unit tests for the server-side board view and status queries (StatusIdIndex)
+"""
+import pytest
+from datetime import datetime
+
+import crud
+import schemas
+import setup_tables
+from graphql_schema_simple import schema
+from models import SurveyStatus
+from pagination import InvalidCursorError
+
+
+class TestBoardView:
+    """Test per-status board columns against mocked DynamoDB"""
+
+    def _setup_board(self):
+        crud.create_survey_status(SurveyStatus(SurveyStatusId='open', StatusName='Open'))
+        crud.create_survey_status(SurveyStatus(SurveyStatusId='done', StatusName='Done'))
+        crud.create_board_configuration(schemas.BoardConfigurationCreate(BoardName='Main Board', IsDefault=True))
+        for i in range(5):
+            crud.create_survey(schemas.SurveyCreate(SurveyNumber=f"OPEN{i}", StatusId='open'))
+        crud.create_survey(schemas.SurveyCreate(SurveyNumber="DONE0", StatusId='done'))
+
+    def _columns(self, board_view):
+        return {column['status'].SurveyStatusId: column for column in board_view['columns']}
+
+    def test_columns_limited_with_totals(self, mock_dynamodb_tables):
+        """Test that each column returns at most the limit but reports its full total"""
+        self._setup_board()
+
+        board_view = crud.get_board_view('main-board', per_column_limit=2)
+        columns = self._columns(board_view)
+
+        assert board_view['board'].BoardName == 'Main Board'
+        assert columns['open']['total'] == 5
+        assert len(columns['open']['surveys']) == 2
+        assert columns['open']['next_cursor'] is not None
+        assert columns['done']['total'] == 1
+        assert [s.SurveyNumber for s in columns['done']['surveys']] == ['DONE0']
+        assert columns['done']['next_cursor'] is None
+
+    def test_load_more_follows_board_cursor(self, mock_dynamodb_tables):
+        """Test that the board cursor pages only the columns that have more surveys"""
+        self._setup_board()
+
+        seen = []
+        board_view = crud.get_board_view(per_column_limit=2)
+        while True:
+            seen.extend(s.SurveyNumber for s in self._columns(board_view)['open']['surveys'])
+            if board_view['next_cursor'] is None:
+                break
+            board_view = crud.get_board_view(per_column_limit=2, after=board_view['next_cursor'])
+            # The exhausted "done" column is not queried again
+            assert list(self._columns(board_view)) == ['open']
+
+        assert sorted(seen) == [f"OPEN{i}" for i in range(5)]
+
+    def test_status_change_moves_card(self, mock_dynamodb_tables):
+        """Test that updating a survey's status moves it and its count to the new column"""
+        self._setup_board()
+        survey = crud.create_survey(schemas.SurveyCreate(SurveyNumber="MOVE0", StatusId='open'))
+
+        crud.update_survey(survey.SurveyId, schemas.SurveyUpdate(StatusId='done'))
+        columns = self._columns(crud.get_board_view(per_column_limit=10))
+
+        assert columns['open']['total'] == 5
+        assert columns['done']['total'] == 2
+        assert 'MOVE0' in [s.SurveyNumber for s in columns['done']['surveys']]
+        assert 'MOVE0' not in [s.SurveyNumber for s in columns['open']['surveys']]
+
+    def test_move_surveys(self, mock_dynamodb_tables):
+        """Test that a multi-card drag moves status, position and counts in one mutation"""
+        self._setup_board()
+        surveys, _ = crud.get_surveys_by_status('open')
+        moves = ', '.join(f'{{surveyId: "{s.SurveyId}", toStatusId: "done", position: {i}}}'
+                          for i, s in enumerate(surveys[:3]))
+
+        result = schema.execute(f'mutation {{ moveSurveys(moves: [{moves}, '
+                                f'{{surveyId: "missing", toStatusId: "done"}}]) '
+                                f'{{ moves {{ surveyId statusId position }} }} }}')
+        columns = self._columns(crud.get_board_view(per_column_limit=10))
+
+        assert result.errors is None
+        assert result.data['moveSurveys']['moves'] == [
+            {'surveyId': s.SurveyId, 'statusId': 'done', 'position': i} for i, s in enumerate(surveys[:3])
+        ]
+        assert columns['open']['total'] == 2
+        assert columns['done']['total'] == 4
+        moved = {s.SurveyId: s.BoardPosition for s in columns['done']['surveys']}
+        assert [moved[s.SurveyId] for s in surveys[:3]] == [0, 1, 2]
+
+    def test_unknown_board(self, mock_dynamodb_tables):
+        """Test that an unknown board slug returns None"""
+        self._setup_board()
+        assert crud.get_board_view('no-such-board') is None
+
+    def test_invalid_cursor(self, mock_dynamodb_tables):
+        """Test that a forged board cursor is rejected"""
+        self._setup_board()
+        with pytest.raises(InvalidCursorError):
+            crud.get_board_view(after='forged.cursor')
+
+
+class TestSurveysByStatus:
+    """Test the StatusIdIndex query path"""
+
+    def test_newest_first_with_cursor(self, mock_dynamodb_tables):
+        """Test that status queries return newest first and page with a cursor"""
+        table = mock_dynamodb_tables.Table('Surveys')
+        for i in range(4):
+            table.put_item(Item={'SurveyId': f"s{i}", 'SurveyNumber': f"S{i}", 'StatusId': 'open',
+                                 'ModifiedDate': f"2024-01-0{i + 1}T00:00:00"})
+        table.put_item(Item={'SurveyId': 'other', 'SurveyNumber': 'X', 'StatusId': 'done',
+                             'ModifiedDate': '2024-01-09T00:00:00'})
+
+        first, cursor = crud.get_surveys_by_status('open', limit=3)
+        rest, end = crud.get_surveys_by_status('open', limit=3, cursor=cursor)
+
+        assert [s.SurveyNumber for s in first] == ['S3', 'S2', 'S1']
+        assert [s.SurveyNumber for s in rest] == ['S0']
+        assert end is None
+
+    def test_since(self, mock_dynamodb_tables):
+        """Test that since limits results to recently modified surveys"""
+        table = mock_dynamodb_tables.Table('Surveys')
+        for i in range(4):
+            table.put_item(Item={'SurveyId': f"s{i}", 'SurveyNumber': f"S{i}", 'StatusId': 'open',
+                                 'ModifiedDate': f"2024-01-0{i + 1}T00:00:00"})
+
+        surveys, _ = crud.get_surveys_by_status('open', since=datetime(2024, 1, 3))
+
+        assert [s.SurveyNumber for s in surveys] == ['S3', 'S2']
+
+    def test_setup_adds_index_to_existing_table(self, mock_dynamodb_tables):
+        """Test that table setup adds StatusIdIndex to a Surveys table created without it"""
+        table = mock_dynamodb_tables.Table('Surveys')
+        table.update(GlobalSecondaryIndexUpdates=[{'Delete': {'IndexName': 'StatusIdIndex'}}])
+
+        assert setup_tables.add_missing_indexes(mock_dynamodb_tables, 'Surveys') is True
+
+        table.reload()
+        assert 'StatusIdIndex' in [gsi['IndexName'] for gsi in table.global_secondary_indexes]
@@ -0,0 +1,81 @@
+"""
+Unit tests for bulk create (crud.bulk_create_* and bulkCreate* mutations)
+"""
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+import counters
+import crud
+from document_cache import DocumentCache
+from graphql_schema_simple import schema, ThreadPoolMiddleware
+
+
+class TestBulkCreate:
+    """Test batched writes with per-row results"""
+
+    def test_bulk_create_customers(self, mock_dynamodb_tables):
+        """Test that valid rows are written and invalid rows reported"""
+        rows = [{'CustomerCode': f"BULK{i}", 'CompanyName': f"Bulk Co {i}"} for i in range(60)]
+        rows.insert(10, {'CustomerCode': 'NO-NAME'})
+
+        results = crud.bulk_create_customers(rows)
+
+        assert len(results) == 61
+        assert results[10]['success'] is False and 'CompanyName' in results[10]['error']
+        assert sum(1 for r in results if r['success']) == 60
+        assert crud.count_customers(exact=True) == 60
+        assert counters.get_count('Customers') == 60
+        created = crud.get_customers_by_ids([results[0]['id']])[0]
+        assert created.CompanyName == 'Bulk Co 0'
+
+    def test_bulk_create_surveys_counts_statuses(self, mock_dynamodb_tables):
+        """Test that bulk survey creation maintains status counters"""
+        rows = [{'SurveyNumber': f"BS{i}", 'StatusId': 'open' if i % 2 else 'done'} for i in range(10)]
+
+        results = crud.bulk_create_surveys(rows)
+
+        assert all(r['success'] for r in results)
+        assert counters.get_count(counters.status_counter_name('open')) == 5
+        assert counters.get_count('Surveys') == 10
+
+    def test_unprocessed_items_retried(self, mock_dynamodb_tables):
+        """Test that throttled writes are retried with backoff"""
+        rows = [{'PropertyCode': f"BP{i}", 'PropertyName': f"Bulk Property {i}"} for i in range(3)]
+        real_write = crud.get_dynamodb().batch_write_item
+        calls = []
+
+        def throttled_write(RequestItems):
+            calls.append(RequestItems)
+            if len(calls) == 1:
+                requests = RequestItems['Properties']
+                real_write(RequestItems={'Properties': requests[:1]})
+                return {'UnprocessedItems': {'Properties': requests[1:]}}
+            return real_write(RequestItems=RequestItems)
+
+        with patch.object(crud.get_dynamodb(), 'batch_write_item', side_effect=throttled_write), \
+                patch('crud.time.sleep') as sleep:
+            results = crud.bulk_create_properties(rows)
+
+        assert all(r['success'] for r in results)
+        assert len(calls) == 2
+        sleep.assert_called_once()
+        assert crud.count_properties(exact=True) == 3
+
+    def test_bulk_create_mutation(self, mock_dynamodb_tables):
+        """Test the bulkCreateCustomers mutation"""
+        query = """
+            mutation {
+                bulkCreateCustomers(input: [
+                    {CustomerCode: "GQ1", CompanyName: "GraphQL Co 1"},
+                    {CustomerCode: "GQ2", CompanyName: "GraphQL Co 2"}
+                ]) { created failed results { index success id } }
+            }
+        """
+        result = asyncio.run(DocumentCache(schema.graphql_schema).execute(query, middleware=[ThreadPoolMiddleware()]))
+
+        assert result.errors is None
+        payload = result.data['bulkCreateCustomers']
+        assert payload['created'] == 2 and payload['failed'] == 0
+        assert all(r['id'] for r in payload['results'])
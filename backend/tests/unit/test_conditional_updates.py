@@ -0,0 +1,70 @@
+"""
+Unit tests for single-round-trip conditional updates
+"""
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+
+import counters
+import crud
+import schemas
+from database import get_table
+from routers import board_configurations as board_configurations_router
+
+
+class TestConditionalUpdates:
+    """Test updates that check existence and ModifiedDate in the write itself"""
+
+    def test_update_survey_single_call(self, mock_dynamodb_tables):
+        """Test a status change is one update_item and still moves the status counters"""
+        survey = crud.create_survey(schemas.SurveyCreate(SurveyNumber='S-1', StatusId='open'))
+
+        with patch('crud.get_survey') as get_survey:
+            updated = crud.update_survey(survey.SurveyId, schemas.SurveyUpdate(StatusId='done'),
+                                         expected_modified_date=survey.ModifiedDate)
+            assert not get_survey.called
+
+        assert updated.SurveyStatusId == 'done'
+        assert 'SurveyStatusId' not in get_table('Surveys').get_item(Key={'SurveyId': survey.SurveyId})['Item']
+        assert counters.get_count(counters.status_counter_name('open')) == 0
+        assert counters.get_count(counters.status_counter_name('done')) == 1
+
+    def test_update_survey_without_old_status(self, mock_dynamodb_tables):
+        """Test giving a status to a survey that had none only increments the new status"""
+        survey = crud.create_survey(schemas.SurveyCreate(SurveyNumber='S-1'))
+
+        crud.update_survey(survey.SurveyId, schemas.SurveyUpdate(StatusId='open'))
+
+        assert counters.get_count(counters.status_counter_name('open')) == 1
+        assert counters.get_count(counters.status_counter_name(None)) is None
+
+    def test_missing_and_stale(self, mock_dynamodb_tables):
+        """Test missing items return None without being created, and stale writes conflict"""
+        assert crud.update_survey('missing', schemas.SurveyUpdate(Title='x')) is None
+        assert crud.update_township('missing', schemas.TownshipUpdate(TownshipName='x')) is None
+        assert 'Item' not in get_table('Townships').get_item(Key={'TownshipId': 'missing'})
+
+        township = crud.create_township(schemas.TownshipCreate(TownshipName='Islip', County='Suffolk', State='NY'))
+        with pytest.raises(crud.UpdateConflictError):
+            crud.update_township(township.TownshipId, schemas.TownshipUpdate(State='New York'),
+                                 expected_modified_date=datetime(2000, 1, 1))
+        updated = crud.update_township(township.TownshipId, schemas.TownshipUpdate(State='New York'),
+                                       expected_modified_date=township.ModifiedDate)
+        assert updated.State == 'New York'
+
+    def test_board_configuration_router_status_codes(self, mock_dynamodb_tables):
+        """Test the router maps a missing board to 404 and a stale ModifiedDate to 409"""
+        board = crud.create_board_configuration(schemas.BoardConfigurationCreate(BoardName='Field Work'))
+        update = schemas.BoardConfigurationUpdate(Description='Crews')
+
+        with pytest.raises(HTTPException) as error:
+            board_configurations_router.update_board_configuration('missing', update, None)
+        assert error.value.status_code == 404
+        with pytest.raises(HTTPException) as error:
+            board_configurations_router.update_board_configuration(board.BoardConfigId, update, datetime(2000, 1, 1))
+        assert error.value.status_code == 409
+        updated = board_configurations_router.update_board_configuration(board.BoardConfigId, update,
+                                                                         board.ModifiedDate)
+        assert updated.Description == 'Crews'
@@ -0,0 +1,128 @@
+"""
+Unit tests for maintained entity counters (counters.py)
+"""
+import pytest
+
+import counters
+import crud
+import schemas
+from database import get_table
+
+
+def _create_customer(i):
+    return crud.create_customer(schemas.CustomerCreate(
+        CustomerCode=f"CNT{i:03d}",
+        CompanyName=f"Counted Company {i}"
+    ))
+
+
+class TestCounters:
+    """Test counter maintenance from crud write paths"""
+
+    def test_increment_and_get(self, mock_dynamodb_tables):
+        """Test atomic ADD creates and updates a counter"""
+        assert counters.get_count('Widgets') is None
+        counters.increment('Widgets')
+        counters.increment('Widgets', 2)
+        assert counters.get_count('Widgets') == 3
+
+    def test_create_and_soft_delete_customer(self, mock_dynamodb_tables):
+        """Test that create and soft delete keep the customer counter in step"""
+        created = [_create_customer(i) for i in range(3)]
+        assert crud.count_customers() == 3
+
+        assert crud.delete_customer(created[0].CustomerId) is True
+        assert crud.count_customers() == 2
+
+        # Deleting an already inactive customer must not decrement again
+        assert crud.delete_customer(created[0].CustomerId) is True
+        assert crud.count_customers() == 2
+
+    def test_deactivate_and_reactivate_customer(self, mock_dynamodb_tables):
+        """Test that flipping IsActive through an update adjusts the customer counter"""
+        created = [_create_customer(i) for i in range(2)]
+
+        crud.update_customer(created[0].CustomerId, schemas.CustomerUpdate(IsActive=False))
+        assert crud.count_customers() == 1
+        crud.update_customer(created[0].CustomerId, schemas.CustomerUpdate(IsActive=False))
+        assert crud.count_customers() == 1
+
+        updated = crud.update_customer(created[0].CustomerId, schemas.CustomerUpdate(IsActive=True))
+        assert updated.IsActive is True and updated.CompanyName == 'Counted Company 0'
+        assert crud.count_customers() == 2
+        crud.update_customer(created[1].CustomerId, schemas.CustomerUpdate(CompanyName='Renamed'))
+        assert crud.count_customers() == 2 == crud.count_customers(exact=True)
+
+    def test_deactivate_and_reactivate_property(self, mock_dynamodb_tables):
+        """Test that flipping IsActive through an update adjusts the property counter"""
+        created = crud.create_property(schemas.PropertyCreate(PropertyCode='P-1', PropertyName='Counted Lot'))
+        assert crud.count_properties() == 1
+
+        crud.update_property(created.PropertyId, schemas.PropertyUpdate(IsActive=False))
+        assert crud.count_properties() == 0
+        crud.update_property(created.PropertyId, schemas.PropertyUpdate(IsActive=False))
+        assert crud.count_properties() == 0
+
+        crud.update_property(created.PropertyId, schemas.PropertyUpdate(IsActive=True))
+        assert crud.count_properties() == 1 == crud.count_properties(exact=True)
+
+    def test_update_missing_rows(self, mock_dynamodb_tables, monkeypatch):
+        """Test updates of missing rows return None without creating them or counting them"""
+        assert crud.update_customer('missing', schemas.CustomerUpdate(CompanyName='Ghost')) is None
+        assert 'Item' not in get_table('Customers').get_item(Key={'CustomerId': 'missing'})
+        assert crud.count_customers() == 0
+
+        # A property deleted between the read and the write is not recreated
+        created = crud.create_property(schemas.PropertyCreate(PropertyCode='P-1', PropertyName='Lot'))
+        table = get_table('Properties')
+        stale = table.get_item(Key={'PropertyId': created.PropertyId})
+        crud.delete_property(created.PropertyId)
+        monkeypatch.setattr(table, 'get_item', lambda **kwargs: stale)
+        monkeypatch.setattr(crud, 'get_table', lambda table_name: table)
+
+        assert crud.update_property(created.PropertyId, schemas.PropertyUpdate(PropertyName='Ghost')) is None
+        assert table.scan()['Count'] == 0
+        assert crud.count_properties() == 0
+
+    def test_delete_missing_customer(self, mock_dynamodb_tables):
+        """Test that deleting a missing customer fails without touching the counter"""
+        _create_customer(0)
+        assert crud.delete_customer('does-not-exist') is False
+        assert crud.count_customers() == 1
+        assert get_table('Customers').get_item(Key={'CustomerId': 'does-not-exist'}).get('Item') is None
+
+    def test_exact_total(self, mock_dynamodb_tables):
+        """Test that exact counting scans the table instead of reading the counter"""
+        _create_customer(0)
+        counters.increment('Customers', 10)
+        assert crud.count_customers() == 11
+        assert crud.count_customers(exact=True) == 1
+
+    def test_get_counts(self, mock_dynamodb_tables):
+        """Test reading several counters in one batch"""
+        counters.increment('A', 1)
+        counters.increment('B', 2)
+        assert counters.get_counts(['A', 'B', 'C']) == {'A': 1, 'B': 2, 'C': 0}
+
+
+class TestReconciliation:
+    """Test recomputing counters from the source tables"""
+
+    def test_reconcile_fixes_drift(self, mock_dynamodb_tables):
+        """Test that reconciliation overwrites drifted counters"""
+        for i in range(3):
+            _create_customer(i)
+        surveys = get_table('Surveys')
+        surveys.put_item(Item={'SurveyId': 's1', 'SurveyNumber': 'S1', 'CustomerId': 'c', 'StatusId': 'open'})
+        surveys.put_item(Item={'SurveyId': 's2', 'SurveyNumber': 'S2', 'CustomerId': 'c', 'StatusId': 'open'})
+        surveys.put_item(Item={'SurveyId': 's3', 'SurveyNumber': 'S3', 'CustomerId': 'c', 'StatusId': 'done', 'IsActive': False})
+        counters.increment('Customers', 5)
+        counters.increment(counters.status_counter_name('stale'), 4)
+
+        counts = counters.reconcile(segments=2)
+
+        assert counts['Customers'] == 3
+        assert counts['Surveys'] == 2
+        assert counts[counters.status_counter_name('open')] == 2
+        assert counters.get_count('Customers') == 3
+        assert counters.get_count(counters.status_counter_name('stale')) == 0
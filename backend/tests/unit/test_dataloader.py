@@ -0,0 +1,71 @@
+"""
+Unit tests for DataLoader-batched SurveyType relationship fields
+"""
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+import crud
+import schemas
+from dataloader import DataLoader
+from document_cache import DocumentCache
+from graphql_schema_simple import schema, ThreadPoolMiddleware
+from models import SurveyStatus
+
+
+class TestDataLoader:
+    """Test batching and memoization"""
+
+    def test_loads_in_one_tick_are_batched(self):
+        """Test that loads issued together reach the batch function once"""
+        batches = []
+
+        def batch_load(keys):
+            batches.append(list(keys))
+            return {key: key.upper() for key in keys if key != 'missing'}
+
+        async def run():
+            loader = DataLoader(batch_load)
+            return await asyncio.gather(loader.load('a'), loader.load('b'), loader.load('a'), loader.load('missing'))
+
+        assert asyncio.run(run()) == ['A', 'B', 'A', None]
+        assert batches == [['a', 'b', 'missing']]
+
+    def test_sync_fallback(self):
+        """Test that a load outside an event loop resolves directly"""
+        loader = DataLoader(lambda keys: {key: key * 2 for key in keys})
+        assert loader.load(3) == 6
+
+
+class TestSurveyRelationships:
+    """Test nested customer/property/status fields on surveys"""
+
+    def test_list_of_surveys_batches_reads(self, mock_dynamodb_tables):
+        """Test that related objects for a list of surveys come from one batch per table"""
+        crud.create_survey_status(SurveyStatus(SurveyStatusId='open', StatusName='Open'))
+        customers = [
+            crud.create_customer(schemas.CustomerCreate(CustomerCode=f"DL{i}", CompanyName=f"Loader Co {i}"))
+            for i in range(5)
+        ]
+        for i in range(30):
+            crud.create_survey(schemas.SurveyCreate(
+                SurveyNumber=f"DL{i:03d}",
+                CustomerId=customers[i % 5].CustomerId,
+                StatusId='open'
+            ))
+
+        query = "{ surveys(limit: 50) { surveys { SurveyNumber customer { CompanyName } status { StatusName } } } }"
+        cache = DocumentCache(schema.graphql_schema)
+        with patch('crud.get_customers_by_ids', wraps=crud.get_customers_by_ids) as batch_get, \
+                patch('crud.get_customer') as get_customer:
+            result = asyncio.run(cache.execute(query, middleware=[ThreadPoolMiddleware()]))
+
+        assert result.errors is None
+        surveys = result.data['surveys']['surveys']
+        assert len(surveys) == 30
+        assert all(s['customer']['CompanyName'].startswith('Loader Co') for s in surveys)
+        assert all(s['status']['StatusName'] == 'Open' for s in surveys)
+        assert batch_get.call_count == 1
+        assert len(batch_get.call_args.args[0]) == 5
+        get_customer.assert_not_called()
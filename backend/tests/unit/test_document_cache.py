@@ -0,0 +1,66 @@
+"""
+Unit tests for the parsed GraphQL document cache (document_cache.py)
+"""
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from graphql import parse as graphql_parse
+
+from document_cache import DocumentCache
+from graphql_schema_simple import schema
+from models import SurveyType
+
+
+class TestDocumentCache:
+    """Test caching of parsed and validated documents"""
+
+    def test_repeated_query_is_parsed_once(self):
+        """Test that a repeated query is served from the cache"""
+        cache = DocumentCache(schema.graphql_schema, max_entries=10)
+        with patch('document_cache.parse', wraps=graphql_parse) as parse:
+            first = cache.get("{ surveyTypes { SurveyTypeId } }")
+            second = cache.get("{ surveyTypes { SurveyTypeId } }")
+
+        assert parse.call_count == 1
+        assert first is second
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 1
+
+    def test_validation_errors_cached(self):
+        """Test that an invalid query keeps returning its validation errors"""
+        cache = DocumentCache(schema.graphql_schema, max_entries=10)
+        _, errors = cache.get("{ noSuchField }")
+        _, cached_errors = cache.get("{ noSuchField }")
+
+        assert errors and errors == cached_errors
+
+    def test_syntax_error(self):
+        """Test that a syntax error is reported without a document"""
+        cache = DocumentCache(schema.graphql_schema, max_entries=10)
+        document, errors = cache.get("{ surveyTypes {")
+        assert document is None
+        assert len(errors) == 1
+
+    def test_size_bound(self):
+        """Test that the cache evicts the least recently used document"""
+        cache = DocumentCache(schema.graphql_schema, max_entries=2)
+        for field in ['SurveyTypeId', 'SurveyTypeName', 'Description']:
+            cache.get(f"{{ surveyTypes {{ {field} }} }}")
+        assert cache.stats()['entries'] == 2
+
+    def test_execute(self):
+        """Test executing a cached document with an operation name and variables"""
+        cache = DocumentCache(schema.graphql_schema, max_entries=10)
+        query = """
+            query Types { surveyTypes { SurveyTypeName } }
+            query Statuses { surveyStatuses { StatusName } }
+        """
+        with patch('crud.get_survey_types', return_value=[SurveyType(SurveyTypeId='t1', SurveyTypeName='Boundary')]):
+            result = asyncio.run(cache.execute(query, operation_name='Types'))
+            again = asyncio.run(cache.execute(query, operation_name='Types'))
+
+        assert result.errors is None
+        assert result.data == {'surveyTypes': [{'SurveyTypeName': 'Boundary'}]}
+        assert again.data == result.data
+        assert cache.stats()['hits'] == 1
@@ -0,0 +1,46 @@
+"""
+Unit tests for async GraphQL execution with thread-pooled resolvers
+"""
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from graphql_schema_simple import schema, ThreadPoolMiddleware
+from models import SurveyType
+
+
+class TestAsyncExecution:
+    """Test that root resolvers run off the event loop"""
+
+    def _slow_survey_types(self):
+        time.sleep(0.2)
+        return [SurveyType(SurveyTypeId='t1', SurveyTypeName=threading.current_thread().name)]
+
+    def test_root_resolver_runs_in_pool(self):
+        """Test that a root resolver runs on a resolver thread, not the event loop"""
+        with patch('crud.get_survey_types', self._slow_survey_types):
+            result = asyncio.run(schema.execute_async(
+                "{ surveyTypes { SurveyTypeName } }", middleware=[ThreadPoolMiddleware()]
+            ))
+
+        assert result.errors is None
+        assert result.data['surveyTypes'][0]['SurveyTypeName'].startswith('graphql-resolver')
+
+    def test_concurrent_requests_overlap(self):
+        """Test that concurrent requests do not wait on each other's blocking I/O"""
+        async def run_concurrently(count):
+            return await asyncio.gather(*[
+                schema.execute_async("{ surveyTypes { SurveyTypeId } }", middleware=[ThreadPoolMiddleware()])
+                for _ in range(count)
+            ])
+
+        with patch('crud.get_survey_types', self._slow_survey_types):
+            start = time.monotonic()
+            results = asyncio.run(run_concurrently(4))
+            elapsed = time.monotonic() - start
+
+        assert all(result.errors is None for result in results)
+        assert elapsed < 0.6
@@ -0,0 +1,81 @@
+"""
+Unit tests for the precompiled item codecs (item_codecs.py)
+"""
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from pydantic import ValidationError
+
+from crud import ITEM_CODECS, convert_survey_data, deserialize_item
+from models import Survey
+
+
+def _survey_item(**overrides) -> dict:
+    item = {
+        'SurveyId': 's1', 'SurveyNumber': 'S-1', 'SurveyTypeId': 'boundary', 'CustomerId': 'c1',
+        'PropertyId': 'p1', 'SurveyStatusId': 'open', 'QuotedPrice': Decimal('1250.50'),
+        'BoardPosition': Decimal(3), 'IsActive': True, 'RequestDate': '2024-03-01T09:30:00',
+        'CreatedDate': '2024-03-01T09:30:00.123456', 'ModifiedDate': '2024-03-05T14:12:45'
+    }
+    item.update(overrides)
+    return item
+
+
+def _validated(item: dict) -> Survey:
+    return Survey(**convert_survey_data(deserialize_item(item)))
+
+
+class TestItemCodecs:
+    """Test the codecs build the same models as the validated path"""
+
+    def test_decode_matches_validation(self):
+        """Test a stored survey decodes to the validated model, field for field and in order"""
+        item = _survey_item(DueDate='2024-03-22T17:00:00', Notes='Stake corners')
+        survey = ITEM_CODECS['Surveys'].decode(item)
+
+        assert isinstance(survey, Survey)
+        assert list(survey.__dict__) == list(Survey.model_fields)
+        assert survey.model_dump() == _validated(item).model_dump()
+        assert survey.BoardPosition == 3 and isinstance(survey.BoardPosition, int)
+        assert survey.DueDate == datetime(2024, 3, 22, 17)
+        assert ITEM_CODECS['Surveys'].decode({}) is None
+
+    def test_alias_and_fill(self):
+        """Test older rows read StatusId and get filled defaults for missing required fields"""
+        item = _survey_item(StatusId='done')
+        del item['SurveyStatusId'], item['CustomerId'], item['CreatedDate']
+        survey = ITEM_CODECS['Surveys'].decode(item)
+
+        assert survey.SurveyStatusId == 'done'
+        assert survey.CustomerId and survey.CustomerId != ITEM_CODECS['Surveys'].decode(item).CustomerId
+        assert isinstance(survey.CreatedDate, datetime)
+
+    def test_odd_values_fall_back_to_validation(self):
+        """Test values the fast path can't convert exactly go through validation instead"""
+        survey = ITEM_CODECS['Surveys'].decode(_survey_item(ScheduledDate='next week', Title=Decimal(7)))
+        assert survey.ScheduledDate is None
+        assert survey.Title == '7'
+
+        # A missing required field with no fill raises the same error as before
+        with pytest.raises(ValidationError):
+            ITEM_CODECS['Customers'].decode({'CustomerId': 'c1', 'CompanyName': 'Co'})
+
+    def test_partial_items(self):
+        """Test projected items decode without their missing required fields"""
+        survey = ITEM_CODECS['Surveys'].decode({'SurveyId': 's1', 'ModifiedDate': '2024-03-05T14:12:45'},
+                                               partial=True)
+        assert survey.SurveyId == 's1'
+        assert survey.ModifiedDate == datetime(2024, 3, 5, 14, 12, 45)
+        assert survey.SurveyNumber is None
+
+    def test_encode(self):
+        """Test encoding drops None, writes ISO dates and stores numbers as Decimal"""
+        item = ITEM_CODECS['Surveys'].encode({'SurveyId': 's1', 'Title': None, 'QuotedPrice': 12.5,
+                                              'FinalPrice': 3, 'DueDate': datetime(2024, 3, 22, 17)})
+        assert item == {'SurveyId': 's1', 'QuotedPrice': Decimal('12.5'), 'FinalPrice': Decimal(3),
+                        'DueDate': '2024-03-22T17:00:00'}
+
+        survey = ITEM_CODECS['Surveys'].decode(_survey_item())
+        assert ITEM_CODECS['Surveys'].decode(ITEM_CODECS['Surveys'].encode(survey)).model_dump() == \
+            survey.model_dump()
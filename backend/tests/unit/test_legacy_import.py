@@ -0,0 +1,103 @@
+"""
+Unit tests for the legacy SQL Server dump importer (legacy_import.py)
+"""
+from decimal import Decimal
+from unittest.mock import patch
+
+import counters
+import crud
+import legacy_import
+
+
+def write_dump(directory, table, lines):
+    (directory / f"{table}.csv").write_text("\n".join(lines) + "\n")
+
+
+class TestConvertValue:
+    """Test SQL Server type conversion"""
+
+    def test_types(self):
+        """Test bit, int, money/decimal, datetime2 and NULL handling"""
+        assert legacy_import.convert_value('bit', '1') is True
+        assert legacy_import.convert_value('bit', '0') is False
+        assert legacy_import.convert_value('int', '42') == 42
+        assert legacy_import.convert_value('money', '$1,234.50') == Decimal('1234.50')
+        assert legacy_import.convert_value('decimal', '10.25') == Decimal('10.25')
+        assert legacy_import.convert_value('datetime2', '2024-03-01 10:11:12.1234567') == '2024-03-01T10:11:12.123456'
+        assert legacy_import.convert_value('nvarchar', '') is None
+        assert legacy_import.convert_value('int', 'NULL') is None
+
+    def test_schema_columns(self):
+        """Test that column order and types come from schema.sql"""
+        schema = legacy_import.load_schema()
+
+        assert schema['Surveys'][0] == ('SurveyId', 'int')
+        assert ('QuotedPrice', 'decimal') in schema['Surveys']
+        assert set(legacy_import.TABLE_MAPPINGS) <= set(schema)
+
+
+class TestImport:
+    """Test streaming import with id mapping and checkpoints"""
+
+    def test_import_maps_keys(self, mock_dynamodb_tables, tmp_path):
+        """Test that int identities and foreign keys become consistent UUIDs"""
+        write_dump(tmp_path, 'SurveyStatuses', [
+            'StatusId,StatusCode,StatusName,SortOrder,IsActive',
+            '1,OPEN,Open,1,1'
+        ])
+        write_dump(tmp_path, 'Customers', [
+            'CustomerId,CustomerCode,CompanyName,ContactFirstName,ContactLastName,Email,Phone,Fax,Website,'
+            'IsActive,CreatedDate,ModifiedDate,CreatedBy,ModifiedBy',
+            '7,C7,"Acme, Inc.",,,,,,,1,2020-01-02 03:04:05.0000000,2021-01-02 03:04:05.0000000,,'
+        ])
+        write_dump(tmp_path, 'Surveys', [
+            'SurveyId,SurveyNumber,CustomerId,PropertyId,SurveyTypeId,StatusId,Title,Description,PurposeCode,'
+            'RequestDate,ScheduledDate,CompletedDate,DeliveryDate,DueDate,QuotedPrice,FinalPrice,'
+            'IsFieldworkComplete,IsDrawingComplete,IsScanned,IsDelivered,CreatedDate,ModifiedDate,CreatedBy,ModifiedBy',
+            '100,S-100,7,,,1,Lot survey,,,,,,,,1500.00,,1,0,0,0,2020-01-02 03:04:05,2020-01-03 03:04:05,,'
+        ])
+
+        assert legacy_import.run_import(str(tmp_path)) is True
+
+        customer = crud.get_customers(limit=10)[0][0]
+        assert customer.CompanyName == 'Acme, Inc.'
+        survey = crud.get_surveys(limit=10)[0][0]
+        assert survey.CustomerId == customer.CustomerId
+        assert survey.QuotedPrice == Decimal('1500.00')
+        assert survey.IsFieldworkComplete is True
+        status = crud.get_survey_statuses()[0]
+        assert survey.SurveyStatusId == status.SurveyStatusId
+        assert counters.get_count(counters.status_counter_name(status.SurveyStatusId)) == 1
+
+    def test_resume_from_checkpoint(self, mock_dynamodb_tables, tmp_path):
+        """Test that a failed chunk stops the import and a rerun resumes after the checkpoint"""
+        write_dump(tmp_path, 'Addresses', [
+            'AddressId,AddressType,AddressLine1,AddressLine2,City,StateCode,ZipCode,County,Country,IsActive,CreatedDate'
+        ] + [f"{i},Home,{i} Main St,,Town,NY,11700,,USA,1,2020-01-01 00:00:00" for i in range(1, 26)])
+        real_put = crud.batch_put_items
+        calls = []
+
+        def fail_third_chunk(table_name, key_name, items):
+            calls.append(len(items))
+            if len(calls) == 3:
+                return {item[key_name] for item in items}
+            return real_put(table_name, key_name, items)
+
+        with patch.object(legacy_import, 'IMPORT_CHUNK_ROWS', 5), \
+                patch.object(legacy_import, 'IMPORT_WRITERS', 1), \
+                patch('crud.batch_put_items', side_effect=fail_third_chunk):
+            assert legacy_import.run_import(str(tmp_path), update_counters=False) is False
+
+        checkpoint = legacy_import.Checkpoint(str(tmp_path / 'checkpoint.json'))
+        assert checkpoint.rows_done('Addresses') == 10
+        first_ids = legacy_import.IdMap(str(tmp_path / 'id_map.sqlite')).get_many('Addresses', [1, 2])
+
+        with patch.object(legacy_import, 'IMPORT_CHUNK_ROWS', 5), \
+                patch('crud.batch_put_items', side_effect=real_put) as put:
+            assert legacy_import.run_import(str(tmp_path), update_counters=False) is True
+
+        assert sum(len(call.args[2]) for call in put.call_args_list) == 15
+        assert legacy_import.Checkpoint(str(tmp_path / 'checkpoint.json')).is_complete('Addresses')
+        items = crud.get_table('Addresses').scan()['Items']
+        assert len(items) == 25
+        assert {first_ids[1], first_ids[2]} <= {item['AddressId'] for item in items}
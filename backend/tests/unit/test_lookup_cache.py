@@ -0,0 +1,84 @@
+"""
+Unit tests for the lookup table cache (lookup_cache.py)
+"""
+import pytest
+from unittest.mock import patch
+
+import crud
+import schemas
+from lookup_cache import LookupCache, lookup_cache
+from models import SurveyStatus
+
+
+class TestLookupCache:
+    """Test TTL, size bound and invalidation of LookupCache"""
+
+    def test_hit_and_miss_counters(self):
+        """Test that repeated reads are served from the cache"""
+        cache = LookupCache(ttl_seconds=60, max_entries=10)
+        calls = []
+        load = lambda: calls.append(1) or 'value'
+
+        assert cache.get_or_load(('T', 'a'), load) == 'value'
+        assert cache.get_or_load(('T', 'a'), load) == 'value'
+
+        assert len(calls) == 1
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 1
+
+    def test_expiry(self):
+        """Test that entries are reloaded after the TTL"""
+        cache = LookupCache(ttl_seconds=10, max_entries=10)
+        with patch('lookup_cache.time.monotonic', return_value=100.0):
+            cache.get_or_load(('T', 'a'), lambda: 'old')
+        with patch('lookup_cache.time.monotonic', return_value=111.0):
+            assert cache.get_or_load(('T', 'a'), lambda: 'new') == 'new'
+
+    def test_size_bound_evicts_least_recently_used(self):
+        """Test that the cache never holds more than max_entries"""
+        cache = LookupCache(ttl_seconds=60, max_entries=2)
+        cache.get_or_load(('T', 'a'), lambda: 'a')
+        cache.get_or_load(('T', 'b'), lambda: 'b')
+        cache.get_or_load(('T', 'a'), lambda: 'a')
+        cache.get_or_load(('T', 'c'), lambda: 'c')
+
+        assert cache.stats()['entries'] == 2
+        assert cache.get_or_load(('T', 'a'), lambda: 'reloaded') == 'a'
+        assert cache.get_or_load(('T', 'b'), lambda: 'reloaded') == 'reloaded'
+
+    def test_invalidate_table(self):
+        """Test that invalidation only drops the given table's entries"""
+        cache = LookupCache(ttl_seconds=60, max_entries=10)
+        cache.get_or_load(('A', 'x'), lambda: 1)
+        cache.get_or_load(('B', 'x'), lambda: 2)
+
+        cache.invalidate('A')
+
+        assert cache.get_or_load(('A', 'x'), lambda: 10) == 10
+        assert cache.get_or_load(('B', 'x'), lambda: 20) == 2
+
+
+class TestCrudLookupCaching:
+    """Test that crud lookups use the cache and writes invalidate it"""
+
+    def test_statuses_cached_until_write(self, mock_dynamodb_tables):
+        """Test that creating a status invalidates the cached status list"""
+        crud.create_survey_status(SurveyStatus(SurveyStatusId='open', StatusName='Open'))
+        assert len(crud.get_survey_statuses()) == 1
+
+        lookup_cache.reset_stats()
+        crud.get_survey_statuses()
+        assert lookup_cache.stats()['hits'] == 1
+
+        crud.create_survey_status(SurveyStatus(SurveyStatusId='done', StatusName='Done'))
+        assert len(crud.get_survey_statuses()) == 2
+
+    def test_board_configuration_update_invalidates(self, mock_dynamodb_tables):
+        """Test that renaming a board is visible through the cached slug lookup"""
+        board = crud.create_board_configuration(schemas.BoardConfigurationCreate(BoardName='Main Board'))
+        assert crud.get_board_configuration_by_slug('main-board') is not None
+
+        crud.update_board_configuration(board.BoardConfigId, schemas.BoardConfigurationUpdate(BoardName='Field Work'))
+
+        assert crud.get_board_configuration_by_slug('main-board') is None
+        assert crud.get_board_configuration_by_slug('field-work').BoardName == 'Field Work'
@@ -0,0 +1,94 @@
+"""
+Unit tests for cursor-based pagination (pagination.py and crud *_page functions)
+"""
+import pytest
+from decimal import Decimal
+
+import crud
+import schemas
+from pagination import encode_cursor, decode_cursor, InvalidCursorError
+
+
+class TestCursorEncoding:
+    """Test signed cursor encoding and decoding"""
+
+    def test_roundtrip(self):
+        """Test that a key survives encode/decode unchanged"""
+        key = {'CustomerId': 'abc-123', 'Position': Decimal('42')}
+        assert decode_cursor(encode_cursor(key)) == key
+
+    def test_empty_key_has_no_cursor(self):
+        """Test that an exhausted scan produces no cursor"""
+        assert encode_cursor(None) is None
+        assert decode_cursor(None) is None
+
+    def test_tampered_cursor_rejected(self):
+        """Test that a cursor whose payload was modified is rejected"""
+        cursor = encode_cursor({'CustomerId': 'abc-123'})
+        forged = encode_cursor({'CustomerId': 'other'}).split('.')[0] + '.' + cursor.split('.')[1]
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(forged)
+
+    def test_garbage_cursor_rejected(self):
+        """Test that a malformed cursor is rejected"""
+        with pytest.raises(InvalidCursorError):
+            decode_cursor('not-a-cursor')
+
+
+class TestCursorPagination:
+    """Test crud page functions against mocked DynamoDB"""
+
+    def _create_customers(self, count):
+        for i in range(count):
+            crud.create_customer(schemas.CustomerCreate(
+                CustomerCode=f"PAGE{i:03d}",
+                CompanyName=f"Paged Company {i}",
+                Email=f"page{i}@example.com"
+            ))
+
+    def test_walk_all_pages(self, mock_dynamodb_tables):
+        """Test that following cursors visits every customer exactly once"""
+        self._create_customers(7)
+
+        seen = []
+        cursor = None
+        while True:
+            customers, cursor = crud.get_customers_page(limit=3, after=cursor)
+            assert len(customers) <= 3
+            seen.extend(c.CustomerId for c in customers)
+            if cursor is None:
+                break
+
+        assert len(seen) == 7
+        assert len(set(seen)) == 7
+
+    def test_filtered_pages(self, mock_dynamodb_tables):
+        """Test that cursors resume correctly when a search filter overshoots a page"""
+        self._create_customers(12)
+
+        seen = []
+        cursor = None
+        while True:
+            customers, cursor = crud.get_customers_page(limit=2, after=cursor, search="Paged Company 1")
+            seen.extend(c.CompanyName for c in customers)
+            if cursor is None:
+                break
+
+        # "Paged Company 1", "Paged Company 10" and "Paged Company 11"
+        assert sorted(seen) == ["Paged Company 1", "Paged Company 10", "Paged Company 11"]
+
+    def test_skip_matches_cursor(self, mock_dynamodb_tables):
+        """Test that offset pagination and cursor pagination agree"""
+        self._create_customers(5)
+
+        first_page, cursor = crud.get_customers_page(limit=2)
+        second_page, _ = crud.get_customers_page(limit=2, after=cursor)
+        offset_page, _ = crud.get_customers_page(limit=2, skip=2)
+
+        assert [c.CustomerId for c in second_page] == [c.CustomerId for c in offset_page]
+
+    def test_count_customers(self, mock_dynamodb_tables):
+        """Test that counting covers the whole table"""
+        self._create_customers(4)
+        assert crud.count_customers() == 4
+        assert crud.count_customers(search="Paged Company 3") == 1
@@ -0,0 +1,79 @@
+"""
+Unit tests for automatic persisted queries (persisted_queries.py)
+"""
+import pytest
+
+from document_cache import query_hash
+from generate_query_allowlist import build_allowlist, extract_documents
+from persisted_queries import PersistedQueryStore, PersistedQueryError
+
+QUERY = "{ surveyTypes { SurveyTypeId } }"
+
+
+def _extensions(query=QUERY, sha256_hash=None):
+    return {"persistedQuery": {"version": 1, "sha256Hash": sha256_hash or query_hash(query)}}
+
+
+class TestPersistedQueryStore:
+    """Test the Apollo persisted query protocol"""
+
+    def test_unknown_hash_then_register(self):
+        """Test that an unknown hash is reported, then served after registration"""
+        store = PersistedQueryStore()
+        with pytest.raises(PersistedQueryError) as error:
+            store.resolve(None, _extensions())
+        assert error.value.to_dict() == {
+            "message": "PersistedQueryNotFound",
+            "extensions": {"code": "PERSISTED_QUERY_NOT_FOUND"}
+        }
+
+        assert store.resolve(QUERY, _extensions()) == QUERY
+        assert store.resolve(None, _extensions()) == QUERY
+
+    def test_hash_mismatch(self):
+        """Test that a query cannot be registered under another query's hash"""
+        store = PersistedQueryStore()
+        with pytest.raises(PersistedQueryError):
+            store.resolve(QUERY, _extensions(sha256_hash=query_hash("{ surveyStatuses { StatusName } }")))
+
+    def test_plain_query_passes_through(self):
+        """Test that requests without the extension are unaffected"""
+        assert PersistedQueryStore().resolve(QUERY, None) == QUERY
+
+    def test_allowlist_only(self):
+        """Test that lock-down mode only runs allowlisted documents"""
+        store = PersistedQueryStore(allowlist={query_hash(QUERY): QUERY}, allowlist_only=True)
+
+        assert store.resolve(None, _extensions()) == QUERY
+        assert store.resolve(QUERY, None) == QUERY
+        other = "{ surveyStatuses { StatusName } }"
+        with pytest.raises(PersistedQueryError):
+            store.resolve(other, None)
+        with pytest.raises(PersistedQueryError):
+            store.resolve(other, _extensions(other))
+
+    def test_registered_queries_bounded(self):
+        """Test that registered queries are evicted beyond max_entries"""
+        store = PersistedQueryStore(max_entries=1)
+        other = "{ surveyStatuses { StatusName } }"
+        store.resolve(QUERY, _extensions())
+        store.resolve(other, _extensions(other))
+        assert store.lookup(query_hash(QUERY)) is None
+        assert store.lookup(query_hash(other)) == other
+
+
+class TestAllowlistGeneration:
+    """Test extracting documents from queries.ts"""
+
+    def test_build_allowlist(self):
+        """Test that each document is stored plain and with Apollo's __typename fields"""
+        source = "export const GET_TYPES = gql`\n  query GetTypes {\n    surveyTypes { SurveyTypeId }\n  }\n`;"
+        documents = extract_documents(source)
+        allowlist = build_allowlist(documents)
+
+        assert len(documents) == 1
+        assert set(allowlist.values()) == {
+            "query GetTypes {\n  surveyTypes {\n    SurveyTypeId\n  }\n}",
+            "query GetTypes {\n  surveyTypes {\n    SurveyTypeId\n    __typename\n  }\n}",
+        }
+        assert all(query_hash(query) == key for key, query in allowlist.items())
@@ -0,0 +1,105 @@
+"""
+Unit tests for selection-set driven projections on GraphQL reads
+"""
+from decimal import Decimal
+
+import crud
+import database
+import schemas
+from graphql_schema_simple import schema
+from models import SurveyStatus
+
+
+def _record_reads(monkeypatch):
+    """Capture the parameters of every Surveys read"""
+    calls = []
+    real_get_table = database.get_table
+
+    class Recorder:
+        def __init__(self, table):
+            self._table = table
+
+        def __getattr__(self, name):
+            attribute = getattr(self._table, name)
+            if name in ('scan', 'query', 'get_item'):
+                def record(**kwargs):
+                    calls.append(kwargs)
+                    return attribute(**kwargs)
+                return record
+            return attribute
+
+    def get_table(table_name):
+        table = real_get_table(table_name)
+        return Recorder(table) if table_name == 'Surveys' else table
+
+    monkeypatch.setattr(crud, 'get_table', get_table)
+    return calls
+
+
+def _create_surveys():
+    crud.create_survey_status(SurveyStatus(SurveyStatusId='open', StatusName='Open'))
+    crud.create_board_configuration(schemas.BoardConfigurationCreate(BoardName='Main Board', IsDefault=True))
+    return [
+        crud.create_survey(schemas.SurveyCreate(SurveyNumber=f"S-{i}", StatusId='open', Title=f"Survey {i}",
+                                                Notes='x' * 1000, QuotedPrice=Decimal('125.50')))
+        for i in range(3)
+    ]
+
+
+class TestProjections:
+    """Test resolvers read only the attributes the query selects"""
+
+    def test_surveys_projection(self, mock_dynamodb_tables, monkeypatch):
+        """Test the surveys list reads and converts only the selected fields"""
+        _create_surveys()
+        calls = _record_reads(monkeypatch)
+
+        result = schema.execute('{ surveys(limit: 10) { surveys { SurveyNumber QuotedPrice } total } }')
+
+        assert result.errors is None
+        surveys = result.data['surveys']['surveys']
+        assert sorted(s['SurveyNumber'] for s in surveys) == ['S-0', 'S-1', 'S-2']
+        assert {s['QuotedPrice'] for s in surveys} == {125.5}
+        projected = set(calls[0]['ExpressionAttributeNames'].values())
+        assert projected == {'SurveyId', 'SurveyNumber', 'QuotedPrice'}
+
+    def test_fragments_and_related_fields(self, mock_dynamodb_tables, monkeypatch):
+        """Test fragments are expanded and relationship fields read the id they resolve from"""
+        created = _create_surveys()
+        calls = _record_reads(monkeypatch)
+
+        result = schema.execute('''
+            query { survey(surveyId: "%s") { ...Card status { StatusName } } }
+            fragment Card on SurveyType { Title }
+        ''' % created[0].SurveyId)
+
+        assert result.errors is None
+        assert result.data['survey'] == {'Title': 'Survey 0', 'status': {'StatusName': 'Open'}}
+        projected = set(calls[0]['ExpressionAttributeNames'].values())
+        assert projected == {'SurveyId', 'Title', 'StatusId', 'SurveyStatusId'}
+
+    def test_board_projection(self, mock_dynamodb_tables, monkeypatch):
+        """Test board columns query StatusIdIndex with the card fields plus the index keys"""
+        _create_surveys()
+        calls = _record_reads(monkeypatch)
+
+        result = schema.execute('{ board(perColumnLimit: 2) { columns { surveys { SurveyNumber } '
+                                'pageInfo { hasNextPage } } } }')
+
+        assert result.errors is None
+        column, = result.data['board']['columns']
+        assert len(column['surveys']) == 2 and column['pageInfo']['hasNextPage']
+        projected = {name for call in calls for name in call['ExpressionAttributeNames'].values()}
+        assert {'SurveyId', 'SurveyNumber', 'StatusId', 'ModifiedDate'} <= projected
+        assert 'Notes' not in projected
+
+    def test_unknown_selection_reads_whole_items(self, mock_dynamodb_tables, monkeypatch):
+        """Test a crud read without a projection still returns complete models"""
+        created = _create_surveys()
+        calls = _record_reads(monkeypatch)
+
+        survey = crud.get_survey(created[0].SurveyId)
+
+        assert 'ProjectionExpression' not in calls[0]
+        assert survey.Notes == 'x' * 1000
+        assert crud.get_survey(created[0].SurveyId, projection=['Title']).Notes is None
@@ -0,0 +1,135 @@
+"""
+Unit tests for the trigram search index (search_index.py) and indexed crud search
+"""
+from unittest.mock import patch
+
+import crud
+import schemas
+import search_index
+import setup_tables
+from database import get_table
+from graphql_schema_simple import schema
+
+
+def create_customer(code, name, email=None):
+    return crud.create_customer(schemas.CustomerCreate(CustomerCode=code, CompanyName=name, Email=email))
+
+
+class TestGrams:
+    """Test gram extraction"""
+
+    def test_text_grams(self):
+        """Test trigrams are casefolded and word prefixes are indexed"""
+        assert search_index.text_grams('Ab Cd') == {'ab ', 'b c', ' cd', '^a', '^ab', '^c', '^cd'}
+
+    def test_query_grams(self):
+        """Test short queries use word prefixes and long ones are narrowed"""
+        assert search_index.query_grams('AC') == ['^ac']
+        assert search_index.query_grams('acme') == ['acm', 'cme']
+        assert len(search_index.query_grams('a very long company name')) == search_index.SEARCH_MAX_QUERY_GRAMS
+
+
+class TestIndexedSearch:
+    """Test search through the maintained index"""
+
+    def test_case_insensitive_ranked(self, mock_dynamodb_tables):
+        """Test substring matching ignores case and ranks exact and prefix matches first"""
+        search_index.rebuild('Customers')
+        create_customer('C1', 'Big Acme Holdings')
+        create_customer('C2', 'Acme')
+        create_customer('C3', 'Acme Corp')
+        create_customer('C4', 'Widgets', email='sales@notacme.com')
+        create_customer('C5', 'Unrelated')
+
+        customers, total = crud.get_customers(search='ACME')
+
+        assert [c.CompanyName for c in customers] == ['Acme', 'Acme Corp', 'Big Acme Holdings', 'Widgets']
+        assert total == 4
+
+    def test_short_prefix_and_paging(self, mock_dynamodb_tables):
+        """Test two-letter queries match word prefixes and results page with a cursor"""
+        search_index.rebuild('Customers')
+        crud.bulk_create_customers([{'CustomerCode': f"P{i}", 'CompanyName': f"Pine Co {i}"} for i in range(5)])
+        create_customer('X1', 'Spine Clinic')
+
+        page, cursor = crud.get_customers_page(limit=3, search='pi')
+        rest, last_cursor = crud.get_customers_page(limit=3, search='pi', after=cursor)
+
+        assert len(page) == 3 and len(rest) == 2
+        assert last_cursor is None
+        assert 'Spine Clinic' not in {c.CompanyName for c in page + rest}
+
+    def test_updates_and_deletes_maintain_index(self, mock_dynamodb_tables):
+        """Test that stale grams are removed on update and postings on delete"""
+        search_index.rebuild('Properties')
+        created = crud.create_property(schemas.PropertyCreate(PropertyCode='PR1', PropertyName='Harbor View'))
+
+        crud.update_property(created.PropertyId, schemas.PropertyUpdate(PropertyCode='PR1', PropertyName='Hilltop'))
+        assert crud.get_properties_page(search='harbor')[0] == []
+        assert [p.PropertyName for p in crud.get_properties_page(search='hill')[0]] == ['Hilltop']
+
+        crud.delete_property(created.PropertyId)
+        assert get_table('SearchIndex').scan()['Count'] == 1  # only the ready marker is left
+
+    def test_page_and_total_share_one_search(self, mock_dynamodb_tables):
+        """Test a page and its total run one index search, and writes refresh cached results"""
+        search_index.rebuild('Customers')
+        created = [create_customer(f"R{i}", f"Ridge Farm {i}") for i in range(3)]
+
+        with patch('search_index.search_ids', wraps=search_index.search_ids) as search_ids:
+            customers, total = crud.get_customers(search='ridge', limit=2)
+        assert search_ids.call_count == 1
+        assert len(customers) == 2 and total == 3
+
+        crud.delete_customer(created[0].CustomerId)
+        assert crud.count_customers(search='ridge') == 2
+        crud.update_customer(created[1].CustomerId, schemas.CustomerUpdate(CompanyName='Valley'))
+        assert [c.CompanyName for c in crud.get_customers(search='ridge')[0]] == ['Ridge Farm 2']
+
+    def test_too_many_candidates_fall_back_to_scan(self, mock_dynamodb_tables, monkeypatch):
+        """Test queries over the candidate cap use the scan, so no match or count is cut off"""
+        search_index.rebuild('Customers')
+        for i in range(4):
+            create_customer(f"M{i}", f"Maple {i}")
+        monkeypatch.setattr(search_index, 'SEARCH_MAX_CANDIDATES', 3)
+
+        assert search_index.search_ids('Customers', 'Maple') is None
+        customers, total = crud.get_customers(search='Maple')
+        assert len(customers) == 4 and total == 4
+
+    def test_rebuild_indexes_existing_rows(self, mock_dynamodb_tables):
+        """Test that search falls back to scans until rebuild, then uses the index"""
+        get_table('Surveys').put_item(Item={'SurveyId': 's-1', 'SurveyNumber': 'SRV-2024-001', 'Notes': 'Lot line'})
+        assert [s.SurveyNumber for s in crud.get_surveys(search='SRV')[0]] == ['SRV-2024-001']
+        assert crud.get_surveys(search='srv')[0] == []
+
+        assert search_index.rebuild('Surveys') == 1
+
+        with patch('crud.scan_page') as scan:
+            surveys, total = crud.get_surveys(search='lot LINE')
+        assert not scan.called
+        assert [s.SurveyId for s in surveys] == ['s-1'] and total == 1
+
+    def test_graphql_created_survey_is_indexed(self, mock_dynamodb_tables):
+        """Test a survey created through the createSurvey mutation is found by indexed search"""
+        search_index.rebuild('Surveys')
+
+        result = schema.execute('mutation { createSurvey(input: {SurveyNumber: "RIVERBEND-7", Title: "Lot"}) '
+                                '{ survey { SurveyId } } }')
+        assert result.errors is None
+        survey_id = result.data['createSurvey']['survey']['SurveyId']
+
+        with patch('crud.scan_page') as scan:
+            surveys, total = crud.get_surveys(search='riverbend')
+        assert not scan.called
+        assert [s.SurveyId for s in surveys] == [survey_id] and total == 1
+
+    def test_setup_creates_index_table(self, mock_dynamodb_tables):
+        """Test table setup creates the SearchIndex table along with the rest"""
+        mock_dynamodb_tables.Table('SearchIndex').delete()
+        existing = [table.name for table in mock_dynamodb_tables.tables.all()]
+
+        with patch('setup_tables.connect_to_dynamodb', return_value=(mock_dynamodb_tables, existing)):
+            assert setup_tables.setup_all_tables() is True
+
+        assert 'SearchIndex' in [table.name for table in mock_dynamodb_tables.tables.all()]
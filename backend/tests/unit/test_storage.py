@@ -0,0 +1,194 @@
+"""
+Unit tests for the local storage engines (storage.py, sqlite_storage.py)
+"""
+from decimal import Decimal
+
+import pytest
+from boto3.dynamodb.conditions import Attr, Key
+from botocore.exceptions import ClientError
+
+import crud
+import database
+import schemas
+from lookup_cache import lookup_cache
+from search_index import search_results
+from models import DYNAMODB_TABLES
+from sqlite_storage import SQLiteDatabase
+from storage import MemoryDatabase
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def local_database(request, monkeypatch, tmp_path):
+    """Route every get_table()/get_dynamodb() call to a fresh database of each local engine"""
+    lookup_cache.invalidate()
+    search_results.invalidate()
+    if request.param == 'sqlite':
+        local = SQLiteDatabase(str(tmp_path / 'storage.sqlite3'), DYNAMODB_TABLES)
+    else:
+        local = MemoryDatabase(DYNAMODB_TABLES)
+    monkeypatch.setattr(database, 'db_connection', None)
+    monkeypatch.setattr(database, '_local_database', local)
+    yield local
+    if request.param == 'sqlite':
+        local.close()
+
+
+def _error_code(error: pytest.ExceptionInfo) -> str:
+    return error.value.response['Error']['Code']
+
+
+class TestLocalTable:
+    """Test the boto3 Table API subset on each engine"""
+
+    def test_key_schema_and_types(self, local_database):
+        """Test keys are required and typed, numbers come back as Decimal and floats are rejected"""
+        table = local_database.Table('Surveys')
+        table.put_item(Item={'SurveyId': 's1', 'Fee': 100, 'Tags': {'a'}})
+        assert table.get_item(Key={'SurveyId': 's1'})['Item'] == {'SurveyId': 's1', 'Fee': Decimal(100),
+                                                                  'Tags': {'a'}}
+        assert 'Item' not in table.get_item(Key={'SurveyId': 'missing'})
+
+        with pytest.raises(ClientError) as error:
+            table.put_item(Item={'Title': 'no key'})
+        assert _error_code(error) == 'ValidationException'
+        with pytest.raises(ClientError) as error:
+            table.get_item(Key={'SurveyId': 1})
+        assert _error_code(error) == 'ValidationException'
+        with pytest.raises(TypeError):
+            table.put_item(Item={'SurveyId': 's2', 'Fee': 1.5})
+        with pytest.raises(ClientError) as error:
+            local_database.Table('Nope').scan()
+        assert _error_code(error) == 'ResourceNotFoundException'
+
+    def test_conditions_and_update_expressions(self, local_database):
+        """Test condition checks, SET/REMOVE/ADD arithmetic and return values"""
+        table = local_database.Table('Counters')
+        table.update_item(Key={'CounterName': 'c'}, UpdateExpression='ADD CounterValue :d',
+                          ExpressionAttributeValues={':d': 2})
+        response = table.update_item(
+            Key={'CounterName': 'c'},
+            UpdateExpression='SET #v = #v + :d, Created = if_not_exists(Created, :now), Seen = list_append(:l, :l)',
+            ExpressionAttributeNames={'#v': 'CounterValue'},
+            ExpressionAttributeValues={':d': 3, ':now': 't1', ':l': ['x']},
+            ReturnValues='UPDATED_NEW'
+        )
+        assert response['Attributes'] == {'CounterValue': Decimal(5), 'Created': 't1', 'Seen': ['x', 'x']}
+
+        with pytest.raises(ClientError) as error:
+            table.update_item(Key={'CounterName': 'c'}, UpdateExpression='REMOVE Seen',
+                              ConditionExpression=Attr('CounterValue').lt(5) | Attr('Created').not_exists(),
+                              ReturnValuesOnConditionCheckFailure='ALL_OLD')
+        assert _error_code(error) == 'ConditionalCheckFailedException'
+        assert error.value.response['Item']['CounterValue'] == {'N': '5'}
+
+        response = table.update_item(Key={'CounterName': 'c'}, UpdateExpression='REMOVE Seen',
+                                     ConditionExpression='attribute_exists(CounterName) AND size(Seen) = :two',
+                                     ExpressionAttributeValues={':two': 2}, ReturnValues='ALL_OLD')
+        assert response['Attributes']['Seen'] == ['x', 'x']
+        assert 'Seen' not in table.get_item(Key={'CounterName': 'c'})['Item']
+
+        with pytest.raises(ClientError) as error:
+            table.update_item(Key={'CounterName': 'c'}, UpdateExpression='SET CounterName = :n',
+                              ExpressionAttributeValues={':n': 'd'})
+        assert _error_code(error) == 'ValidationException'
+
+    def test_gsi_query_order_and_pagination(self, local_database):
+        """Test GSI queries sort by range key, page with LastEvaluatedKey and follow updates"""
+        table = local_database.Table('Surveys')
+        for i in range(5):
+            table.put_item(Item={'SurveyId': f"s{i}", 'StatusId': 'open', 'ModifiedDate': f"2024-01-0{5 - i}"})
+        table.put_item(Item={'SurveyId': 'unindexed', 'Title': 'no status'})
+
+        seen, start = [], {}
+        while True:
+            page = table.query(IndexName='StatusIdIndex', KeyConditionExpression=Key('StatusId').eq('open'),
+                               ScanIndexForward=False, Limit=2, **start)
+            seen += [item['SurveyId'] for item in page['Items']]
+            if 'LastEvaluatedKey' not in page:
+                break
+            start = {'ExclusiveStartKey': page['LastEvaluatedKey']}
+        assert seen == ['s0', 's1', 's2', 's3', 's4']
+
+        table.update_item(Key={'SurveyId': 's0'}, UpdateExpression='SET StatusId = :s',
+                          ExpressionAttributeValues={':s': 'done'})
+        response = table.query(IndexName='StatusIdIndex',
+                               KeyConditionExpression=Key('StatusId').eq('open') & Key('ModifiedDate').gte('2024-01-03'),
+                               FilterExpression=Attr('SurveyId').is_in(['s1', 's4']), Select='COUNT')
+        assert (response['Count'], response['ScannedCount']) == (1, 2)
+
+    def test_sparse_index_scan(self, local_database):
+        """Test scanning a GSI reads only the items carrying its keys, with paging across the index"""
+        table = local_database.Table('Customers')
+        for i in range(4):
+            item = {'CustomerId': f"c{i}", 'CompanyName': f"Company {i}"}
+            table.put_item(Item=dict(item, ActiveId=f"c{i}") if i != 1 else item)
+
+        seen, start = [], {}
+        while True:
+            page = table.scan(IndexName='ActiveIndex', Limit=2, **start)
+            seen += [item['CustomerId'] for item in page['Items']]
+            if 'LastEvaluatedKey' not in page:
+                break
+            assert set(page['LastEvaluatedKey']) == {'CustomerId', 'ActiveId'}
+            start = {'ExclusiveStartKey': page['LastEvaluatedKey']}
+        assert sorted(seen) == ['c0', 'c2', 'c3']
+
+        table.update_item(Key={'CustomerId': 'c0'}, UpdateExpression='REMOVE ActiveId')
+        assert table.scan(IndexName='ActiveIndex', Select='COUNT')['Count'] == 2
+        with pytest.raises(ClientError) as error:
+            table.scan(IndexName='NoSuchIndex')
+        assert _error_code(error) == 'ValidationException'
+
+    def test_scan_segments_and_batches(self, local_database):
+        """Test parallel scan segments cover the table once and batch calls enforce their limits"""
+        table = local_database.Table('Customers')
+        with table.batch_writer() as batch:
+            for i in range(30):
+                batch.put_item(Item={'CustomerId': f"c{i:02d}", 'CompanyName': f"Company {i}"})
+
+        segments = [table.scan(Segment=s, TotalSegments=4, ProjectionExpression='CustomerId')['Items']
+                    for s in range(4)]
+        assert sorted(item['CustomerId'] for items in segments for item in items) == \
+            [f"c{i:02d}" for i in range(30)]
+        assert all(list(item) == ['CustomerId'] for items in segments for item in items)
+
+        response = local_database.batch_get_item(RequestItems={
+            'Customers': {'Keys': [{'CustomerId': 'c01'}, {'CustomerId': 'gone'}],
+                          'ProjectionExpression': '#n', 'ExpressionAttributeNames': {'#n': 'CompanyName'}}
+        })
+        assert response['Responses']['Customers'] == [{'CompanyName': 'Company 1'}]
+        with pytest.raises(ClientError):
+            local_database.batch_write_item(RequestItems={
+                'Customers': [{'DeleteRequest': {'Key': {'CustomerId': f"c{i:02d}"}}} for i in range(26)]
+            })
+
+
+class TestLocalBackend:
+    """Test the application running on a local engine"""
+
+    def test_crud_round_trip(self, local_database):
+        """Test crud, counters and status queries work with no DynamoDB"""
+        customer = crud.create_customer(schemas.CustomerCreate(CustomerCode='LOC1', CompanyName='Local Co'))
+        survey = crud.create_survey(schemas.SurveyCreate(SurveyNumber='S-1', CustomerId=customer.CustomerId,
+                                                         StatusId='open'))
+
+        assert crud.get_customer(customer.CustomerId).CompanyName == 'Local Co'
+        assert crud.count_surveys() == 1
+        crud.update_survey(survey.SurveyId, schemas.SurveyUpdate(StatusId='done'))
+        surveys, _ = crud.get_surveys_by_status('done')
+        assert [s.SurveyId for s in surveys] == [survey.SurveyId]
+        assert local_database.Table('Surveys').item_count == 1
+
+
+class TestBackendSelection:
+    """Test the backend is chosen by STORAGE_BACKEND and never switched on failure"""
+
+    def test_unreachable_dynamodb_raises(self, monkeypatch):
+        """Test an unreachable DynamoDB raises instead of falling back to a local engine"""
+        unreachable = object.__new__(database.DynamoDBConnection)
+        unreachable._dynamodb = None
+        monkeypatch.setattr(database, 'db_connection', unreachable)
+        monkeypatch.setattr(database, '_local_database', MemoryDatabase(DYNAMODB_TABLES))
+
+        with pytest.raises(database.StorageUnavailableError):
+            database.get_table('Customers')
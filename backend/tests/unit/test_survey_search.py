@@ -0,0 +1,95 @@
+"""
+Unit tests for the SQLite FTS5 survey search sidecar (survey_search.py)
+"""
+from unittest.mock import patch
+
+import crud
+import schemas
+import survey_search
+from database import get_table
+from graphql_schema_simple import schema
+from survey_search import SurveySearchIndex, match_expression
+
+
+def _seed():
+    township = crud.create_township(schemas.TownshipCreate(TownshipName='Smithtown', County='Suffolk', State='NY'))
+    customer = crud.create_customer(schemas.CustomerCreate(CustomerCode='AC1', CompanyName='Acme Builders'))
+    property = crud.create_property(schemas.PropertyCreate(PropertyCode='HV1', PropertyName='Harbor View',
+                                                           Lot='14', Block='2', TownshipId=township.TownshipId))
+    boundary = crud.create_survey(schemas.SurveyCreate(SurveyNumber='S-100', CustomerId=customer.CustomerId,
+                                                       PropertyId=property.PropertyId, StatusId='open',
+                                                       Notes='Boundary dispute along the north fence'))
+    other = crud.create_survey(schemas.SurveyCreate(SurveyNumber='S-200', StatusId='done',
+                                                    Title='Topographic survey'))
+    return customer, boundary, other
+
+
+class TestMatchExpression:
+    """Test query parsing"""
+
+    def test_stopwords_and_prefix(self):
+        """Test stopwords are dropped, terms quoted and the last one is a prefix"""
+        assert match_expression('Lot 14 in Smith') == '"lot" "14" "smith"*'
+        assert match_expression('the') == '"the"*'
+        assert match_expression('"; DROP') == '"drop"*'
+        assert match_expression('  ') is None
+
+
+class TestSurveySearchIndex:
+    """Test syncing and querying the sidecar"""
+
+    def test_search_ranks_and_snippets(self, mock_dynamodb_tables, tmp_path):
+        """Test joined fields are searchable, filters apply and notes are highlighted"""
+        _, boundary, other = _seed()
+        index = SurveySearchIndex(str(tmp_path / 'search.sqlite'))
+        assert index.sync() == 2
+
+        result = index.search('lot 14 smithtown')
+        assert result['total'] == 1
+        assert result['hits'][0]['SurveyId'] == boundary.SurveyId
+
+        result = index.search('acme fence')
+        assert [hit['SurveyId'] for hit in result['hits']] == [boundary.SurveyId]
+        assert '<mark>fence</mark>' in result['hits'][0]['NotesSnippet']
+
+        assert index.search('survey')['total'] == 1
+        assert index.search('S', filters={'StatusId': 'done'})['hits'][0]['SurveyId'] == other.SurveyId
+        assert index.search('boundary', filters={'StatusId': 'done'})['total'] == 0
+
+    def test_incremental_sync(self, mock_dynamodb_tables, tmp_path):
+        """Test a renamed customer and a new surveyor note reach existing documents"""
+        customer, boundary, _ = _seed()
+        index = SurveySearchIndex(str(tmp_path / 'search.sqlite'))
+        index.sync()
+
+        crud.update_customer(customer.CustomerId, schemas.CustomerUpdate(CompanyName='Apex Land'))
+        get_table('Surveys').update_item(
+            Key={'SurveyId': boundary.SurveyId},
+            UpdateExpression='SET SurveyorNotes = :notes, ModifiedDate = :modified',
+            ExpressionAttributeValues={':notes': 'Monument found at corner', ':modified': '2999-01-01T00:00:00'}
+        )
+        index.sync()
+
+        assert index.search('acme')['total'] == 0
+        hit = index.search('apex monument')['hits'][0]
+        assert hit['SurveyId'] == boundary.SurveyId
+        assert '<mark>monument</mark>' in hit['SurveyorNotesSnippet'].casefold()
+
+    def test_graphql_search_surveys(self, mock_dynamodb_tables, tmp_path):
+        """Test the GraphQL field returns surveys with scores, and errors when disabled"""
+        _, boundary, _ = _seed()
+        index = SurveySearchIndex(str(tmp_path / 'search.sqlite'))
+        index.sync()
+        query = ('{ searchSurveys(q: "harbor", filters: {statusId: "open"}) '
+                 '{ total hits { score notesSnippet survey { SurveyId SurveyNumber } } } }')
+
+        with patch.object(survey_search, 'sidecar', index):
+            result = schema.execute(query)
+        assert result.errors is None
+        assert result.data['searchSurveys']['total'] == 1
+        hit = result.data['searchSurveys']['hits'][0]
+        assert hit['survey'] == {'SurveyId': boundary.SurveyId, 'SurveyNumber': 'S-100'}
+        assert hit['score'] > 0
+
+        with patch.object(survey_search, 'sidecar', None):
+            assert schema.execute(query).errors
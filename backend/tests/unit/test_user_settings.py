@@ -0,0 +1,121 @@
+"""
+Unit tests for deterministic-key user settings and write coalescing
+"""
+import time
+from unittest.mock import patch
+
+import crud
+import schemas
+import setup_tables
+from models import user_settings_key
+from write_coalescer import WriteCoalescer
+
+
+class TestWriteCoalescer:
+    """Test merging and quiet-period flushing"""
+
+    def test_merges_and_flushes_after_quiet_period(self):
+        """Test a burst of writes to one key becomes a single merged write"""
+        writes = []
+        coalescer = WriteCoalescer(lambda key, fields: writes.append((key, fields)) or True, quiet_seconds=0.05)
+
+        coalescer.put('a', {'x': 1, 'y': 1})
+        coalescer.put('a', {'y': 2})
+        coalescer.put('b', {'z': 3})
+        assert coalescer.pending('a') == {'x': 1, 'y': 2}
+        assert writes == []
+
+        deadline = time.monotonic() + 2
+        while len(writes) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert sorted(writes) == [('a', {'x': 1, 'y': 2}), ('b', {'z': 3})]
+        assert coalescer.pending('a') is None
+        coalescer.close()
+
+    def test_failed_writes_are_kept(self):
+        """Test a failed write stays pending under newer fields and close writes it out"""
+        results = [False, True]
+        writes = []
+        coalescer = WriteCoalescer(lambda key, fields: writes.append(fields) or results.pop(0), quiet_seconds=60)
+
+        coalescer.put('a', {'x': 1, 'y': 1})
+        coalescer.flush('a')
+        coalescer.put('a', {'y': 2})
+        assert coalescer.pending('a') == {'x': 1, 'y': 2}
+        coalescer.close()
+        assert writes == [{'x': 1, 'y': 1}, {'x': 1, 'y': 2}]
+
+    def test_immediate_write_failures_are_returned(self):
+        """Test failures without a background writer are reported instead of buffered"""
+        coalescer = WriteCoalescer(lambda key, fields: False, quiet_seconds=0)
+        assert coalescer.put('a', {'x': 1}) is False
+        assert coalescer.pending('a') is None
+
+        coalescer = WriteCoalescer(lambda key, fields: False, quiet_seconds=60)
+        coalescer.close()
+        assert coalescer.put('a', {'x': 1}) is False
+        assert coalescer.pending('a') is None
+
+
+class TestUserSettings:
+    """Test settings addressed by UserId#SettingsType"""
+
+    def test_upserts_coalesce_and_reads_see_pending(self, mock_dynamodb_tables):
+        """Test rapid upserts are one write and are visible before it happens"""
+        writes = crud.user_settings_writes
+        with patch.object(writes, 'quiet_seconds', 60), \
+                patch.object(writes, '_write', wraps=crud._write_user_settings) as write:
+            for order in (['a', 'b'], ['b', 'a'], ['b', 'a', 'c']):
+                crud.upsert_user_settings('u1', 'board', {'columnOrder': order})
+
+            assert crud.get_user_settings('u1', 'board').SettingsData == {'columnOrder': ['b', 'a', 'c']}
+            assert [s.SettingsType for s in crud.get_all_user_settings('u1')] == ['board']
+            assert not write.called
+
+            writes.flush()
+            assert write.call_count == 1
+
+        stored = crud.get_user_settings('u1', 'board')
+        assert stored.UserSettingsId == user_settings_key('u1', 'board')
+        assert stored.SettingsData == {'columnOrder': ['b', 'a', 'c']}
+
+        updated = crud.update_user_settings(stored.UserSettingsId, schemas.UserSettingsUpdate(SettingsData={'v': 2}))
+        assert updated.CreatedDate == stored.CreatedDate
+        assert crud.update_user_settings(user_settings_key('u1', 'other'), schemas.UserSettingsUpdate(IsActive=False)) is None
+
+    def test_upsert_keeps_created_date(self, mock_dynamodb_tables):
+        """Test an upsert of stored or pending settings returns their original CreatedDate"""
+        writes = crud.user_settings_writes
+        with patch.object(writes, 'quiet_seconds', 60):
+            first = crud.upsert_user_settings('u1', 'board', {'v': 1})
+            time.sleep(0.01)
+            assert crud.upsert_user_settings('u1', 'board', {'v': 2}).CreatedDate == first.CreatedDate
+            writes.flush()
+
+            time.sleep(0.01)
+            again = crud.upsert_user_settings('u1', 'board', {'v': 3})
+            writes.flush()
+
+        assert again.CreatedDate == first.CreatedDate < again.ModifiedDate
+        assert crud.get_user_settings('u1', 'board').CreatedDate == first.CreatedDate
+
+    def test_upsert_reports_failed_write(self, mock_dynamodb_tables):
+        """Test an immediate upsert that fails to write returns None"""
+        with patch.object(crud.user_settings_writes, 'quiet_seconds', 0), \
+                patch.object(crud.user_settings_writes, '_write', return_value=False):
+            assert crud.upsert_user_settings('u1', 'board', {'v': 1}) is None
+        assert crud.user_settings_writes.pending(user_settings_key('u1', 'board')) is None
+
+    def test_migrate_random_keys(self, mock_dynamodb_tables):
+        """Test setup re-keys legacy items, keeping the newest of duplicates"""
+        table = mock_dynamodb_tables.Table('UserSettings')
+        for settings_id, modified in (('old-1', '2024-01-01T00:00:00'), ('old-2', '2024-02-01T00:00:00')):
+            table.put_item(Item={'UserSettingsId': settings_id, 'UserId': 'u1', 'SettingsType': 'board',
+                                 'SettingsData': {'from': settings_id}, 'IsActive': True,
+                                 'CreatedDate': modified, 'ModifiedDate': modified})
+
+        assert setup_tables.migrate_user_settings_keys(mock_dynamodb_tables) is True
+
+        items = table.scan()['Items']
+        assert [item['UserSettingsId'] for item in items] == [user_settings_key('u1', 'board')]
+        assert crud.get_user_settings('u1', 'board').SettingsData == {'from': 'old-2'}
@@ -0,0 +1,118 @@
+"""
+Write coalescing for small, frequently rewritten items.
+
+Writes are buffered per key, and successive writes to the same key are merged
+field by field. A key is written once it has had no new writes for the quiet
+period, so a burst of saves (say, one per drag while reordering board
+columns) costs one DynamoDB write. Readers overlay pending() on what they
+read from the table, so they always see the latest value. Call close() on
+shutdown to write out anything still buffered.
+
+With no quiet period, or after close(), writes are applied immediately and a
+failure is returned to the caller rather than buffered, since there is no
+background writer left to retry it.
+"""
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+class WriteCoalescer:
+    """Per-key buffer of pending field updates, written after a quiet period"""
+
+    def __init__(self, write: Callable[[str, dict], bool], quiet_seconds: float, name: str = "write-coalescer"):
+        # write(key, fields) applies the merged fields and returns False to retry them later
+        self._write = write
+        self.quiet_seconds = quiet_seconds
+        self.name = name
+        self._pending: Dict[str, dict] = {}
+        self._deadlines: Dict[str, float] = {}
+        self._condition = threading.Condition()
+        # Held while writing so an explicit flush can't overtake the background one
+        self._write_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def put(self, key: str, fields: dict) -> bool:
+        """Buffer an update, merging it over any pending fields for the key
+
+        Returns False only when the update was written immediately and failed.
+        """
+        if self.quiet_seconds <= 0 or self._closed:
+            return self._write(key, dict(fields))
+        with self._condition:
+            self._pending[key] = {**self._pending.get(key, {}), **fields}
+            self._deadlines[key] = time.monotonic() + self.quiet_seconds
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            self._condition.notify()
+        return True
+
+    def pending(self, key: str) -> Optional[dict]:
+        """Fields buffered for a key and not yet written, if any"""
+        with self._condition:
+            fields = self._pending.get(key)
+            return dict(fields) if fields is not None else None
+
+    def pending_keys(self, prefix: str = '') -> Dict[str, dict]:
+        """Pending fields of every buffered key starting with prefix"""
+        with self._condition:
+            return {key: dict(fields) for key, fields in self._pending.items() if key.startswith(prefix)}
+
+    def _take(self, keys) -> Dict[str, dict]:
+        with self._condition:
+            for key in keys:
+                self._deadlines.pop(key, None)
+            return {key: self._pending.pop(key) for key in keys if key in self._pending}
+
+    def _apply(self, batch: Dict[str, dict]) -> bool:
+        failed = {key: fields for key, fields in batch.items() if not self._write(key, fields)}
+        if failed:
+            with self._condition:
+                # Only buffer for retry while the background writer is there to pick it up
+                if self._thread is None or self._closed:
+                    return False
+                # Newer buffered fields win over the ones that failed to write
+                for key, fields in failed.items():
+                    self._pending[key] = {**fields, **self._pending.get(key, {})}
+                    self._deadlines[key] = time.monotonic() + max(self.quiet_seconds, 1)
+                self._condition.notify()
+        return not failed
+
+    def flush(self, key: Optional[str] = None) -> bool:
+        """Write out one key's pending fields now, or every key's when key is None
+
+        Returns False if any write failed.
+        """
+        with self._write_lock:
+            with self._condition:
+                keys = [key] if key is not None else list(self._pending)
+            batch = self._take(keys)
+            return self._apply(batch) if batch else True
+
+    def _run(self) -> None:
+        while True:
+            with self._write_lock:
+                with self._condition:
+                    if self._closed:
+                        return
+                    now = time.monotonic()
+                    due = [key for key, deadline in self._deadlines.items() if deadline <= now]
+                batch = self._take(due)
+                if batch:
+                    self._apply(batch)
+            with self._condition:
+                if self._closed:
+                    return
+                wait = min(self._deadlines.values(), default=now + 60) - time.monotonic()
+                if wait > 0:
+                    self._condition.wait(wait)
+
+    def close(self) -> None:
+        """Stop the background writer and write out everything still buffered"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if not self.flush():
+            print(f"{self.name}: some buffered writes could not be written on close")
@@ -1,11 +1,26 @@
 import { ApolloClient, InMemoryCache, createHttpLink } from '@apollo/client';
+import { PersistedQueryLink } from '@apollo/client/link/persisted-queries';
 
 const httpLink = createHttpLink({
   uri: process.env.REACT_APP_GRAPHQL_URL || 'http://localhost:8000/graphql',
 });
 
+// Send a sha256 hash instead of the full query text; the server asks for the
+// text once per document and queries go out as cacheable GET requests
+const sha256 = async (query: string): Promise<string> => {
+  const digest = await crypto.subtle.digest('SHA-256', new TextEncoder().encode(query));
+  return Array.from(new Uint8Array(digest))
+    .map((byte) => byte.toString(16).padStart(2, '0'))
+    .join('');
+};
+
+const persistedQueryLink = new PersistedQueryLink({
+  sha256,
+  useGETForHashedQueries: true,
+});
+
 const client = new ApolloClient({
-  link: httpLink,
+  link: persistedQueryLink.concat(httpLink),
   cache: new InMemoryCache(),
   defaultOptions: {
     watchQuery: {
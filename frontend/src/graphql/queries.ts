@@ -238,6 +238,18 @@ export const UPDATE_SURVEY = gql`
   }
 `;
 
+export const MOVE_SURVEYS = gql`
+  mutation MoveSurveys($moves: [SurveyMoveInput]!) {
+    moveSurveys(moves: $moves) {
+      moves {
+        surveyId
+        statusId
+        position
+      }
+    }
+  }
+`;
+
 export const DELETE_SURVEY = gql`
   mutation DeleteSurvey($surveyId: String!) {
     deleteSurvey(surveyId: $surveyId)
@@ -570,6 +582,55 @@ export const GET_DEFAULT_BOARD_CONFIGURATION = gql`
   }
 `;
 
+export const GET_BOARD = gql`
+  query GetBoard($boardSlug: String, $perColumnLimit: Int = 25, $after: String) {
+    board(boardSlug: $boardSlug, perColumnLimit: $perColumnLimit, after: $after) {
+      columns {
+        status {
+          SurveyStatusId
+          StatusName
+        }
+        total
+        surveys {
+            SurveyId
+            SurveyNumber
+            CustomerId
+            PropertyId
+            SurveyTypeId
+            StatusId
+            BoardPosition
+            Title
+            Description
+            PurposeCode
+            RequestDate
+            ScheduledDate
+            CompletedDate
+            DeliveryDate
+            DueDate
+            QuotedPrice
+            FinalPrice
+            IsFieldworkComplete
+            IsDrawingComplete
+            IsScanned
+            IsDelivered
+            CreatedDate
+            ModifiedDate
+            CreatedBy
+            ModifiedBy
+        }
+        pageInfo {
+          endCursor
+          hasNextPage
+        }
+      }
+      pageInfo {
+        endCursor
+        hasNextPage
+      }
+    }
+  }
+`;
+
 // Board Configuration Mutations
 export const CREATE_BOARD_CONFIGURATION = gql`
   mutation CreateBoardConfiguration($boardConfig: BoardConfigurationInput!) {
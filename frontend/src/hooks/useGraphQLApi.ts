@@ -9,6 +9,7 @@ import {
   GET_SURVEY,
   CREATE_SURVEY,
   UPDATE_SURVEY,
+  MOVE_SURVEYS,
   DELETE_SURVEY,
   GET_PROPERTIES,
   GET_PROPERTY,
@@ -31,6 +32,7 @@ import {
   CREATE_BOARD_CONFIGURATION,
   UPDATE_BOARD_CONFIGURATION,
   DELETE_BOARD_CONFIGURATION,
+  GET_BOARD,
 } from '../graphql/queries';
 
 import {
@@ -50,7 +52,10 @@ import {
   TownshipListResponse,
   BoardConfiguration,
   BoardConfigurationCreate,
-  BoardConfigurationUpdate
+  BoardConfigurationUpdate,
+  BoardView,
+  SurveyMove,
+  SurveyMoveResult
 } from '../types';
 
 // Customer hooks
@@ -192,6 +197,22 @@ export const useUpdateSurvey = () => {
   return { update, loading, error };
 };
 
+// Board drag-and-drop: one request moves every dragged card, touching only status and position
+export const useMoveSurveys = () => {
+  const [moveSurveys, { loading, error }] = useMutation(MOVE_SURVEYS);
+
+  const move = async (moves: SurveyMove[]): Promise<SurveyMoveResult[]> => {
+    const result = await moveSurveys({
+      variables: {
+        moves,
+      },
+    });
+    return (result.data as any).moveSurveys.moves;
+  };
+
+  return { move, loading, error };
+};
+
 export const useDeleteSurvey = () => {
   const [deleteSurvey, { loading, error }] = useMutation(DELETE_SURVEY);
 
@@ -509,3 +530,25 @@ export const useDeleteBoardConfiguration = () => {
 
   return { remove, loading, error };
 };
+
+// Board view hook: each status column is fetched server-side with its own
+// limit and total, instead of loading every survey and grouping on the client
+export const useBoard = (boardSlug?: string, perColumnLimit = 25) => {
+  const { data, loading, error, refetch } = useQuery(GET_BOARD, {
+    variables: { boardSlug: boardSlug || undefined, perColumnLimit },
+  });
+
+  const board = (data as any)?.board as BoardView | undefined;
+  const surveys = board ? board.columns.flatMap(column => column.surveys) : undefined;
+  const columnTotals = board
+    ? Object.fromEntries(board.columns.map(column => [column.status.SurveyStatusId, column.total]))
+    : {};
+  const total = board ? board.columns.reduce((sum, column) => sum + column.total, 0) : 0;
+
+  return {
+    data: surveys ? { surveys, total, columnTotals } : undefined,
+    loading,
+    error,
+    refetch,
+  };
+};
@@ -1,10 +1,13 @@
 import React, { useState, useEffect, useCallback, useMemo } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
 import { EyeIcon, EyeSlashIcon, AdjustmentsHorizontalIcon, XMarkIcon, PencilIcon } from '@heroicons/react/24/outline';
-import { useSurveys, useSurveyStatuses, useUpdateSurvey, useCreateSurvey, useCustomers, useSurveyTypes, useUpdateSurveyStatus, useDefaultBoardConfiguration, useUpdateBoardConfiguration, useBoardConfigurationBySlug } from '../hooks/useGraphQLApi';
+import { useBoard, useSurveyStatuses, useUpdateSurvey, useMoveSurveys, useCreateSurvey, useCustomers, useSurveyTypes, useUpdateSurveyStatus, useDefaultBoardConfiguration, useUpdateBoardConfiguration, useBoardConfigurationBySlug } from '../hooks/useGraphQLApi';
 import { useBoardSettings } from '../hooks/useBoardSettings';
 import { Survey, SurveyStatus, SurveyCreate } from '../types';
 
+// Number of cards loaded per status column; column headers show the full total
+const BOARD_COLUMN_LIMIT = 50;
+
 interface SurveyCardProps {
   survey: Survey;
   onDragStart: (survey: Survey) => void;
@@ -112,6 +115,7 @@ const SurveyCard: React.FC<SurveyCardProps> = ({ survey, onDragStart, isUpdating
 interface BoardColumnProps {
   status: SurveyStatus;
   surveys: Survey[];
+  total?: number;
   onHide: (statusId: string) => void;
   onDragStart: (survey: Survey) => void;
   onDragOver: (e: React.DragEvent) => void;
@@ -130,6 +134,7 @@ interface BoardColumnProps {
 const BoardColumn: React.FC<BoardColumnProps> = ({ 
   status, 
   surveys, 
+  total,
   onHide, 
   onDragStart, 
   onDragOver, 
@@ -226,7 +231,7 @@ const BoardColumn: React.FC<BoardColumnProps> = ({
           )}
           <div className="flex items-center space-x-2">
             <span className="bg-white text-gray-600 text-xs px-2 py-1 rounded-full font-medium">
-              {surveys.length}
+              {total ?? surveys.length}
             </span>
             <button
               onClick={() => onHide(status.SurveyStatusId)}
@@ -343,10 +348,11 @@ export default function Board() {
     IsDelivered: false,
   });
   
-  // Fetch all surveys once on initial load (no search parameter - load everything)
-  const { data: surveysData, loading: surveysLoading, error: surveysError, refetch } = useSurveys(1, 1000);
+  // Fetch the first page of each status column with its total
+  const { data: surveysData, loading: surveysLoading, error: surveysError, refetch } = useBoard(boardSlug, BOARD_COLUMN_LIMIT);
   const { data: statusesData, loading: statusesLoading } = useSurveyStatuses();
   const { update: updateSurvey, loading: updateLoading } = useUpdateSurvey();
+  const { move: moveSurveys } = useMoveSurveys();
   const { create: createSurvey, loading: createLoading } = useCreateSurvey();
   const { data: customersData } = useCustomers(1, 1000);
   const { data: surveyTypesData } = useSurveyTypes();
@@ -363,7 +369,7 @@ export default function Board() {
   const refetchBoardConfig = boardSlug ? refetchBoardConfigBySlug : refetchDefaultBoardConfig;
 
   const [groupedSurveys, setGroupedSurveys] = useState<{ [key: string]: Survey[] }>({});
-  const [optimisticUpdates, setOptimisticUpdates] = useState<{ [surveyId: string]: { StatusId: string } }>({});
+  const [optimisticUpdates, setOptimisticUpdates] = useState<{ [surveyId: string]: { StatusId: string; BoardPosition?: number } }>({});
 
   // Memoize the search handler to prevent recreating on every render
   const handleSearchChange = useCallback((e: React.ChangeEvent<HTMLInputElement>) => {
@@ -650,17 +656,20 @@ export default function Board() {
     try {
       // Set updating state
       setUpdatingSurveyId(draggedSurvey.SurveyId);
+
+      // Dropped cards go to the end of the target column
+      const position = surveysData?.columnTotals[targetStatusId] ?? (groupedSurveys[targetStatusId] || []).length;
       
       // Apply optimistic update - this will automatically trigger regrouping
       setOptimisticUpdates(prev => ({
         ...prev,
-        [draggedSurvey.SurveyId]: { StatusId: targetStatusId }
+        [draggedSurvey.SurveyId]: { StatusId: targetStatusId, BoardPosition: position }
       }));
 
-      // Update the survey status in the background
-      await updateSurvey(draggedSurvey.SurveyId, {
-        StatusId: targetStatusId
-      });
+      // Move the card in the background, changing only its status and position
+      await moveSurveys([
+        { surveyId: draggedSurvey.SurveyId, toStatusId: targetStatusId, position }
+      ]);
 
       // Success - keep the optimistic update as the new truth, no need to sync with API
       // The optimistic update becomes the permanent state
@@ -682,7 +691,7 @@ export default function Board() {
       setDraggedSurvey(null);
       setUpdatingSurveyId(null);
     }
-  }, [draggedSurvey, updateSurvey, refetch]);
+  }, [draggedSurvey, moveSurveys, surveysData, groupedSurveys, refetch]);
 
   // Memoize board name functions
   const handleEditBoardName = useCallback(() => {
@@ -909,7 +918,7 @@ export default function Board() {
                   .filter(status => !boardSettings.hiddenColumns.includes(status.SurveyStatusId))
                   .map((status) => (
                     <option key={status.SurveyStatusId} value={status.SurveyStatusId}>
-                      {status.StatusName} ({(groupedSurveys[status.SurveyStatusId] || []).length})
+                      {status.StatusName} ({surveysData?.columnTotals[status.SurveyStatusId] ?? (groupedSurveys[status.SurveyStatusId] || []).length})
                     </option>
                   ))}
               </select>
@@ -968,6 +977,7 @@ export default function Board() {
                 <BoardColumn
                   status={status}
                   surveys={surveys}
+                  total={surveysData?.columnTotals[status.SurveyStatusId]}
                   onHide={handleHideColumn}
                   onDragStart={handleDragStart}
                   onDragOver={(e) => {
@@ -82,6 +82,7 @@ jest.mock('../../hooks/useGraphQLApi', () => ({
   useSurveyTypes: jest.fn(),
   useCreateSurvey: jest.fn(),
   useUpdateSurvey: jest.fn(),
+  useMoveSurveys: jest.fn(),
   useDeleteSurvey: jest.fn(),
   useCreateSurveyStatus: jest.fn(),
   useUpdateSurveyStatus: jest.fn()
@@ -143,6 +144,12 @@ describe('Board Component - Comprehensive Tests', () => {
       error: null
     });
     
+    (GraphQLApi.useMoveSurveys as jest.Mock).mockReturnValue({
+      move: jest.fn(),
+      loading: false,
+      error: null
+    });
+    
     (GraphQLApi.useDeleteSurvey as jest.Mock).mockReturnValue({
       delete: jest.fn(),
       loading: false,
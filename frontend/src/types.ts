@@ -34,6 +34,7 @@ export interface Survey {
   PropertyId?: string;
   SurveyTypeId?: string;
   StatusId?: string;
+  BoardPosition?: number;
   Title?: string;
   Description?: string;
   PurposeCode?: string;
@@ -277,3 +278,32 @@ export interface BoardConfigurationUpdate {
 export interface BoardConfigurationListResponse extends PaginatedResponse<BoardConfiguration> {
   board_configurations: BoardConfiguration[];
 }
+
+export interface PageInfo {
+  endCursor?: string;
+  hasNextPage: boolean;
+}
+
+export interface BoardColumn {
+  status: Pick<SurveyStatus, 'SurveyStatusId' | 'StatusName'>;
+  total: number;
+  surveys: Survey[];
+  pageInfo: PageInfo;
+}
+
+export interface BoardView {
+  columns: BoardColumn[];
+  pageInfo: PageInfo;
+}
+
+export interface SurveyMove {
+  surveyId: string;
+  toStatusId: string;
+  position?: number;
+}
+
+export interface SurveyMoveResult {
+  surveyId: string;
+  statusId: string;
+  position?: number;
+}